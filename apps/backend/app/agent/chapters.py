@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from ..api.schemas import LLMSettings
@@ -17,7 +18,7 @@ def generate_chapters_from_chunks(
     *,
     settings: LLMSettings,
     api_token: str,
-    chunks: list[dict[str, Any]],
+    chunks: Sequence[Mapping[str, Any]],
     max_chapters: int,
 ) -> list[dict[str, Any]]:
     """Generate coarse chapters from transcript chunks using session LLM."""
@@ -150,7 +151,7 @@ def _finalize_candidates(
 
 
 def _fallback_chapters(
-    chunks: list[dict[str, Any]],
+    chunks: Sequence[Mapping[str, Any]],
     transcript_end: float,
     max_chapters: int,
 ) -> list[dict[str, Any]]:
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import re
+from typing import Hashable
 
+from ..services.embeddings import embed_texts
 from ..services.llm_client import SYSTEM_PROMPT, chat_completion
-from ..services.retrieval import select_relevant_chunks
+from ..services.retrieval import ranked_by_ids, select_relevant_chunks
+from ..services.text_utils import content_terms
 from .state import AgentState
 
 _CHUNK_TAG_PATTERN = re.compile(r"\[chunk-(\d+)\]")
@@ -73,13 +76,75 @@ def _add_line_spacing(text: str) -> str:
     return "\n".join(blocks).strip()
 
 
+def _query_cache_key(state: AgentState) -> Hashable | None:
+    """Key retrieval results by transcript, index version, engine, query and top_k.
+
+    Lexical engines only see the question's content terms, so those are the
+    key. The embedding engine ranks the whole question, so its key adds the
+    case- and whitespace-normalized text. Questions without content terms
+    are not cached.
+    """
+    term_index = state.get("term_index")
+    transcript_id = state.get("transcript_id")
+    terms = frozenset(content_terms(state["question"]))
+    if term_index is None or not transcript_id or not terms:
+        return None
+    settings = state["settings"]
+    embeddings = state.get("embeddings")
+    semantic = None
+    if settings.retrieval_engine == "embedding" and embeddings is not None:
+        semantic = (
+            embeddings.model,
+            len(embeddings),
+            " ".join(state["question"].lower().split()),
+        )
+    return (
+        transcript_id,
+        term_index.fingerprint(),
+        settings.retrieval_engine,
+        semantic,
+        terms,
+        state["top_k"],
+    )
+
+
 def retrieve_chunks_node(state: AgentState) -> dict:
-    """Select the most relevant transcript chunks for the question."""
+    """Select the most relevant transcript chunks for the question.
+
+    With a ``query_cache`` in the state, repeated questions (for lexical
+    engines, any rephrasing with the same content terms) are served without
+    scoring or embedding again.
+    """
+    cache = state.get("query_cache")
+    cache_key = _query_cache_key(state) if cache is not None else None
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {"selected_chunks": ranked_by_ids(state["chunks"], cached)}
+
+    settings = state["settings"]
+    embeddings = state.get("embeddings")
+    query_vector = None
+    if settings.retrieval_engine == "embedding" and embeddings is not None:
+        try:
+            query_vector = embed_texts([state["question"]], settings)[0]
+        except RuntimeError:
+            # Ollama went away since the chunks were embedded; rank with BM25.
+            query_vector = None
+            # Do not cache the fallback under the embedding key.
+            cache_key = None
+
     selected = select_relevant_chunks(
         chunks=state["chunks"],
         query=state["question"],
         top_k=state["top_k"],
+        term_index=state.get("term_index"),
+        engine=settings.retrieval_engine,
+        embeddings=embeddings,
+        query_vector=query_vector,
     )
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, tuple((chunk["chunk_id"], chunk["score"]) for chunk in selected))
     return {"selected_chunks": selected}
 
 
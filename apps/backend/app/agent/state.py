@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from typing import NotRequired, TypedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, NotRequired, TypedDict
 
 from ..api.schemas import LLMSettings
+from ..services.embeddings import EmbeddingMatrix
+from ..services.query_cache import QueryResultCache
+from ..services.term_index import TermIndex
 
 
 class AgentState(TypedDict):
@@ -15,8 +19,12 @@ class AgentState(TypedDict):
     history: list[dict[str, str]]
     history_turns: int
     settings: LLMSettings
-    chunks: list[dict]
+    transcript_id: NotRequired[str]
+    chunks: Sequence[Mapping[str, Any]]
+    term_index: NotRequired[TermIndex | None]
+    embeddings: NotRequired[EmbeddingMatrix | None]
     top_k: int
+    query_cache: NotRequired[QueryResultCache | None]
     selected_chunks: NotRequired[list[dict]]
     prompt: NotRequired[str]
     answer: NotRequired[str]
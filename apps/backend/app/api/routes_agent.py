@@ -10,14 +10,19 @@ from .schemas import (
     ChapterGenerateRequest,
     ChapterGenerateResponse,
     Citation,
+    QueryCacheStats,
     TranscriptChapter,
 )
 from ..agent.chapters import generate_chapters_from_chunks
 from ..agent.graph import run_agent
-from ..core.dependencies import get_store, get_transcript_service
+from ..core.dependencies import get_query_cache, get_store, get_transcript_service
+from ..services.negative_cache import TranscriptUnavailableError
+from ..services.single_flight import SingleFlight
 
 router = APIRouter(prefix="/api/agent", tags=["agent"])
 
+_CHAPTER_FLIGHT: SingleFlight[list[TranscriptChapter]] = SingleFlight()
+
 
 def _is_ollama_request(provider: str | None, base_url: str | None) -> bool:
     """Detect local Ollama runtime from explicit provider or base URL."""
@@ -55,11 +60,14 @@ def chat_with_agent(payload: AgentChatRequest) -> AgentChatResponse:
         transcript = transcript_service.load_by_id(payload.transcript_id)
 
     if transcript is None and payload.source:
-        transcript = transcript_service.load_or_create(
-            source=payload.source,
-            languages=settings.languages,
-            chunk_words=settings.chunk_words,
-        )
+        try:
+            transcript = transcript_service.load_or_create(
+                source=payload.source,
+                languages=settings.languages,
+                chunk_words=settings.chunk_words,
+            )
+        except TranscriptUnavailableError as exc:
+            raise HTTPException(status_code=exc.status_code, detail=exc.detail()) from exc
 
     if transcript is None:
         raise HTTPException(
@@ -75,6 +83,10 @@ def chat_with_agent(payload: AgentChatRequest) -> AgentChatResponse:
     )
 
     try:
+        embeddings = None
+        if runtime_settings.retrieval_engine == "embedding":
+            embeddings = transcript_service.ensure_embeddings(transcript, runtime_settings)
+
         output = run_agent(
             {
                 "question": payload.question,
@@ -82,8 +94,12 @@ def chat_with_agent(payload: AgentChatRequest) -> AgentChatResponse:
                 "history": [turn.model_dump() for turn in payload.history],
                 "history_turns": payload.history_turns,
                 "settings": runtime_settings,
+                "transcript_id": transcript["transcript_id"],
                 "chunks": transcript["chunks"],
+                "term_index": transcript.get("term_index"),
+                "embeddings": embeddings,
                 "top_k": payload.top_k or settings.top_k,
+                "query_cache": get_query_cache(),
             }
         )
     except Exception as exc:
@@ -100,6 +116,12 @@ def chat_with_agent(payload: AgentChatRequest) -> AgentChatResponse:
     )
 
 
+@router.get("/retrieval/cache/stats", response_model=QueryCacheStats)
+def get_retrieval_cache_stats() -> QueryCacheStats:
+    """Report hit rate of the cache that serves repeated questions without re-scoring."""
+    return QueryCacheStats(**get_query_cache().stats())
+
+
 @router.post("/chapters", response_model=ChapterGenerateResponse)
 def generate_chapters(payload: ChapterGenerateRequest) -> ChapterGenerateResponse:
     """Return native YouTube chapters or generate transcript chapters with session LLM."""
@@ -112,11 +134,14 @@ def generate_chapters(payload: ChapterGenerateRequest) -> ChapterGenerateRespons
         transcript = transcript_service.load_by_id(payload.transcript_id)
 
     if transcript is None and payload.source:
-        transcript = transcript_service.load_or_create(
-            source=payload.source,
-            languages=settings.languages,
-            chunk_words=settings.chunk_words,
-        )
+        try:
+            transcript = transcript_service.load_or_create(
+                source=payload.source,
+                languages=settings.languages,
+                chunk_words=settings.chunk_words,
+            )
+        except TranscriptUnavailableError as exc:
+            raise HTTPException(status_code=exc.status_code, detail=exc.detail()) from exc
 
     if transcript is None:
         raise HTTPException(
@@ -152,16 +177,28 @@ def generate_chapters(payload: ChapterGenerateRequest) -> ChapterGenerateRespons
             "base_url": (payload.base_url or settings.base_url).strip(),
         }
     )
-    generated = generate_chapters_from_chunks(
-        settings=runtime_settings,
-        api_token=session_api_token,
-        chunks=transcript["chunks"],
-        max_chapters=payload.max_chapters,
-    )
-    chapters = [TranscriptChapter(**row) for row in generated]
 
-    transcript["chapters"] = [row.model_dump() for row in chapters]
-    store.save_transcript(transcript["transcript_id"], transcript)
+    def _generate() -> list[TranscriptChapter]:
+        generated = generate_chapters_from_chunks(
+            settings=runtime_settings,
+            api_token=session_api_token,
+            chunks=transcript["chunks"],
+            max_chapters=payload.max_chapters,
+        )
+        rows = [TranscriptChapter(**row) for row in generated]
+
+        store.save_chapters(transcript["transcript_id"], [row.model_dump() for row in rows])
+        return rows
+
+    # Concurrent requests for the same transcript and generation settings share one
+    # LLM call; if it fails (e.g. a bad token), each waiter retries with its own.
+    flight_key = (
+        transcript["transcript_id"],
+        runtime_settings.model,
+        runtime_settings.base_url,
+        payload.max_chapters,
+    )
+    chapters = _CHAPTER_FLIGHT.do(flight_key, _generate, share_errors=False)
 
     return ChapterGenerateResponse(
         transcript_id=transcript["transcript_id"],
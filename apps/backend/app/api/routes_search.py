@@ -0,0 +1,30 @@
+"""Library-wide search across every stored transcript."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Query
+
+from .schemas import LibrarySearchHit, LibrarySearchResponse
+from ..core.dependencies import get_store
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("", response_model=LibrarySearchResponse)
+def search_library(
+    q: str = Query(min_length=1, max_length=500),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+) -> LibrarySearchResponse:
+    """Return the best-matching chunks (with timestamps) across the whole library."""
+    try:
+        result = get_store().search_library(q, limit=limit, offset=offset)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    return LibrarySearchResponse(
+        query=q,
+        hits=[LibrarySearchHit(**hit) for hit in result["hits"]],
+        indexed_transcripts=result["indexed_transcripts"],
+        indexing=result["indexing"],
+    )
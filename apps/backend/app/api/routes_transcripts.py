@@ -2,18 +2,93 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+import codecs
+from collections.abc import Iterator
+
+import anyio
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi.concurrency import run_in_threadpool
 
 from .schemas import (
+    BulkJobResponse,
+    BulkLoadRequest,
+    TranscriptCacheStats,
     TranscriptChapter,
     TranscriptChunk,
+    TranscriptChunkPage,
     TranscriptLoadRequest,
     TranscriptLoadResponse,
     TranscriptMeta,
+    TranscriptSummary,
 )
-from ..core.dependencies import get_store, get_transcript_service
+from ..core.dependencies import get_bulk_ingest_service, get_store, get_transcript_service
+from ..services.negative_cache import TranscriptUnavailableError
 
 router = APIRouter(prefix="/api/transcripts", tags=["transcripts"])
+# Stored ids are hex digests; the pattern keeps path segments out of file names.
+_TRANSCRIPT_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+
+@router.get("", response_model=list[TranscriptSummary])
+def list_transcripts(
+    video_id: str | None = Query(default=None, min_length=11, max_length=11),
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+) -> list[TranscriptSummary]:
+    """List stored transcripts, newest first, optionally for one YouTube video."""
+    rows = get_store().list_transcripts(video_id=video_id, limit=limit, offset=offset)
+    return [TranscriptSummary(**row) for row in rows]
+
+
+@router.get("/cache/stats", response_model=TranscriptCacheStats)
+def get_transcript_cache_stats() -> TranscriptCacheStats:
+    """Return in-memory cache counters and on-disk transcript usage."""
+    return TranscriptCacheStats(**get_store().transcript_cache_stats())
+
+
+@router.get("/{transcript_id}/chunks", response_model=TranscriptChunkPage)
+def get_transcript_chunks(
+    transcript_id: str = Path(pattern=_TRANSCRIPT_ID_PATTERN),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    ids: str | None = Query(default=None, description="Comma-separated chunk ids."),
+) -> TranscriptChunkPage:
+    """Return a page of chunks, or specific chunks by id, without a full load."""
+    store = get_store()
+    if ids is not None:
+        try:
+            chunk_ids = [int(part) for part in ids.split(",") if part.strip()]
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="ids must be integers.") from exc
+        found = store.find_chunks(transcript_id, chunk_ids[:limit])
+        page = None if found is None else (found, len(found))
+    else:
+        page = store.read_chunks(transcript_id, offset=offset, limit=limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail=f"Unknown transcript: {transcript_id}")
+
+    chunks, total = page
+    return TranscriptChunkPage(
+        transcript_id=transcript_id,
+        total=total,
+        offset=0 if ids is not None else offset,
+        chunks=[TranscriptChunk(**chunk) for chunk in chunks],
+    )
+
+
+@router.get("/{transcript_id}/chunks/{chunk_id}", response_model=TranscriptChunk)
+def get_transcript_chunk(
+    chunk_id: int,
+    transcript_id: str = Path(pattern=_TRANSCRIPT_ID_PATTERN),
+) -> TranscriptChunk:
+    """Return one chunk, e.g. to show a citation."""
+    found = get_store().find_chunks(transcript_id, [chunk_id])
+    if not found:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown chunk {chunk_id} in transcript {transcript_id}",
+        )
+    return TranscriptChunk(**found[0])
 
 
 @router.post("/load", response_model=TranscriptLoadResponse)
@@ -34,20 +109,107 @@ def load_transcript(payload: TranscriptLoadRequest) -> TranscriptLoadResponse:
                 source=payload.source,
                 languages=payload.languages or settings.languages,
                 chunk_words=payload.chunk_words or settings.chunk_words,
+                force_refresh=payload.force_refresh,
             )
+    except TranscriptUnavailableError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail()) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except TimeoutError as exc:
+        raise HTTPException(status_code=504, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    return _load_response(transcript)
+
+
+@router.post("/upload", response_model=TranscriptLoadResponse)
+async def upload_transcript(
+    request: Request,
+    source_label: str = Query(default="upload:transcript.txt"),
+    chunk_words: int | None = Query(default=None, ge=80, le=600),
+) -> TranscriptLoadResponse:
+    """Ingest a raw UTF-8 transcript request body while it is still uploading."""
+    settings = get_store().load_settings()
+    service = get_transcript_service()
+    body = request.stream().__aiter__()
+
+    async def _next_block() -> bytes | None:
+        try:
+            return await body.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def _pieces() -> Iterator[str]:
+        # Runs in a worker thread and pulls each body block from the event loop.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            block = anyio.from_thread.run(_next_block)
+            if block is None:
+                break
+            text = decoder.decode(block)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    try:
+        transcript = await run_in_threadpool(
+            service.load_from_stream,
+            source_label=source_label,
+            pieces=_pieces(),
+            chunk_words=chunk_words or settings.chunk_words,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    return _load_response(transcript)
+
+
+def _load_response(transcript: dict) -> TranscriptLoadResponse:
     meta = TranscriptMeta(
         transcript_id=transcript["transcript_id"],
         source_label=transcript["source_label"],
         source_title=transcript.get("source_title"),
         source_url=transcript.get("source_url"),
+        duration_seconds=transcript.get("source_duration_seconds"),
         chunk_count=len(transcript["chunks"]),
         total_words=transcript["total_words"],
     )
     chunks = [TranscriptChunk(**chunk) for chunk in transcript["chunks"]]
     chapters = [TranscriptChapter(**item) for item in transcript.get("chapters", [])]
     return TranscriptLoadResponse(transcript=meta, chunks=chunks, chapters=chapters)
+
+
+@router.post("/bulk", response_model=BulkJobResponse, status_code=202)
+def start_bulk_load(payload: BulkLoadRequest) -> BulkJobResponse:
+    """Queue many sources (and optionally a playlist) for background ingestion."""
+    settings = get_store().load_settings()
+    service = get_bulk_ingest_service()
+
+    try:
+        sources = list(payload.sources)
+        if payload.playlist_id:
+            sources.extend(service.expand_playlist(payload.playlist_id))
+        job = service.start(
+            sources,
+            languages=payload.languages or settings.languages,
+            chunk_words=payload.chunk_words or settings.chunk_words,
+            force_refresh=payload.force_refresh,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return BulkJobResponse(**job)
+
+
+@router.get("/bulk/{job_id}", response_model=BulkJobResponse)
+def get_bulk_load(job_id: str) -> BulkJobResponse:
+    """Return per-item progress for a bulk ingestion job."""
+    job = get_bulk_ingest_service().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown bulk job: {job_id}")
+    return BulkJobResponse(**job)
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class LLMSettings(BaseModel):
     """User-configurable provider settings for the agent."""
 
+    # Shared as a cached snapshot across requests; use ``model_copy(update=...)``.
+    model_config = ConfigDict(frozen=True)
+
     provider_name: str = Field(default="OpenAI-compatible")
     base_url: str = Field(default="https://api.openai.com/v1")
     model: str = Field(default="gpt-4o-mini")
@@ -16,6 +21,15 @@ class LLMSettings(BaseModel):
     top_k: int = Field(default=6, ge=1, le=20)
     chunk_words: int = Field(default=220, ge=80, le=600)
     languages: str = Field(default="en,en-US")
+    retrieval_engine: Literal["overlap", "bm25", "embedding"] = Field(
+        default="overlap",
+        description=(
+            "`overlap` (default) ranks by shared terms; `bm25` by term rarity and frequency; "
+            "`embedding` by cosine similarity of local Ollama embeddings."
+        ),
+    )
+    embedding_model: str = Field(default="nomic-embed-text")
+    embedding_base_url: str = Field(default="http://127.0.0.1:11434")
 
 
 class SettingsResponse(BaseModel):
@@ -51,6 +65,10 @@ class TranscriptLoadRequest(BaseModel):
     transcript_text: str | None = None
     languages: str | None = None
     chunk_words: int | None = Field(default=None, ge=80, le=600)
+    force_refresh: bool = Field(
+        default=False,
+        description="Bypass the local transcript cache and refetch from the source.",
+    )
 
 
 class TranscriptChunk(BaseModel):
@@ -86,10 +104,82 @@ class TranscriptMeta(BaseModel):
     source_label: str
     source_title: str | None = None
     source_url: str | None = None
+    duration_seconds: float | None = None
     chunk_count: int
     total_words: int
 
 
+class TranscriptSummary(BaseModel):
+    """One stored transcript in a library listing."""
+
+    transcript_id: str
+    source: str | None = None
+    source_label: str | None = None
+    source_title: str | None = None
+    source_url: str | None = None
+    languages: str | None = None
+    fetched_at: float | None = None
+
+
+class TranscriptChunkPage(BaseModel):
+    """One page of a stored transcript's chunks."""
+
+    transcript_id: str
+    total: int
+    offset: int
+    chunks: list[TranscriptChunk]
+
+
+class TranscriptCacheStats(BaseModel):
+    """Counters for the in-memory parsed-transcript cache and on-disk usage."""
+
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    pending_writes: int
+    write_failures: int
+    write_retries_pending: int
+    unwritten_transcripts: int = Field(
+        description="Saves that failed every retry; served from memory until a later save lands.",
+    )
+    last_write_error: str | None = None
+    disk_transcripts: int
+    disk_bytes: int
+    disk_max_bytes: int
+    disk_max_transcripts: int
+
+
+class LibrarySearchHit(BaseModel):
+    """One matching chunk from a library-wide search."""
+
+    transcript_id: str
+    source_title: str | None = None
+    source_label: str | None = None
+    source_url: str | None = None
+    chunk_id: int
+    start_seconds: float
+    end_seconds: float
+    start_label: str
+    end_label: str
+    score: float
+    text: str
+
+
+class LibrarySearchResponse(BaseModel):
+    """Ranked chunk hits across every stored transcript."""
+
+    query: str
+    hits: list[LibrarySearchHit] = Field(default_factory=list)
+    indexed_transcripts: int
+    indexing: bool = Field(
+        default=False,
+        description="True while transcripts stored before the index existed are still being added.",
+    )
+
+
 class TranscriptLoadResponse(BaseModel):
     """Response payload after loading or refreshing transcript."""
 
@@ -98,6 +188,42 @@ class TranscriptLoadResponse(BaseModel):
     chapters: list[TranscriptChapter] = Field(default_factory=list)
 
 
+class BulkLoadRequest(BaseModel):
+    """Request payload for bulk transcript ingestion."""
+
+    sources: list[str] = Field(default_factory=list, max_length=2000)
+    playlist_id: str | None = Field(
+        default=None,
+        description="Playlist ID/URL or channel ID whose videos are appended to `sources`.",
+    )
+    languages: str | None = None
+    chunk_words: int | None = Field(default=None, ge=80, le=600)
+    force_refresh: bool = False
+
+
+class BulkItemStatus(BaseModel):
+    """Progress row for one source inside a bulk ingestion job."""
+
+    index: int
+    source: str
+    status: str = Field(description="`queued`, `running`, `done`, or `failed`.")
+    transcript_id: str | None = None
+    source_title: str | None = None
+    chunk_count: int | None = None
+    error: str | None = None
+
+
+class BulkJobResponse(BaseModel):
+    """Bulk ingestion job progress."""
+
+    job_id: str
+    status: str = Field(description="`running` until every item is done or failed.")
+    total: int
+    completed: int
+    failed: int
+    items: list[BulkItemStatus] = Field(default_factory=list)
+
+
 class ChatTurn(BaseModel):
     """Message in rolling conversation history."""
 
@@ -123,6 +249,17 @@ class AgentChatRequest(BaseModel):
     history: list[ChatTurn] = Field(default_factory=list)
 
 
+class QueryCacheStats(BaseModel):
+    """Counters for the retrieval result cache of repeated questions."""
+
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
 class Citation(BaseModel):
     """Evidence citation for a generated answer."""
 
@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import logging
 import os
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 APP_NAME = "CapYap Local Agent"
 APP_VERSION = "0.1.0"
 
 DEFAULT_DATA_DIR = Path(".capyap")
+DEFAULT_TRANSCRIPT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_NEGATIVE_CACHE_TTL_SECONDS = 60 * 60
+DEFAULT_BULK_WORKERS = 4
+DEFAULT_TRANSCRIPT_CACHE_MB = 128
+DEFAULT_HTTP_POOL_HOSTS = 8
+DEFAULT_HTTP_POOL_SIZE = 16
+DEFAULT_HTTP_RETRIES = 2
+DEFAULT_HTTP_DNS_TTL_SECONDS = 300
+DEFAULT_DISK_CACHE_MAX_MB = 2048
+DEFAULT_DISK_CACHE_MAX_TRANSCRIPTS = 0
+DEFAULT_QUERY_CACHE_ENTRIES = 2048
 
 
 def get_project_root() -> Path:
@@ -29,6 +43,87 @@ def get_data_dir() -> Path:
     return (get_project_root() / DEFAULT_DATA_DIR).resolve()
 
 
+def get_transcript_ttl_seconds() -> float:
+    """Resolve how long cached YouTube transcripts are served without revalidation."""
+    configured = os.getenv("CAPYAP_TRANSCRIPT_TTL_SECONDS")
+    if configured:
+        try:
+            return max(0.0, float(configured))
+        except ValueError:
+            pass
+    return float(DEFAULT_TRANSCRIPT_TTL_SECONDS)
+
+
+def get_negative_cache_ttl_seconds() -> float:
+    """Resolve how long known caption fetch failures are answered from cache."""
+    configured = os.getenv("CAPYAP_NEGATIVE_CACHE_TTL_SECONDS")
+    if configured:
+        try:
+            return max(0.0, float(configured))
+        except ValueError:
+            pass
+    return float(DEFAULT_NEGATIVE_CACHE_TTL_SECONDS)
+
+
+def get_bulk_worker_count() -> int:
+    """Resolve the worker pool size used for bulk transcript ingestion."""
+    return _env_int("CAPYAP_BULK_WORKERS", DEFAULT_BULK_WORKERS, 1, 32)
+
+
+def get_transcript_cache_bytes() -> int:
+    """Resolve the in-memory parsed-transcript cache budget (0 disables it)."""
+    return _env_int("CAPYAP_TRANSCRIPT_CACHE_MB", DEFAULT_TRANSCRIPT_CACHE_MB, 0, 65536) << 20
+
+
+def get_query_cache_entries() -> int:
+    """Resolve how many retrieval results are kept for repeated questions (0 disables)."""
+    return _env_int("CAPYAP_QUERY_CACHE_ENTRIES", DEFAULT_QUERY_CACHE_ENTRIES, 0, 1_000_000)
+
+
+def get_disk_cache_quota() -> dict[str, int]:
+    """Resolve on-disk transcript quota limits (0 means unlimited)."""
+    return {
+        "max_bytes": _env_int(
+            "CAPYAP_DISK_CACHE_MAX_MB", DEFAULT_DISK_CACHE_MAX_MB, 0, 1 << 20
+        )
+        << 20,
+        "max_transcripts": _env_int(
+            "CAPYAP_DISK_CACHE_MAX_TRANSCRIPTS", DEFAULT_DISK_CACHE_MAX_TRANSCRIPTS, 0, 1 << 24
+        ),
+    }
+
+
+def get_http_pool_settings() -> dict[str, int]:
+    """Resolve connection-pool limits for the shared outbound HTTP session."""
+    return {
+        "pool_hosts": _env_int("CAPYAP_HTTP_POOL_HOSTS", DEFAULT_HTTP_POOL_HOSTS, 1, 64),
+        "pool_size": _env_int("CAPYAP_HTTP_POOL_SIZE", DEFAULT_HTTP_POOL_SIZE, 1, 128),
+        "retries": _env_int("CAPYAP_HTTP_RETRIES", DEFAULT_HTTP_RETRIES, 0, 10),
+        "dns_ttl": _env_int("CAPYAP_HTTP_DNS_TTL_SECONDS", DEFAULT_HTTP_DNS_TTL_SECONDS, 0, 3600),
+    }
+
+
+def _env_int(name: str, default: int, lower: int, upper: int) -> int:
+    configured = os.getenv(name)
+    if configured:
+        try:
+            return max(lower, min(int(configured), upper))
+        except ValueError:
+            pass
+    return default
+
+
+def get_storage_engine() -> str:
+    """Resolve the transcript storage engine: ``files`` (default) or ``sqlite``."""
+    configured = (os.getenv("CAPYAP_STORAGE") or "").strip().lower()
+    if configured == "sqlite":
+        return "sqlite"
+    # ``json`` is accepted for the pre-compact name of the file engine.
+    if configured not in {"", "files", "json"}:
+        logger.warning("Unknown CAPYAP_STORAGE=%r; using the files engine.", configured)
+    return "files"
+
+
 def get_frontend_dist_dir() -> Path:
     """Resolve built frontend asset directory served by backend."""
     configured = os.getenv("CAPYAP_FRONTEND_DIST")
@@ -47,4 +142,8 @@ def ensure_data_dirs() -> dict[str, Path]:
         "root": root,
         "settings_file": root / "settings.json",
         "transcripts_dir": transcripts,
+        "negative_cache_file": root / "negative_cache.json",
+        "aliases_file": root / "transcript_aliases.json",
+        "database_file": root / "capyap.sqlite3",
+        "library_index_file": root / "library_index.sqlite3",
     }
@@ -4,7 +4,15 @@ from __future__ import annotations
 
 from functools import lru_cache
 
+from ..core.config import (
+    ensure_data_dirs,
+    get_negative_cache_ttl_seconds,
+    get_query_cache_entries,
+)
+from ..services.bulk_ingest import BulkIngestService
+from ..services.negative_cache import NegativeCache
 from ..services.ollama_service import OllamaService
+from ..services.query_cache import QueryResultCache
 from ..services.storage import LocalStore
 from ..services.transcript_service import TranscriptService
 
@@ -15,13 +23,34 @@ def get_store() -> LocalStore:
     return LocalStore()
 
 
+@lru_cache(maxsize=1)
+def get_negative_cache() -> NegativeCache:
+    """Provide a singleton cache of known caption fetch failures."""
+    return NegativeCache(
+        path=ensure_data_dirs()["negative_cache_file"],
+        ttl_seconds=get_negative_cache_ttl_seconds(),
+    )
+
+
 @lru_cache(maxsize=1)
 def get_transcript_service() -> TranscriptService:
     """Provide a singleton transcript service."""
-    return TranscriptService(store=get_store())
+    return TranscriptService(store=get_store(), negative_cache=get_negative_cache())
+
+
+@lru_cache(maxsize=1)
+def get_bulk_ingest_service() -> BulkIngestService:
+    """Provide a singleton bulk ingestion service."""
+    return BulkIngestService(transcript_service=get_transcript_service())
 
 
 @lru_cache(maxsize=1)
 def get_ollama_service() -> OllamaService:
     """Provide a singleton Ollama status service."""
     return OllamaService()
+
+
+@lru_cache(maxsize=1)
+def get_query_cache() -> QueryResultCache:
+    """Provide a singleton cache of retrieval results for repeated questions."""
+    return QueryResultCache(get_query_cache_entries())
@@ -6,6 +6,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.routes_agent import router as agent_router
+from .api.routes_search import router as search_router
 from .api.routes_settings import router as settings_router
 from .api.routes_transcripts import router as transcripts_router
 from .core.config import APP_NAME, APP_VERSION, get_frontend_dist_dir
@@ -24,6 +25,7 @@ app.add_middleware(
 app.include_router(settings_router)
 app.include_router(transcripts_router)
 app.include_router(agent_router)
+app.include_router(search_router)
 
 
 @app.get("/health")
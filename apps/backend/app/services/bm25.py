@@ -0,0 +1,92 @@
+"""Okapi BM25 scoring over a transcript's stored term index.
+
+The ``TermIndex`` posting arrays already form a CSR term-by-chunk matrix
+(``starts`` = row pointers, ``positions`` = column indices, ``freqs`` =
+values), so they are wrapped as NumPy arrays without copying. A query then
+costs a few vector operations over the postings of its terms plus an
+``argpartition`` for the top-k, independent of how many chunks match nothing.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections.abc import Iterable
+
+import numpy as np
+
+from .term_index import TermIndex
+
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+
+class BM25Matrix:
+    """Read-only CSR view of a term index with BM25 chunk statistics."""
+
+    def __init__(self, term_index: TermIndex) -> None:
+        arrays = term_index.arrays()
+        self._lookup = term_index.term_ids
+        self._indptr = np.frombuffer(arrays["starts"], dtype=np.uint32).astype(np.int64)
+        self._indices = np.frombuffer(arrays["positions"], dtype=np.uint32)
+        self._tf = np.frombuffer(arrays["freqs"], dtype=np.uint32).astype(np.float32)
+        lengths = np.frombuffer(arrays["lengths"], dtype=np.uint32).astype(np.float32)
+        self.chunk_count = len(lengths)
+        avg_length = float(lengths.mean()) if self.chunk_count else 0.0
+        self._length_ratio = lengths / avg_length if avg_length else np.ones_like(lengths)
+        df = np.diff(self._indptr).astype(np.float64)
+        # BM25 idf with the +1 inside the log so common terms never go negative.
+        self._idf = np.log1p((self.chunk_count - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def score(
+        self,
+        terms: Iterable[str],
+        *,
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ) -> np.ndarray:
+        """Return one BM25 score per chunk for the given query terms."""
+        term_ids = [self._lookup[term] for term in terms if term in self._lookup]
+        if not term_ids:
+            return np.zeros(self.chunk_count, dtype=np.float32)
+
+        starts = self._indptr[term_ids]
+        stops = self._indptr[np.asarray(term_ids) + 1]
+        counts = stops - starts
+        # Gather every posting of the query terms in one fancy-index.
+        offsets = np.repeat(stops - counts.cumsum(), counts) + np.arange(counts.sum())
+        positions = self._indices[offsets]
+        tf = self._tf[offsets]
+        weights = np.repeat(self._idf[term_ids], counts)
+        norm = k1 * (1.0 - b + b * self._length_ratio[positions])
+        contributions = weights * tf * (k1 + 1.0) / (tf + norm)
+        return np.bincount(positions, weights=contributions, minlength=self.chunk_count)
+
+    def top_k(self, terms: Iterable[str], k: int) -> list[tuple[int, float]]:
+        """Return up to ``k`` ``(chunk position, score)`` pairs with a positive score.
+
+        Ordered by score, ties broken by earlier position.
+        """
+        scores = self.score(terms)
+        k = min(k, self.chunk_count)
+        if k <= 0:
+            return []
+        # argpartition finds the k-th best score; keeping every chunk that ties
+        # with it lets the sort break ties by position deterministically.
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero((scores >= threshold) & (scores > 0))
+        ordered = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+        return [(int(position), float(scores[position])) for position in ordered]
+
+
+_MATRICES: weakref.WeakKeyDictionary[TermIndex, BM25Matrix] = weakref.WeakKeyDictionary()
+_MATRICES_LOCK = threading.Lock()
+
+
+def bm25_matrix(term_index: TermIndex) -> BM25Matrix:
+    """Return the BM25 view of ``term_index``, built once per index object."""
+    with _MATRICES_LOCK:
+        matrix = _MATRICES.get(term_index)
+        if matrix is None:
+            matrix = _MATRICES[term_index] = BM25Matrix(term_index)
+        return matrix
@@ -0,0 +1,236 @@
+"""Bulk transcript ingestion over a bounded worker pool."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from ..core.config import get_bulk_worker_count
+from .http_client import get_http_session
+from .transcript_service import TranscriptService
+from .watch_page import initial_data_from_html
+
+_PLAYLIST_ID_RE = re.compile(r"[A-Za-z0-9_-]{12,64}")
+_CHANNEL_ID_RE = re.compile(r"UC[A-Za-z0-9_-]{22}")
+_VIDEO_ID_RE = re.compile(r"[A-Za-z0-9_-]{11}")
+_MAX_RETAINED_JOBS = 20
+
+
+class BulkIngestService:
+    """Fan transcript loads out over a shared pool and track per-item progress."""
+
+    def __init__(
+        self,
+        transcript_service: TranscriptService,
+        max_workers: int | None = None,
+    ) -> None:
+        self._transcripts = transcript_service
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or get_bulk_worker_count(),
+            thread_name_prefix="capyap-bulk",
+        )
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def start(
+        self,
+        sources: list[str],
+        *,
+        languages: str,
+        chunk_words: int,
+        force_refresh: bool = False,
+    ) -> dict[str, Any]:
+        """Queue every source for ingestion and return the initial job snapshot."""
+        unique: list[str] = []
+        seen: set[str] = set()
+        for raw in sources:
+            clean = (raw or "").strip()
+            if clean and clean not in seen:
+                seen.add(clean)
+                unique.append(clean)
+
+        if not unique:
+            raise ValueError("Provide at least one source or a playlist with videos.")
+
+        job_id = uuid.uuid4().hex[:12]
+        job: dict[str, Any] = {
+            "job_id": job_id,
+            "status": "running",
+            "total": len(unique),
+            "completed": 0,
+            "failed": 0,
+            "created_at": time.time(),
+            "finished_at": None,
+            "items": [
+                {
+                    "index": idx,
+                    "source": source,
+                    "status": "queued",
+                    "transcript_id": None,
+                    "source_title": None,
+                    "chunk_count": None,
+                    "error": None,
+                }
+                for idx, source in enumerate(unique)
+            ],
+        }
+
+        with self._lock:
+            self._jobs[job_id] = job
+            self._evict_finished_jobs()
+
+        for item in job["items"]:
+            self._pool.submit(
+                self._run_item,
+                job,
+                item,
+                languages,
+                chunk_words,
+                force_refresh,
+            )
+
+        return self.get(job_id) or {}
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Return a consistent snapshot of job progress, if the job is known."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot["items"] = [dict(item) for item in job["items"]]
+            return snapshot
+
+    def expand_playlist(self, playlist_ref: str) -> list[str]:
+        """Resolve a playlist ID, playlist URL or channel ID into watch URLs.
+
+        Only the ``playlistVideoRenderer`` entries embedded in the first playlist
+        page are returned, which covers the first ~100 entries without requiring
+        a YouTube API key; sidebar and recommendation videos are ignored.
+        """
+        playlist_id = self.parse_playlist_id(playlist_ref)
+        try:
+            response = get_http_session().get(
+                "https://www.youtube.com/playlist",
+                params={"list": playlist_id, "hl": "en"},
+                timeout=20,
+                headers={
+                    "User-Agent": "Mozilla/5.0 (CapYap/1.0)",
+                    "Accept-Language": "en-US,en;q=0.9",
+                },
+            )
+        except Exception as exc:
+            raise ValueError(f"Could not fetch playlist {playlist_id}: {exc}") from exc
+
+        if response.status_code >= 400:
+            raise ValueError(
+                f"Could not fetch playlist {playlist_id} (HTTP {response.status_code})."
+            )
+
+        video_ids = _playlist_video_ids(initial_data_from_html(response.text))
+        if not video_ids:
+            raise ValueError(f"Playlist {playlist_id} has no accessible videos.")
+        return [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids]
+
+    @staticmethod
+    def parse_playlist_id(value: str) -> str:
+        """Return playlist ID from a URL, raw ID, or channel ID (uploads playlist)."""
+        raw = (value or "").strip()
+        parsed = urlparse(raw)
+        if parsed.netloc:
+            raw = parse_qs(parsed.query).get("list", [""])[0]
+
+        if _CHANNEL_ID_RE.fullmatch(raw):
+            # Every channel exposes its uploads as playlist UU<channel suffix>.
+            return f"UU{raw[2:]}"
+        if _PLAYLIST_ID_RE.fullmatch(raw):
+            return raw
+
+        raise ValueError(
+            "Could not parse a playlist ID. Use a playlist URL, playlist ID, or channel ID."
+        )
+
+    def _run_item(
+        self,
+        job: dict[str, Any],
+        item: dict[str, Any],
+        languages: str,
+        chunk_words: int,
+        force_refresh: bool,
+    ) -> None:
+        with self._lock:
+            item["status"] = "running"
+
+        try:
+            transcript = self._transcripts.load_or_create(
+                source=item["source"],
+                languages=languages,
+                chunk_words=chunk_words,
+                force_refresh=force_refresh,
+            )
+        except Exception as exc:
+            with self._lock:
+                item["status"] = "failed"
+                item["error"] = str(exc) or exc.__class__.__name__
+                job["failed"] += 1
+                self._finish_if_done(job)
+            return
+
+        with self._lock:
+            item["status"] = "done"
+            item["transcript_id"] = transcript["transcript_id"]
+            item["source_title"] = transcript.get("source_title")
+            item["chunk_count"] = len(transcript["chunks"])
+            job["completed"] += 1
+            self._finish_if_done(job)
+
+    @staticmethod
+    def _finish_if_done(job: dict[str, Any]) -> None:
+        if job["completed"] + job["failed"] >= job["total"]:
+            job["status"] = "completed"
+            job["finished_at"] = time.time()
+
+    def _evict_finished_jobs(self) -> None:
+        while len(self._jobs) > _MAX_RETAINED_JOBS:
+            oldest_finished = next(
+                (key for key, row in self._jobs.items() if row["status"] == "completed"),
+                None,
+            )
+            if oldest_finished is None:
+                return
+            self._jobs.pop(oldest_finished)
+
+
+def _playlist_video_ids(payload: Any) -> list[str]:
+    """Collect ``playlistVideoRenderer`` video IDs from ``ytInitialData`` in page order."""
+    video_ids: list[str] = []
+    seen: set[str] = set()
+    stack: list[Any] = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            renderer = node.get("playlistVideoRenderer")
+            if isinstance(renderer, dict):
+                video_id = renderer.get("videoId")
+                if (
+                    isinstance(video_id, str)
+                    and _VIDEO_ID_RE.fullmatch(video_id)
+                    and video_id not in seen
+                ):
+                    seen.add(video_id)
+                    video_ids.append(video_id)
+                continue
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        # Reversed so the stack pops children in document order.
+        stack.extend(value for value in reversed(list(children)) if isinstance(value, (dict, list)))
+    return video_ids
@@ -0,0 +1,149 @@
+"""Streaming segment parsers for local caption and plain-text transcript files."""
+
+from __future__ import annotations
+
+import codecs
+import mmap
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .chunking import TranscriptSegment
+from .text_utils import iter_normalized_words, normalize_text
+
+_TIMESTAMP = r"(?:(\d+):)?(\d{1,2}):(\d{2})(?:[.,](\d{1,3}))?"
+_CUE_TIMING_RE = re.compile(rf"^\s*{_TIMESTAMP}\s*-->\s*{_TIMESTAMP}")
+_CAPTION_SUFFIXES = {".srt", ".vtt"}
+_VTT_SKIP_BLOCKS = ("NOTE", "STYLE", "REGION")
+_SNIFF_BYTES = 4096
+_READ_BYTES = 256 * 1024
+_TEXT_WINDOW_WORDS = 26
+_TEXT_WINDOW_SECONDS = 12.0
+
+
+def iter_file_segments(path: Path) -> Iterator[TranscriptSegment]:
+    """Yield segments from a local transcript file in one pass over a memory map.
+
+    SRT and WebVTT cues keep their real timestamps. Any other file is treated as
+    plain text and split into fixed word windows with synthetic timestamps.
+    """
+    with path.open("rb") as fh:
+        if path.stat().st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if _looks_like_captions(path, mapped[:_SNIFF_BYTES]):
+                yield from _iter_cues(iter(mapped.readline, b""))
+            else:
+                yield from iter_text_segments(iter_normalized_words(_iter_text_blocks(mapped)))
+
+
+def iter_text_segments(words: Iterable[str]) -> Iterator[TranscriptSegment]:
+    """Group words into fixed windows with synthetic timestamps."""
+    current_start = 0.0
+    snippet: list[str] = []
+    for word in words:
+        snippet.append(word)
+        if len(snippet) < _TEXT_WINDOW_WORDS:
+            continue
+        yield {
+            "text": " ".join(snippet),
+            "start_seconds": current_start,
+            "duration_seconds": _TEXT_WINDOW_SECONDS,
+        }
+        snippet = []
+        current_start += _TEXT_WINDOW_SECONDS
+
+    if snippet:
+        yield {
+            "text": " ".join(snippet),
+            "start_seconds": current_start,
+            "duration_seconds": _TEXT_WINDOW_SECONDS,
+        }
+
+
+def _looks_like_captions(path: Path, head: bytes) -> bool:
+    if path.suffix.lower() in _CAPTION_SUFFIXES:
+        return True
+    sample = head.decode("utf-8", errors="ignore").lstrip("\ufeff")
+    if sample.lstrip().startswith("WEBVTT"):
+        return True
+    return any(_CUE_TIMING_RE.match(line) for line in sample.splitlines()[:12])
+
+
+def _iter_text_blocks(mapped: mmap.mmap) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    for offset in range(0, len(mapped), _READ_BYTES):
+        text = decoder.decode(mapped[offset : offset + _READ_BYTES])
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _iter_cues(lines: Iterable[bytes]) -> Iterator[TranscriptSegment]:
+    """Parse SRT/WebVTT cue blocks; index lines and VTT metadata blocks are skipped."""
+    start = end = 0.0
+    in_cue = False
+    skipping = False
+    text_lines: list[str] = []
+
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace").lstrip("\ufeff").rstrip("\r\n")
+        stripped = line.strip()
+
+        if not stripped:
+            if in_cue:
+                segment = _cue_segment(text_lines, start, end)
+                if segment is not None:
+                    yield segment
+            in_cue = False
+            skipping = False
+            text_lines = []
+            continue
+
+        if skipping:
+            continue
+
+        timing = _CUE_TIMING_RE.match(line)
+        if timing:
+            if in_cue:
+                # Missing blank line between cues; close the previous one.
+                segment = _cue_segment(text_lines, start, end)
+                if segment is not None:
+                    yield segment
+            groups = timing.groups()
+            start = _timestamp_seconds(groups[:4])
+            end = _timestamp_seconds(groups[4:])
+            in_cue = True
+            text_lines = []
+            continue
+
+        if in_cue:
+            text_lines.append(stripped)
+        elif stripped.startswith("WEBVTT") or stripped.startswith(_VTT_SKIP_BLOCKS):
+            skipping = True
+
+    if in_cue:
+        segment = _cue_segment(text_lines, start, end)
+        if segment is not None:
+            yield segment
+
+
+def _cue_segment(lines: list[str], start: float, end: float) -> TranscriptSegment | None:
+    text = normalize_text(" ".join(lines))
+    if not text:
+        return None
+    return {
+        "text": text,
+        "start_seconds": start,
+        "duration_seconds": max(0.0, end - start),
+    }
+
+
+def _timestamp_seconds(groups: tuple[str | None, ...]) -> float:
+    hours, minutes, seconds, millis = groups
+    total = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    if millis:
+        total += int(millis.ljust(3, "0")) / 1000.0
+    return float(total)
@@ -0,0 +1,165 @@
+"""Random-access chunk files: one contiguous text blob behind a fixed-width index.
+
+Layout::
+
+    b"CPYC" | u16 version | u16 reserved | u32 count | u32 chunk words
+            | i64 source mtime_ns | i64 source size                  (header)
+    count x  u64 text offset | u64 text length | i64 chunk id
+            | f64 start seconds | f64 end seconds                     (index)
+    UTF-8 text of every chunk, back to back                          (body)
+
+Record ``i`` sits at a fixed position, so one chunk or a page of chunks is
+read by memory-mapping the file and slicing, without decoding the rest of the
+transcript. The header records the mtime/size of the transcript file it was
+built from; a mismatch means the index is stale and must be rebuilt.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+
+from .columnar import ChunkTable, pack_texts
+
+MAGIC = b"CPYC"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIqq")
+_RECORD = struct.Struct("<QQqdd")
+_SOURCE_VERSION_OFFSET = 16
+
+
+def encode_chunk_index(
+    chunks: ChunkTable,
+    chunk_words: int,
+    source_version: tuple[int, int],
+) -> bytes:
+    """Serialize a chunk table as header, fixed-width records and text body."""
+    records = bytearray()
+    body: list[bytes] = []
+    offset = 0
+    for idx in range(len(chunks)):
+        encoded = chunks.text(idx).encode("utf-8")
+        records += _RECORD.pack(
+            offset,
+            len(encoded),
+            chunks.chunk_id(idx),
+            chunks.start(idx),
+            chunks.end(idx),
+        )
+        body.append(encoded)
+        offset += len(encoded)
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        len(chunks),
+        chunk_words,
+        *source_version,
+    )
+    return b"".join([header, bytes(records), *body])
+
+
+def patch_source_version(
+    path: Path,
+    expected: tuple[int, int],
+    source_version: tuple[int, int],
+) -> bool:
+    """Re-point an up-to-date index at a rewritten source file, in place.
+
+    Used when only sections the index does not cover (chapters) changed.
+    Returns ``False`` if the index is missing or was not built from
+    ``expected``.
+    """
+    try:
+        with path.open("r+b") as fh:
+            header = fh.read(_HEADER.size)
+            if len(header) < _HEADER.size or _HEADER.unpack(header)[5:] != expected:
+                return False
+            fh.seek(_SOURCE_VERSION_OFFSET)
+            fh.write(struct.pack("<qq", *source_version))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class ChunkIndex:
+    """Memory-mapped view of one chunk file; use as a context manager."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, count, chunk_words, mtime_ns, size = _HEADER.unpack_from(
+                self._map
+            )
+            if magic != MAGIC or version > FORMAT_VERSION:
+                raise ValueError(f"Not a supported chunk index: {path.name}")
+        except BaseException:
+            self._map.close()
+            raise
+        self.count = count
+        self.chunk_words = chunk_words
+        self.source_version = (mtime_ns, size)
+        self._body = _HEADER.size + count * _RECORD.size
+
+    def __enter__(self) -> "ChunkIndex":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def rows(self, start: int, stop: int) -> ChunkTable:
+        """Return chunks ``[start, stop)`` (clamped to the stored range)."""
+        start = max(0, min(start, self.count))
+        stop = max(start, min(stop, self.count))
+        return self._table(range(start, stop))
+
+    def find(self, chunk_ids: Iterable[int]) -> ChunkTable:
+        """Return chunks by id, in the order asked; unknown ids are skipped."""
+        positions = [pos for pos in map(self._position, chunk_ids) if pos is not None]
+        return self._table(positions)
+
+    def _position(self, chunk_id: int) -> int | None:
+        # Chunk ids are assigned 1..n, so the id usually is the position;
+        # otherwise binary-search the (sorted) id column.
+        guess = chunk_id - 1
+        if 0 <= guess < self.count and self._chunk_id(guess) == chunk_id:
+            return guess
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._chunk_id(mid) < chunk_id:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and self._chunk_id(low) == chunk_id:
+            return low
+        return None
+
+    def _chunk_id(self, position: int) -> int:
+        return _RECORD.unpack_from(self._map, _HEADER.size + position * _RECORD.size)[2]
+
+    def _table(self, positions: Iterable[int]) -> ChunkTable:
+        texts: list[str] = []
+        chunk_ids = array("q")
+        starts = array("d")
+        ends = array("d")
+        for position in positions:
+            offset, length, chunk_id, start, end = _RECORD.unpack_from(
+                self._map,
+                _HEADER.size + position * _RECORD.size,
+            )
+            begin = self._body + offset
+            texts.append(self._map[begin : begin + length].decode("utf-8"))
+            chunk_ids.append(chunk_id)
+            starts.append(start)
+            ends.append(end)
+        text, offsets = pack_texts(texts)
+        return ChunkTable(text, offsets, chunk_ids, starts, ends)
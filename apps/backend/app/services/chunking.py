@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import TypedDict
+from array import array
+from collections.abc import Iterable, Mapping
+from typing import Any, TypedDict
 
-from .text_utils import format_timestamp
+from .columnar import ChunkTable, pack_texts
 
 
 class TranscriptSegment(TypedDict):
@@ -27,42 +29,37 @@ class TranscriptChunk(TypedDict):
 
 
 def chunk_segments(
-    segments: list[TranscriptSegment],
+    segments: Iterable[Mapping[str, Any]],
     words_per_chunk: int,
-) -> list[TranscriptChunk]:
-    """Create fixed-size chunks preserving start/end timeline metadata."""
-    chunks: list[TranscriptChunk] = []
+) -> ChunkTable:
+    """Create fixed-size chunks preserving start/end timeline metadata.
+
+    Accepts segment dicts or a ``SegmentTable`` and returns a columnar
+    ``ChunkTable`` whose rows read like ``TranscriptChunk`` dicts.
+    """
+    texts: list[str] = []
+    chunk_ids = array("q")
+    starts = array("d")
+    ends = array("d")
     acc_words: list[str] = []
     chunk_start = 0.0
     chunk_end = 0.0
 
-    def flush_chunk(next_chunk_id: int) -> int:
-        nonlocal acc_words, chunk_start, chunk_end
+    def flush_chunk() -> None:
+        nonlocal acc_words
         if not acc_words:
-            return next_chunk_id
+            return
 
         text = " ".join(acc_words).strip()
+        acc_words = []
         if not text:
-            acc_words = []
-            return next_chunk_id
-
-        start = chunk_start
-        end = max(chunk_end, start)
-        chunks.append(
-            {
-                "chunk_id": next_chunk_id,
-                "text": text,
-                "start_seconds": start,
-                "end_seconds": end,
-                "start_label": format_timestamp(start),
-                "end_label": format_timestamp(end),
-            }
-        )
+            return
 
-        acc_words = []
-        return next_chunk_id + 1
+        texts.append(text)
+        chunk_ids.append(len(texts))
+        starts.append(chunk_start)
+        ends.append(max(chunk_end, chunk_start))
 
-    chunk_id = 1
     word_budget = max(80, words_per_chunk)
 
     for segment in segments:
@@ -79,7 +76,8 @@ def chunk_segments(
         chunk_end = max(chunk_end, segment_end)
 
         if len(acc_words) >= word_budget:
-            chunk_id = flush_chunk(chunk_id)
+            flush_chunk()
 
-    flush_chunk(chunk_id)
-    return chunks
+    flush_chunk()
+    text, offsets = pack_texts(texts)
+    return ChunkTable(text, offsets, chunk_ids, starts, ends)
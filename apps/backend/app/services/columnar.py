@@ -0,0 +1,274 @@
+"""Compact columnar storage for in-memory transcript segments and chunks.
+
+Rows are kept as parallel ``array`` columns plus one shared text buffer, so a
+multi-hour transcript costs a few bytes per row instead of a dict per row.
+Indexing a table returns a lightweight read-only mapping view that behaves
+like the ``TranscriptSegment``/``TranscriptChunk`` dicts it replaces; labels
+are formatted only when a view is asked for them.
+"""
+
+from __future__ import annotations
+
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, overload
+
+from .text_utils import format_timestamp
+
+
+class RowView(Mapping[str, Any]):
+    """Read-only mapping over one row of a column table."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "_ColumnTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table.field(self._index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._table.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class _ColumnTable(Sequence[RowView], ABC):
+    """Shared text buffer handling for segment and chunk tables."""
+
+    FIELDS: tuple[str, ...] = ()
+
+    def __init__(self, text: str, offsets: array) -> None:
+        self._text = text
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> RowView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "_ColumnTable": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(*index.indices(len(self)))
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("row index out of range")
+        return RowView(self, index)
+
+    def text(self, index: int) -> str:
+        """Return the text of one row without building a view."""
+        return self._text[self._offsets[index] : self._offsets[index + 1]]
+
+    def texts(self) -> Iterator[str]:
+        """Iterate row texts in order."""
+        offsets = self._offsets
+        buffer = self._text
+        for idx in range(len(offsets) - 1):
+            yield buffer[offsets[idx] : offsets[idx + 1]]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the text buffer and columns."""
+        return sys.getsizeof(self._text) + array_bytes(self._offsets)
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        """Materialize plain dict rows, e.g. for JSON persistence."""
+        return [dict(row) for row in self]
+
+    @abstractmethod
+    def field(self, index: int, key: str) -> Any:
+        """Return one field of one row."""
+
+    @abstractmethod
+    def _slice(self, start: int, stop: int, step: int) -> "_ColumnTable":
+        """Return a new table holding the rows of ``range(start, stop, step)``."""
+
+    def _sliced_text(self, rows: range) -> tuple[str, array]:
+        pieces = [self.text(idx) for idx in rows]
+        return pack_texts(pieces)
+
+
+class SegmentTable(_ColumnTable):
+    """Columnar ``TranscriptSegment`` rows."""
+
+    FIELDS = ("text", "start_seconds", "duration_seconds")
+
+    def __init__(self, text: str, offsets: array, starts: array, durations: array) -> None:
+        super().__init__(text, offsets)
+        self._starts = starts
+        self._durations = durations
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "SegmentTable":
+        """Build a table from segment dicts (or views)."""
+        if isinstance(rows, SegmentTable):
+            return rows
+        builder = SegmentTableBuilder()
+        for row in rows:
+            builder.append(row)
+        return builder.build()
+
+    def start(self, index: int) -> float:
+        return self._starts[index]
+
+    def end(self, index: int) -> float:
+        return self._starts[index] + self._durations[index]
+
+    def nbytes(self) -> int:
+        return super().nbytes() + array_bytes(self._starts) + array_bytes(self._durations)
+
+    def field(self, index: int, key: str) -> Any:
+        if key == "text":
+            return self.text(index)
+        if key == "start_seconds":
+            return self._starts[index]
+        if key == "duration_seconds":
+            return self._durations[index]
+        raise KeyError(key)
+
+    def _slice(self, start: int, stop: int, step: int) -> "SegmentTable":
+        rows = range(start, stop, step)
+        text, offsets = self._sliced_text(rows)
+        return SegmentTable(
+            text,
+            offsets,
+            array("d", (self._starts[idx] for idx in rows)),
+            array("d", (self._durations[idx] for idx in rows)),
+        )
+
+
+class SegmentTableBuilder:
+    """Accumulate segment rows one at a time, e.g. from a streaming parser."""
+
+    def __init__(self) -> None:
+        self._texts: list[str] = []
+        self._starts = array("d")
+        self._durations = array("d")
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        self._texts.append(str(row["text"]))
+        self._starts.append(float(row["start_seconds"]))
+        self._durations.append(float(row["duration_seconds"]))
+
+    def collect(self, rows: Iterable[Mapping[str, Any]]) -> Iterator[Mapping[str, Any]]:
+        """Pass rows through unchanged while recording them."""
+        for row in rows:
+            self.append(row)
+            yield row
+
+    def build(self) -> SegmentTable:
+        text, offsets = pack_texts(self._texts)
+        return SegmentTable(text, offsets, self._starts, self._durations)
+
+
+class ChunkTable(_ColumnTable):
+    """Columnar ``TranscriptChunk`` rows with lazily formatted labels."""
+
+    FIELDS = ("chunk_id", "text", "start_seconds", "end_seconds", "start_label", "end_label")
+
+    def __init__(
+        self,
+        text: str,
+        offsets: array,
+        chunk_ids: array,
+        starts: array,
+        ends: array,
+    ) -> None:
+        super().__init__(text, offsets)
+        self._chunk_ids = chunk_ids
+        self._starts = starts
+        self._ends = ends
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "ChunkTable":
+        """Build a table from chunk dicts (or views); labels are recomputed on access."""
+        if isinstance(rows, ChunkTable):
+            return rows
+        texts: list[str] = []
+        chunk_ids = array("q")
+        starts = array("d")
+        ends = array("d")
+        for row in rows:
+            texts.append(str(row["text"]))
+            chunk_ids.append(int(row["chunk_id"]))
+            starts.append(float(row["start_seconds"]))
+            ends.append(float(row["end_seconds"]))
+        text, offsets = pack_texts(texts)
+        return cls(text, offsets, chunk_ids, starts, ends)
+
+    def chunk_id(self, index: int) -> int:
+        return self._chunk_ids[index]
+
+    def start(self, index: int) -> float:
+        return self._starts[index]
+
+    def end(self, index: int) -> float:
+        return self._ends[index]
+
+    def nbytes(self) -> int:
+        return (
+            super().nbytes()
+            + array_bytes(self._chunk_ids)
+            + array_bytes(self._starts)
+            + array_bytes(self._ends)
+        )
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Return one row as a plain dict."""
+        return dict(RowView(self, index))
+
+    def field(self, index: int, key: str) -> Any:
+        if key == "chunk_id":
+            return self._chunk_ids[index]
+        if key == "text":
+            return self.text(index)
+        if key == "start_seconds":
+            return self._starts[index]
+        if key == "end_seconds":
+            return self._ends[index]
+        if key == "start_label":
+            return format_timestamp(self._starts[index])
+        if key == "end_label":
+            return format_timestamp(self._ends[index])
+        raise KeyError(key)
+
+    def _slice(self, start: int, stop: int, step: int) -> "ChunkTable":
+        rows = range(start, stop, step)
+        text, offsets = self._sliced_text(rows)
+        return ChunkTable(
+            text,
+            offsets,
+            array("q", (self._chunk_ids[idx] for idx in rows)),
+            array("d", (self._starts[idx] for idx in rows)),
+            array("d", (self._ends[idx] for idx in rows)),
+        )
+
+
+def pack_texts(texts: list[str]) -> tuple[str, array]:
+    """Join row texts into one buffer and return it with row boundary offsets."""
+    offsets = array("q", [0])
+    total = 0
+    for piece in texts:
+        total += len(piece)
+        offsets.append(total)
+    return "".join(texts), offsets
+
+
+def array_bytes(values: array) -> int:
+    """Bytes held by an ``array``'s buffer."""
+    return values.buffer_info()[1] * values.itemsize
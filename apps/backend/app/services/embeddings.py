@@ -0,0 +1,138 @@
+"""Dense chunk embeddings from a local Ollama model, stored as an int8 matrix.
+
+Every chunk vector is L2-normalized and quantized to int8 with one float32
+scale per row, a quarter of the float32 size at well under 1% cosine error.
+The matrix is stored with the transcript's active chunk set and dequantized
+once per loaded transcript, so a question costs one embedding call plus a
+single matrix-vector product. NumPy is imported on first use, so the lexical
+engines never load it.
+
+Layout::
+
+    b"CPYE" | u16 version | u16 model name length | u32 rows | u32 dims
+            | model name (UTF-8) | rows x f32 scale | rows x dims x i8 codes
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from ..api.schemas import LLMSettings
+from .ollama_service import OllamaService
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAGIC = b"CPYE"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+_INT8_MAX = 127.0
+
+
+class EmbeddingMatrix:
+    """Quantized, row-normalized embeddings of one chunk set."""
+
+    def __init__(self, model: str, codes: np.ndarray, scales: np.ndarray) -> None:
+        self.model = model
+        self._codes = codes
+        self._scales = scales
+        self._dense: np.ndarray | None = None
+
+    @classmethod
+    def from_vectors(cls, model: str, vectors: np.ndarray) -> "EmbeddingMatrix":
+        """Normalize and quantize a ``(rows, dims)`` float matrix."""
+        import numpy as np
+
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        peaks = np.abs(vectors).max(axis=1) if vectors.size else np.zeros(len(vectors))
+        scales = np.where(peaks > 0, peaks / _INT8_MAX, 1.0).astype(np.float32)
+        codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+        return cls(model, codes, scales)
+
+    def __len__(self) -> int:
+        """Number of chunks covered by the matrix."""
+        return len(self._codes)
+
+    @property
+    def dims(self) -> int:
+        return self._codes.shape[1] if self._codes.ndim == 2 else 0
+
+    def dense(self) -> np.ndarray:
+        """Dequantized float32 rows, built on first use."""
+        import numpy as np
+
+        if self._dense is None:
+            self._dense = self._codes.astype(np.float32) * self._scales[:, None]
+        return self._dense
+
+    def top_k(self, query_vector: np.ndarray, k: int) -> list[tuple[int, float]]:
+        """Return up to ``k`` ``(chunk position, cosine)`` pairs, best first.
+
+        Ties are broken by earlier position.
+        """
+        import numpy as np
+
+        k = min(k, len(self))
+        if k <= 0 or len(query_vector) != self.dims:
+            return []
+        scores = self.dense() @ _normalize(np.asarray(query_vector, dtype=np.float32))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ordered = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(int(position), float(scores[position])) for position in ordered]
+
+    def nbytes(self) -> int:
+        """Memory held by the codes, scales and the dequantized copy if built."""
+        dense = 0 if self._dense is None else self._dense.nbytes
+        return self._codes.nbytes + self._scales.nbytes + dense
+
+    def encode(self) -> bytes:
+        model = self.model.encode("utf-8")
+        return b"".join(
+            [
+                _HEADER.pack(MAGIC, FORMAT_VERSION, len(model), len(self), self.dims),
+                model,
+                self._scales.astype("<f4").tobytes(),
+                self._codes.tobytes(),
+            ]
+        )
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "EmbeddingMatrix":
+        import numpy as np
+
+        magic, version, model_len, rows, dims = _HEADER.unpack_from(raw)
+        if magic != MAGIC or version > FORMAT_VERSION:
+            raise ValueError("Not a supported embedding matrix.")
+        pos = _HEADER.size
+        model = raw[pos : pos + model_len].decode("utf-8")
+        pos += model_len
+        scales = np.frombuffer(raw, dtype="<f4", count=rows, offset=pos).astype(np.float32)
+        pos += rows * 4
+        codes = np.frombuffer(raw, dtype=np.int8, count=rows * dims, offset=pos)
+        return cls(model, codes.reshape(rows, dims), scales)
+
+
+def embed_texts(texts: Sequence[str], settings: LLMSettings) -> np.ndarray:
+    """Embed ``texts`` in batches with the configured local model."""
+    import numpy as np
+
+    rows = OllamaService(timeout=settings.timeout).embed(
+        texts,
+        settings.embedding_model,
+        settings.embedding_base_url,
+    )
+    return np.asarray(rows, dtype=np.float32).reshape(len(texts), -1)
+
+
+def build_embeddings(texts: Sequence[str], settings: LLMSettings) -> EmbeddingMatrix:
+    """Embed a chunk set and quantize it for storage."""
+    return EmbeddingMatrix.from_vectors(settings.embedding_model, embed_texts(texts, settings))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
@@ -0,0 +1,176 @@
+"""Shared pooled HTTP sessions for outbound YouTube, Ollama and LLM calls."""
+
+from __future__ import annotations
+
+import socket
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util import connection
+from urllib3.util.retry import Retry
+
+from ..core.config import get_http_pool_settings
+
+_transcript_sessions = threading.local()
+
+
+@lru_cache(maxsize=1)
+def get_http_session() -> requests.Session:
+    """Return the process-wide keep-alive session used for stateless requests.
+
+    Cookies are never stored, so concurrent callers see the same behaviour as
+    independent ``requests.get``/``requests.post`` calls while reusing pooled
+    TCP/TLS connections per host.
+    """
+    session = _build_session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_transcript_http_session() -> requests.Session:
+    """Return the calling thread's pooled session for ``YouTubeTranscriptApi``.
+
+    The transcript client manages its own consent cookie, so it gets a separate
+    session whose cookie jar is left enabled. Concurrent fetches would race on
+    a shared jar, so each thread keeps one session; fetch pool threads are
+    long-lived, so their connections are reused across videos.
+    """
+    session = getattr(_transcript_sessions, "session", None)
+    if session is None:
+        session = _transcript_sessions.session = _build_session()
+    return session
+
+
+def _build_session() -> requests.Session:
+    settings = get_http_pool_settings()
+    # Only connection setup is retried; a request that reached the server is not replayed.
+    retry = Retry(
+        total=None,
+        connect=settings["retries"],
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+    adapter_cls = _CachedDnsAdapter if settings["dns_ttl"] > 0 else HTTPAdapter
+    adapter = adapter_cls(
+        pool_connections=settings["pool_hosts"],
+        pool_maxsize=settings["pool_size"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _DnsCache:
+    """Remember ``getaddrinfo`` results per host and port for a fixed TTL."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """Return the host's addresses in resolver order, looking up at most once per TTL."""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        infos = socket.getaddrinfo(
+            host, port, connection.allowed_gai_family(), socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now + self._ttl, addresses)
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+@lru_cache(maxsize=1)
+def _get_dns_cache() -> _DnsCache:
+    return _DnsCache(float(get_http_pool_settings()["dns_ttl"]))
+
+
+class _CachedDnsConnectionMixin:
+    """Open sockets to cached addresses; ``host`` stays the name for TLS and headers."""
+
+    def _new_conn(self) -> socket.socket:
+        cache = _get_dns_cache()
+        try:
+            addresses = cache.resolve(self._dns_host, self.port)
+        except OSError as exc:
+            raise NewConnectionError(self, f"Failed to resolve {self.host}: {exc}") from exc
+
+        last_error: OSError | None = None
+        for address in addresses:
+            try:
+                sock = connection.create_connection(
+                    (address, self.port),
+                    self.timeout,
+                    source_address=self.source_address,
+                    socket_options=self.socket_options,
+                )
+            except socket.timeout as exc:
+                last_error = exc
+                timed_out = True
+            except OSError as exc:
+                last_error = exc
+                timed_out = False
+            else:
+                sys.audit("http.client.connect", self, self.host, self.port)
+                return sock
+
+        # Every cached address failed; resolve afresh on the next attempt.
+        cache.forget(self._dns_host, self.port)
+        if last_error is not None and timed_out:
+            raise ConnectTimeoutError(
+                self,
+                f"Connection to {self.host} timed out. (connect timeout={self.timeout})",
+            ) from last_error
+        raise NewConnectionError(
+            self, f"Failed to establish a new connection: {last_error}"
+        ) from last_error
+
+
+class _CachedDnsHTTPConnection(_CachedDnsConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CachedDnsHTTPSConnection(_CachedDnsConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDnsHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDnsHTTPConnection
+
+
+class _CachedDnsHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDnsHTTPSConnection
+
+
+class _CachedDnsAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose direct connections resolve hosts through ``_DnsCache``."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDnsHTTPConnectionPool,
+            "https": _CachedDnsHTTPSConnectionPool,
+        }
@@ -0,0 +1,236 @@
+"""Library-wide full-text index of transcript chunks (SQLite FTS5).
+
+One ``library_chunks`` FTS5 row per chunk of every stored transcript's
+active chunk set, ranked with FTS5's built-in BM25. Each transcript's rows
+get a contiguous rowid range recorded in ``library_documents``, so replacing
+or removing one transcript deletes a rowid range instead of scanning the
+table. The index lives in its own database next to the transcripts and is
+used by both storage engines.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .columnar import ChunkTable
+from .text_utils import content_tokens, format_timestamp
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS library_chunks USING fts5(
+    text,
+    transcript_id UNINDEXED,
+    chunk_id UNINDEXED,
+    start_seconds UNINDEXED,
+    end_seconds UNINDEXED,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+
+CREATE TABLE IF NOT EXISTS library_documents (
+    transcript_id TEXT PRIMARY KEY,
+    first_rowid INTEGER NOT NULL,
+    last_rowid INTEGER NOT NULL,
+    source_title TEXT,
+    source_label TEXT,
+    source_url TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS library_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+_BACKFILLED_KEY = "backfilled"
+# Questions are natural language; keep the query to a bounded set of OR'd terms.
+_MAX_QUERY_TERMS = 32
+
+
+class LibraryIndex:
+    """Full-text index over the active chunks of every stored transcript.
+
+    Each thread gets its own connection; writes take the lock up front with
+    ``BEGIN IMMEDIATE`` so the store writer and a backfill never interleave.
+    """
+
+    def __init__(self, database_file: Path) -> None:
+        self._database_file = database_file
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def index_transcript(
+        self,
+        transcript_id: str,
+        payload: Mapping[str, Any],
+        *,
+        replace: bool = True,
+    ) -> bool:
+        """Index the payload's active chunks, replacing any earlier rows.
+
+        With ``replace=False`` an already indexed transcript is left alone
+        (used by the backfill, which may race a newer save). Returns whether
+        rows were written.
+        """
+        chunks = ChunkTable.from_rows(payload.get("chunks") or [])
+        with self._transaction() as conn:
+            existing = self._rowid_range(conn, transcript_id)
+            if existing is not None:
+                if not replace:
+                    return False
+                conn.execute(
+                    "DELETE FROM library_chunks WHERE rowid BETWEEN ? AND ?",
+                    existing,
+                )
+            last = conn.execute(
+                "SELECT rowid FROM library_chunks ORDER BY rowid DESC LIMIT 1"
+            ).fetchone()
+            first_rowid = (last[0] if last else 0) + 1
+            conn.executemany(
+                "INSERT INTO library_chunks (rowid, text, transcript_id, chunk_id,"
+                " start_seconds, end_seconds) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        first_rowid + idx,
+                        chunks.text(idx),
+                        transcript_id,
+                        chunks.chunk_id(idx),
+                        chunks.start(idx),
+                        chunks.end(idx),
+                    )
+                    for idx in range(len(chunks))
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO library_documents VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    transcript_id,
+                    first_rowid,
+                    first_rowid + len(chunks) - 1,
+                    payload.get("source_title"),
+                    payload.get("source_label"),
+                    payload.get("source_url"),
+                ),
+            )
+        return True
+
+    def remove(self, transcript_id: str) -> None:
+        """Drop a transcript's rows from the index."""
+        with self._transaction() as conn:
+            existing = self._rowid_range(conn, transcript_id)
+            if existing is None:
+                return
+            conn.execute("DELETE FROM library_chunks WHERE rowid BETWEEN ? AND ?", existing)
+            conn.execute(
+                "DELETE FROM library_documents WHERE transcript_id = ?",
+                (transcript_id,),
+            )
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> list[dict[str, Any]]:
+        """Return chunk hits for ``query`` across the library, best match first."""
+        match = _match_expression(query)
+        if not match:
+            return []
+        rows = self._connection().execute(
+            "SELECT c.transcript_id, c.chunk_id, c.start_seconds, c.end_seconds, c.text,"
+            " c.rank, d.source_title, d.source_label, d.source_url"
+            " FROM (SELECT transcript_id, chunk_id, start_seconds, end_seconds, text, rank"
+            "       FROM library_chunks WHERE library_chunks MATCH ?"
+            "       ORDER BY rank LIMIT ? OFFSET ?) AS c"
+            " JOIN library_documents AS d ON d.transcript_id = c.transcript_id"
+            " ORDER BY c.rank",
+            (match, limit, offset),
+        ).fetchall()
+        return [
+            {
+                "transcript_id": transcript_id,
+                "source_title": source_title,
+                "source_label": source_label,
+                "source_url": source_url,
+                "chunk_id": int(chunk_id),
+                "start_seconds": float(start),
+                "end_seconds": float(end),
+                "start_label": format_timestamp(float(start)),
+                "end_label": format_timestamp(float(end)),
+                # FTS5 BM25 is negative with lower meaning better.
+                "score": round(-float(rank), 5),
+                "text": text,
+            }
+            for (
+                transcript_id,
+                chunk_id,
+                start,
+                end,
+                text,
+                rank,
+                source_title,
+                source_label,
+                source_url,
+            ) in rows
+        ]
+
+    def indexed_ids(self) -> set[str]:
+        return {
+            row[0]
+            for row in self._connection().execute("SELECT transcript_id FROM library_documents")
+        }
+
+    def document_count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM library_documents").fetchone()[0]
+
+    def is_backfilled(self) -> bool:
+        return (
+            self._connection()
+            .execute("SELECT 1 FROM library_meta WHERE key = ?", (_BACKFILLED_KEY,))
+            .fetchone()
+            is not None
+        )
+
+    def mark_backfilled(self) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO library_meta VALUES (?, '1')",
+                (_BACKFILLED_KEY,),
+            )
+
+    @staticmethod
+    def _rowid_range(conn: sqlite3.Connection, transcript_id: str) -> tuple[int, int] | None:
+        row = conn.execute(
+            "SELECT first_rowid, last_rowid FROM library_documents WHERE transcript_id = ?",
+            (transcript_id,),
+        ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._database_file,
+                timeout=30.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _match_expression(query: str) -> str:
+    """Turn a free-text query into an FTS5 OR of quoted content terms."""
+    terms = list(dict.fromkeys(content_tokens(query)))[:_MAX_QUERY_TERMS]
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
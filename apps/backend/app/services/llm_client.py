@@ -4,9 +4,8 @@ from __future__ import annotations
 
 from typing import Any
 
-import requests
-
 from ..api.schemas import LLMSettings
+from .http_client import get_http_session
 
 
 SYSTEM_PROMPT = (
@@ -47,7 +46,7 @@ def chat_completion(
         "temperature": settings.temperature,
     }
 
-    response = requests.post(
+    response = get_http_session().post(
         endpoint,
         headers={
             "Authorization": f"Bearer {token}",
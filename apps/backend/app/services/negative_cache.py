@@ -0,0 +1,190 @@
+"""Persisted cache of YouTube caption fetches that are known to fail."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from youtube_transcript_api import (
+    AgeRestricted,
+    InvalidVideoId,
+    IpBlocked,
+    NoTranscriptFound,
+    RequestBlocked,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    VideoUnplayable,
+)
+
+from .storage import atomic_write_bytes
+
+# Ordered most specific first: IpBlocked subclasses RequestBlocked.
+_REASONS: tuple[tuple[type[BaseException], str], ...] = (
+    (TranscriptsDisabled, "captions_disabled"),
+    (NoTranscriptFound, "no_transcript_for_languages"),
+    (AgeRestricted, "age_restricted"),
+    (InvalidVideoId, "video_unavailable"),
+    (VideoUnavailable, "video_unavailable"),
+    (VideoUnplayable, "video_unavailable"),
+    (IpBlocked, "request_blocked"),
+    (RequestBlocked, "request_blocked"),
+)
+_STATUS_CODES = {
+    "captions_disabled": 404,
+    "no_transcript_for_languages": 404,
+    "video_unavailable": 404,
+    "age_restricted": 403,
+    "request_blocked": 429,
+}
+_MESSAGES = {
+    "captions_disabled": "Captions are disabled for this video.",
+    "no_transcript_for_languages": "No transcript is available in the requested languages.",
+    "video_unavailable": "This video is unavailable.",
+    "age_restricted": "This video is age restricted and its transcript cannot be fetched.",
+    "request_blocked": "YouTube is temporarily blocking transcript requests from this machine.",
+}
+# Blocks are usually lifted quickly, so they are remembered for less time.
+_SHORT_LIVED_REASONS = {"request_blocked": 300.0}
+
+
+class TranscriptUnavailableError(ValueError):
+    """A YouTube transcript cannot be fetched for a known, typed reason."""
+
+    def __init__(
+        self,
+        *,
+        reason: str,
+        message: str,
+        video_id: str,
+        languages: str,
+        retry_after_seconds: float,
+    ) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+        self.video_id = video_id
+        self.languages = languages
+        self.retry_after_seconds = retry_after_seconds
+
+    @property
+    def status_code(self) -> int:
+        return _STATUS_CODES.get(self.reason, 400)
+
+    def detail(self) -> dict[str, Any]:
+        """Return a JSON-serializable error body."""
+        return {
+            "reason": self.reason,
+            "message": self.message,
+            "video_id": self.video_id,
+            "languages": self.languages,
+            "retry_after_seconds": round(self.retry_after_seconds),
+        }
+
+
+def classify_fetch_error(exc: BaseException) -> str | None:
+    """Return the negative-cache reason for a caption fetch error, if it is cacheable."""
+    for error_type, reason in _REASONS:
+        if isinstance(exc, error_type):
+            return reason
+    return None
+
+
+class NegativeCache:
+    """Remember failed fetches per video and language set for a bounded time."""
+
+    def __init__(self, path: Path, ttl_seconds: float) -> None:
+        self._path = path
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+
+    def check(self, video_id: str, languages: str) -> None:
+        """Raise ``TranscriptUnavailableError`` if this fetch failed recently."""
+        key = self._key(video_id, languages)
+        now = time.time()
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return
+            remaining = float(entry["expires_at"]) - now
+            if remaining <= 0:
+                return
+
+        raise TranscriptUnavailableError(
+            reason=entry["reason"],
+            message=entry["message"],
+            video_id=video_id,
+            languages=languages,
+            retry_after_seconds=remaining,
+        )
+
+    def record(
+        self,
+        video_id: str,
+        languages: str,
+        exc: BaseException,
+    ) -> TranscriptUnavailableError | None:
+        """Store a cacheable failure and return it as a typed error, else ``None``."""
+        reason = classify_fetch_error(exc)
+        if reason is None or self._ttl_seconds <= 0:
+            return None
+
+        ttl = min(self._ttl_seconds, _SHORT_LIVED_REASONS.get(reason, self._ttl_seconds))
+        message = _MESSAGES[reason]
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            entries[self._key(video_id, languages)] = {
+                "reason": reason,
+                "message": message,
+                "recorded_at": now,
+                "expires_at": now + ttl,
+            }
+            for key in [key for key, row in entries.items() if row["expires_at"] <= now]:
+                entries.pop(key)
+            self._persist(entries)
+
+        return TranscriptUnavailableError(
+            reason=reason,
+            message=message,
+            video_id=video_id,
+            languages=languages,
+            retry_after_seconds=ttl,
+        )
+
+    def clear(self, video_id: str, languages: str) -> None:
+        """Forget a failure, e.g. after a successful fetch."""
+        key = self._key(video_id, languages)
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._persist(entries)
+
+    @staticmethod
+    def _key(video_id: str, languages: str) -> str:
+        langs = sorted({lang.strip() for lang in languages.split(",") if lang.strip()})
+        return f"{video_id}:{','.join(langs)}"
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with self._path.open("r", encoding="utf-8") as fh:
+                    loaded = json.load(fh)
+            except (OSError, ValueError):
+                loaded = {}
+            self._entries = loaded if isinstance(loaded, dict) else {}
+        return self._entries
+
+    def _persist(self, entries: dict[str, dict[str, Any]]) -> None:
+        try:
+            atomic_write_bytes(
+                self._path,
+                json.dumps(entries, indent=2, ensure_ascii=True).encode("utf-8"),
+            )
+        except OSError:
+            # The in-memory copy still short-circuits repeats for this process.
+            pass
+
@@ -1,13 +1,16 @@
-"""Helpers for checking local Ollama availability."""
+"""Helpers for checking local Ollama availability and calling its embeddings API."""
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 
-import requests
+from .http_client import get_http_session
 
 DEFAULT_OLLAMA_BASE_URL = "http://127.0.0.1:11434"
 RECOMMENDED_OLLAMA_MODEL = "llama3.1"
+DEFAULT_EMBEDDING_MODEL = "nomic-embed-text"
+DEFAULT_EMBED_BATCH_SIZE = 32
 
 
 class OllamaService:
@@ -51,6 +54,52 @@ class OllamaService:
             "message": message,
         }
 
+    def embed(
+        self,
+        texts: Sequence[str],
+        model: str,
+        base_url: str | None = None,
+        *,
+        batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+        timeout: float | None = None,
+    ) -> list[list[float]]:
+        """Embed ``texts`` via ``/api/embed``, sending ``batch_size`` inputs per request.
+
+        Raises ``RuntimeError`` when Ollama is unreachable, the model is not
+        pulled, or the response is malformed or does not hold one equally sized
+        vector per input.
+        """
+        base = self._normalize_base_url(base_url)
+        session = get_http_session()
+        vectors: list[list[float]] = []
+        for start in range(0, len(texts), max(1, batch_size)):
+            batch = list(texts[start : start + max(1, batch_size)])
+            try:
+                response = session.post(
+                    f"{base}/api/embed",
+                    json={"model": model, "input": batch},
+                    timeout=timeout or self._timeout,
+                )
+            except Exception as exc:
+                raise RuntimeError(f"Ollama is not reachable at {base}: {exc}") from exc
+
+            if response.status_code >= 400:
+                detail = response.text.strip()[:300]
+                raise RuntimeError(
+                    f"Ollama embeddings request failed ({response.status_code}). "
+                    f"Pull the model with `ollama pull {model}`. Response: {detail}"
+                )
+            try:
+                rows = response.json()["embeddings"]
+            except (ValueError, KeyError, TypeError) as exc:
+                raise RuntimeError(
+                    f"Unexpected Ollama embeddings response for model {model}."
+                ) from exc
+            if not _is_vector_batch(rows, len(batch), len(vectors[0]) if vectors else None):
+                raise RuntimeError(f"Unexpected Ollama embeddings response for model {model}.")
+            vectors.extend(rows)
+        return vectors
+
     def _normalize_base_url(self, base_url: str | None) -> str:
         raw = (base_url or DEFAULT_OLLAMA_BASE_URL).strip()
         if not raw:
@@ -63,7 +112,7 @@ class OllamaService:
 
     def _get_json(self, url: str) -> dict[str, Any] | None:
         try:
-            response = requests.get(url, timeout=self._timeout)
+            response = get_http_session().get(url, timeout=self._timeout)
             if response.status_code >= 400:
                 return None
             payload = response.json()
@@ -111,3 +160,20 @@ class OllamaService:
             seen.add(name)
             deduped.append(name)
         return deduped
+
+
+def _is_vector_batch(rows: Any, count: int, dims: int | None) -> bool:
+    """Check for ``count`` non-empty numeric vectors of one shared length."""
+    if not isinstance(rows, list) or len(rows) != count:
+        return False
+    expected = dims
+    for row in rows:
+        if not isinstance(row, list) or not row:
+            return False
+        if expected is None:
+            expected = len(row)
+        if len(row) != expected:
+            return False
+        if not all(isinstance(value, (int, float)) for value in row):
+            return False
+    return True
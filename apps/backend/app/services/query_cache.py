@@ -0,0 +1,59 @@
+"""Process-level LRU cache of retrieval results for repeated questions."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable
+
+RankedIds = tuple[tuple[int, float], ...]
+
+
+class QueryResultCache:
+    """Remember ranked ``(chunk id, score)`` lists by normalized query.
+
+    Callers build keys from the transcript id, a version of its index, the
+    retrieval engine, the normalized query and ``top_k``, so a re-chunked or
+    refreshed transcript never serves old results. Bounded by entry count.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max(0, max_entries)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, RankedIds] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> RankedIds | None:
+        with self._lock:
+            ranked = self._entries.get(key)
+            if ranked is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return ranked
+
+    def put(self, key: Hashable, ranked: RankedIds) -> None:
+        """Insert or replace an entry, evicting the least recently used over the bound."""
+        if not self._max_entries:
+            return
+        with self._lock:
+            self._entries[key] = ranked
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
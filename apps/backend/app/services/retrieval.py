@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
-from typing import TypedDict
+import heapq
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, TypedDict
 
+from .columnar import ChunkTable
+from .term_index import TermIndex
 from .text_utils import content_terms
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .embeddings import EmbeddingMatrix
+
 
 class RankedChunk(TypedDict):
     """A selected chunk paired with retrieval score."""
@@ -20,29 +29,55 @@ class RankedChunk(TypedDict):
 
 
 def select_relevant_chunks(
-    chunks: list[dict],
+    chunks: Sequence[Mapping[str, Any]],
     query: str,
     top_k: int,
+    term_index: TermIndex | None = None,
+    engine: str = "overlap",
+    embeddings: EmbeddingMatrix | None = None,
+    query_vector: np.ndarray | None = None,
 ) -> list[RankedChunk]:
-    """Rank and select top-k chunks by lexical overlap."""
+    """Rank and select top-k chunks with the ``overlap``, ``bm25`` or ``embedding`` engine.
+
+    ``overlap`` scores shared terms plus density and coverage; ``bm25``
+    weights terms by rarity and saturating frequency; ``embedding`` ranks by
+    cosine similarity of ``query_vector`` against the chunks' ``embeddings``
+    and falls back to ``bm25`` when either is missing or they do not match.
+    With a ``term_index`` for these chunks only the postings of the query
+    terms are read (BM25 needs one and builds it if missing). Otherwise
+    every chunk is tokenized, reading text straight from a ``ChunkTable``
+    buffer when one is passed. Only the selected rows are materialized
+    either way.
+    """
     desired = max(1, top_k)
     query_terms = content_terms(query)
 
     if not chunks:
         return []
 
+    if (
+        engine == "embedding"
+        and embeddings is not None
+        and query_vector is not None
+        and len(embeddings) == len(chunks)
+    ):
+        selected = _select_embedding(chunks, desired, embeddings, query_vector)
+        if selected:
+            return selected
+        # Query and matrix disagree (other model or dimension): rank lexically.
+
     if not query_terms:
-        return [
-            {
-                **chunk,
-                "score": 0.01,
-            }
-            for chunk in chunks[:desired]
-        ]
-
-    scored: list[RankedChunk] = []
-    for chunk in chunks:
-        chunk_terms = content_terms(chunk["text"])
+        return [_ranked(chunks[idx], 0.01) for idx in range(min(desired, len(chunks)))]
+
+    if engine in ("bm25", "embedding"):
+        return _select_bm25(chunks, query_terms, desired, term_index)
+
+    if term_index is not None and len(term_index) == len(chunks):
+        return _select_with_index(chunks, query_terms, desired, term_index)
+
+    scored: list[tuple[float, int, int]] = []
+    for idx, chunk_id, text in _iter_chunk_texts(chunks):
+        chunk_terms = content_terms(text)
         if not chunk_terms:
             overlap = 0
             density = 0.0
@@ -52,18 +87,125 @@ def select_relevant_chunks(
 
         coverage = overlap / max(len(query_terms), 1)
         score = float(overlap) + density + coverage
+        scored.append((round(score, 5), chunk_id, idx))
+
+    top = heapq.nlargest(desired, scored, key=lambda row: (row[0], -row[1]))
+    positive = [row for row in top if row[0] > 0]
+    selected = positive or top
+
+    return [
+        _ranked(chunks[idx], score)
+        for score, _, idx in sorted(selected, key=lambda row: row[1])
+    ]
+
 
-        scored.append(
-            {
-                **chunk,
-                "score": round(score, 5),
-            }
+def _select_bm25(
+    chunks: Sequence[Mapping[str, Any]],
+    query_terms: set[str],
+    desired: int,
+    term_index: TermIndex | None,
+) -> list[RankedChunk]:
+    from .bm25 import bm25_matrix  # NumPy is only needed by this engine.
+
+    if term_index is None or len(term_index) != len(chunks):
+        term_index = TermIndex.build(text for _, _, text in _iter_chunk_texts(chunks))
+    top = bm25_matrix(term_index).top_k(query_terms, desired)
+    if not top:
+        return [_ranked(chunks[idx], 0.0) for idx in range(min(desired, len(chunks)))]
+    return [
+        _ranked(chunks[idx], round(score, 5))
+        for idx, score in sorted(top, key=lambda row: _chunk_id(chunks, row[0]))
+    ]
+
+
+def ranked_by_ids(
+    chunks: Sequence[Mapping[str, Any]],
+    ranked: Iterable[tuple[int, float]],
+) -> list[RankedChunk]:
+    """Rebuild selected chunks from cached ``(chunk id, score)`` pairs."""
+    positions: dict[int, int] | None = None
+    selected: list[RankedChunk] = []
+    for chunk_id, score in ranked:
+        # Chunk ids are assigned 1..n, so the id usually is the position.
+        position = chunk_id - 1
+        if not 0 <= position < len(chunks) or _chunk_id(chunks, position) != chunk_id:
+            if positions is None:
+                positions = {_chunk_id(chunks, idx): idx for idx in range(len(chunks))}
+            position = positions.get(chunk_id, -1)
+            if position < 0:
+                continue
+        selected.append(_ranked(chunks[position], score))
+    return selected
+
+
+def _select_embedding(
+    chunks: Sequence[Mapping[str, Any]],
+    desired: int,
+    embeddings: EmbeddingMatrix,
+    query_vector: np.ndarray,
+) -> list[RankedChunk]:
+    """Cosine top-k, or an empty list when the query cannot be scored."""
+    top = embeddings.top_k(query_vector, desired)
+    return [
+        _ranked(chunks[idx], round(score, 5))
+        for idx, score in sorted(top, key=lambda row: _chunk_id(chunks, row[0]))
+    ]
+
+
+def _select_with_index(
+    chunks: Sequence[Mapping[str, Any]],
+    query_terms: set[str],
+    desired: int,
+    term_index: TermIndex,
+) -> list[RankedChunk]:
+    """Same scores as the full scan, computed from postings only."""
+    overlaps: dict[int, int] = {}
+    for term in query_terms:
+        postings = term_index.postings(term)
+        if postings is None:
+            continue
+        for position in postings[0]:
+            overlaps[position] = overlaps.get(position, 0) + 1
+
+    if not overlaps:
+        # Every chunk scores 0; the full scan would keep the lowest chunk ids.
+        return [_ranked(chunks[idx], 0.0) for idx in range(min(desired, len(chunks)))]
+
+    query_count = len(query_terms)
+    scored = [
+        (
+            round(
+                float(overlap)
+                + overlap / term_index.distinct_terms(position)
+                + overlap / query_count,
+                5,
+            ),
+            _chunk_id(chunks, position),
+            position,
         )
+        for position, overlap in overlaps.items()
+    ]
+    top = heapq.nlargest(desired, scored, key=lambda row: (row[0], -row[1]))
+    return [
+        _ranked(chunks[idx], score) for score, _, idx in sorted(top, key=lambda row: row[1])
+    ]
+
+
+def _chunk_id(chunks: Sequence[Mapping[str, Any]], position: int) -> int:
+    if isinstance(chunks, ChunkTable):
+        return chunks.chunk_id(position)
+    return int(chunks[position]["chunk_id"])
+
+
+def _iter_chunk_texts(chunks: Sequence[Mapping[str, Any]]) -> Iterator[tuple[int, int, str]]:
+    if isinstance(chunks, ChunkTable):
+        for idx, text in enumerate(chunks.texts()):
+            yield idx, chunks.chunk_id(idx), text
+        return
 
-    scored.sort(key=lambda item: (item["score"], -item["chunk_id"]), reverse=True)
+    for idx, chunk in enumerate(chunks):
+        yield idx, int(chunk["chunk_id"]), chunk["text"]
 
-    positive = [row for row in scored if row["score"] > 0][:desired]
-    if positive:
-        return sorted(positive, key=lambda row: row["chunk_id"])
 
-    return sorted(scored[:desired], key=lambda row: row["chunk_id"])
+def _ranked(chunk: Mapping[str, Any], score: float) -> RankedChunk:
+    return {**chunk, "score": score}  # type: ignore[typeddict-item]
@@ -0,0 +1,62 @@
+"""In-process coalescing of concurrent work that shares a key."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Hashable
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one call per key; concurrent callers wait for and share its result."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T], *, share_errors: bool = True) -> T:
+        """Execute ``fn`` once for all callers that arrive while it is running.
+
+        With ``share_errors=False`` a waiter whose leader failed runs its own
+        ``fn`` instead of re-raising the leader's error, for work whose failure
+        depends on caller state such as credentials.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is None:
+                return call.result  # type: ignore[return-value]
+            if share_errors:
+                raise call.error
+            return fn()
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return whether a call for ``key`` is currently running."""
+        with self._lock:
+            return key in self._calls
@@ -0,0 +1,658 @@
+"""SQLite transcript storage engine with WAL journaling and indexed lookups."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .columnar import ChunkTable, SegmentTable, pack_texts
+from .term_index import TermIndex
+from .text_utils import format_timestamp
+
+if TYPE_CHECKING:
+    from .storage import FileTranscriptBackend
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    transcript_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    source_label TEXT,
+    video_id TEXT,
+    source_title TEXT,
+    source_url TEXT,
+    languages TEXT,
+    chunk_words INTEGER,
+    total_words INTEGER,
+    fetched_at REAL,
+    revision INTEGER NOT NULL DEFAULT 0,
+    last_accessed REAL,
+    stored_bytes INTEGER NOT NULL DEFAULT 0,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_source ON transcripts(source);
+CREATE INDEX IF NOT EXISTS idx_transcripts_video_id ON transcripts(video_id, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_transcripts_fetched_at ON transcripts(fetched_at);
+CREATE INDEX IF NOT EXISTS idx_transcripts_last_accessed ON transcripts(last_accessed);
+
+CREATE TABLE IF NOT EXISTS segments (
+    transcript_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    start_seconds REAL NOT NULL,
+    duration_seconds REAL NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (transcript_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS chunks (
+    transcript_id TEXT NOT NULL,
+    chunk_words INTEGER NOT NULL,
+    chunk_id INTEGER NOT NULL,
+    start_seconds REAL NOT NULL,
+    end_seconds REAL NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (transcript_id, chunk_words, chunk_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS chapters (
+    transcript_id TEXT NOT NULL,
+    chapter_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    start_seconds REAL NOT NULL,
+    end_seconds REAL NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (transcript_id, chapter_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS term_indexes (
+    transcript_id TEXT NOT NULL,
+    chunk_words INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (transcript_id, chunk_words)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS embeddings (
+    transcript_id TEXT NOT NULL,
+    chunk_words INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (transcript_id, chunk_words)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS aliases (
+    legacy_id TEXT PRIMARY KEY,
+    transcript_id TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+# Payload keys kept in their own columns or tables rather than in ``extra``.
+_COLUMN_KEYS = {
+    "transcript_id",
+    "source",
+    "source_label",
+    "source_title",
+    "source_url",
+    "languages",
+    "chunk_words",
+    "total_words",
+    "fetched_at",
+    "revision",
+    "segments",
+    "chunks",
+    "chapters",
+    "chunk_sets",
+    "term_index",
+    "embeddings",
+}
+_CHILD_TABLES = ("segments", "chunks", "chapters", "term_indexes", "embeddings")
+# Approximate on-disk footprint: text bytes plus a fixed per-row overhead.
+_STORED_BYTES_SQL = """
+UPDATE transcripts SET stored_bytes = LENGTH(CAST(extra AS BLOB)) + 64
+    + COALESCE((SELECT SUM(LENGTH(CAST(text AS BLOB)) + 32) FROM segments
+                WHERE segments.transcript_id = transcripts.transcript_id), 0)
+    + COALESCE((SELECT SUM(LENGTH(CAST(text AS BLOB)) + 32) FROM chunks
+                WHERE chunks.transcript_id = transcripts.transcript_id), 0)
+    + COALESCE((SELECT SUM(LENGTH(data)) FROM term_indexes
+                WHERE term_indexes.transcript_id = transcripts.transcript_id), 0)
+    + COALESCE((SELECT SUM(LENGTH(data)) FROM embeddings
+                WHERE embeddings.transcript_id = transcripts.transcript_id), 0)
+"""
+_FILES_IMPORTED_KEY = "files_imported"
+
+
+class SqliteTranscriptBackend:
+    """Store transcripts as rows in one SQLite database.
+
+    Each thread gets its own connection; WAL mode lets readers proceed while a
+    writer commits, and writes take the lock up front with ``BEGIN IMMEDIATE``.
+    Transcripts already cached as files are imported once on first open.
+    """
+
+    def __init__(
+        self,
+        database_file: Path,
+        *,
+        import_from: FileTranscriptBackend | None = None,
+    ) -> None:
+        self._database_file = database_file
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        if import_from is not None:
+            self._import_files(import_from)
+
+    def save(self, transcript_id: str, payload: dict[str, Any]) -> None:
+        chunk_words = payload.get("chunk_words")
+        chunk_sets: dict[str, Any] = dict(payload.get("chunk_sets") or {})
+        extra = {key: value for key, value in payload.items() if key not in _COLUMN_KEYS}
+        # Parked chunk sizes keep their order so the oldest is still evicted first.
+        extra["chunk_sets"] = {
+            words: int(entry.get("total_words") or 0) for words, entry in chunk_sets.items()
+        }
+        source_label = payload.get("source_label")
+
+        with self._transaction() as conn:
+            self._delete_rows(conn, transcript_id)
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts (transcript_id, source, source_label,"
+                " video_id, source_title, source_url, languages, chunk_words, total_words,"
+                " fetched_at, revision, last_accessed, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?,"
+                " (SELECT COALESCE(MAX(revision), 0) + 1 FROM transcripts"
+                "  WHERE transcript_id = ?), ?, ?)",
+                (
+                    transcript_id,
+                    payload.get("source") or "",
+                    source_label,
+                    _video_id(source_label),
+                    payload.get("source_title"),
+                    payload.get("source_url"),
+                    payload.get("languages"),
+                    chunk_words,
+                    payload.get("total_words"),
+                    payload.get("fetched_at"),
+                    transcript_id,
+                    time.time(),
+                    json.dumps(extra, ensure_ascii=False),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO segments VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        transcript_id,
+                        position,
+                        float(row["start_seconds"]),
+                        float(row["duration_seconds"]),
+                        str(row["text"]),
+                    )
+                    for position, row in enumerate(payload.get("segments") or [])
+                ),
+            )
+            sets = [(chunk_words, payload.get("chunks") or [])]
+            sets.extend(
+                (int(words), entry.get("chunks") or []) for words, entry in chunk_sets.items()
+            )
+            for words, chunks in sets:
+                conn.executemany(
+                    "INSERT INTO chunks VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            transcript_id,
+                            int(words or 0),
+                            int(row["chunk_id"]),
+                            float(row["start_seconds"]),
+                            float(row["end_seconds"]),
+                            str(row["text"]),
+                        )
+                        for row in chunks
+                    ),
+                )
+            self._insert_chapters(conn, transcript_id, payload.get("chapters") or [])
+            active_chunks = ChunkTable.from_rows(payload.get("chunks") or [])
+            term_index = payload.get("term_index")
+            if term_index is None or len(term_index) != len(active_chunks):
+                term_index = TermIndex.build(active_chunks.texts())
+            conn.execute(
+                "INSERT INTO term_indexes VALUES (?, ?, ?)",
+                (transcript_id, int(chunk_words or 0), term_index.encode()),
+            )
+            vector_sets = [(chunk_words, payload.get("embeddings"), active_chunks)]
+            vector_sets.extend(
+                (words, entry.get("embeddings"), entry.get("chunks") or [])
+                for words, entry in chunk_sets.items()
+            )
+            conn.executemany(
+                "INSERT INTO embeddings VALUES (?, ?, ?)",
+                (
+                    (transcript_id, int(words or 0), embeddings.encode())
+                    for words, embeddings, chunks in vector_sets
+                    if embeddings is not None and len(embeddings) == len(chunks)
+                ),
+            )
+            conn.execute(_STORED_BYTES_SQL + " WHERE transcript_id = ?", (transcript_id,))
+
+    def save_chapters(self, transcript_id: str, chapters: list[dict[str, Any]]) -> bool:
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE transcripts SET revision = revision + 1 WHERE transcript_id = ?",
+                (transcript_id,),
+            ).rowcount
+            if not updated:
+                return False
+            conn.execute("DELETE FROM chapters WHERE transcript_id = ?", (transcript_id,))
+            self._insert_chapters(conn, transcript_id, chapters)
+        return True
+
+    def load(self, transcript_id: str) -> dict[str, Any] | None:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT source, source_label, source_title, source_url, languages, chunk_words,"
+            " total_words, fetched_at, extra FROM transcripts WHERE transcript_id = ?",
+            (transcript_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        (
+            source,
+            source_label,
+            source_title,
+            source_url,
+            languages,
+            chunk_words,
+            total_words,
+            fetched_at,
+            extra_raw,
+        ) = row
+        payload: dict[str, Any] = json.loads(extra_raw or "{}")
+        parked_totals: dict[str, int] = payload.pop("chunk_sets", None) or {}
+        payload.update(
+            {
+                "transcript_id": transcript_id,
+                "source": source,
+                "source_label": source_label,
+                "source_title": source_title,
+                "source_url": source_url,
+                "languages": languages,
+                "chunk_words": chunk_words,
+                "total_words": total_words,
+                "fetched_at": fetched_at,
+                "segments": self._load_segments(conn, transcript_id),
+                "chapters": self._load_chapters(conn, transcript_id),
+            }
+        )
+
+        chunk_tables = self._load_chunks(conn, transcript_id)
+        payload["chunks"] = chunk_tables.pop(int(chunk_words or 0), ChunkTable.from_rows([]))
+        index_row = conn.execute(
+            "SELECT data FROM term_indexes WHERE transcript_id = ? AND chunk_words = ?",
+            (transcript_id, int(chunk_words or 0)),
+        ).fetchone()
+        if index_row is not None:
+            payload["term_index"] = TermIndex.decode(index_row[0])
+        vectors = self._load_embeddings(conn, transcript_id)
+        if int(chunk_words or 0) in vectors:
+            payload["embeddings"] = vectors[int(chunk_words or 0)]
+        payload["chunk_sets"] = {
+            words: {
+                "chunks": chunk_tables.get(int(words), ChunkTable.from_rows([])),
+                "total_words": total,
+                **(
+                    {"embeddings": vectors[int(words)]} if int(words) in vectors else {}
+                ),
+            }
+            for words, total in parked_totals.items()
+        }
+        return payload
+
+    def version(self, transcript_id: str) -> int | None:
+        row = self._connection().execute(
+            "SELECT revision FROM transcripts WHERE transcript_id = ?",
+            (transcript_id,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, transcript_id: str) -> bool:
+        with self._transaction() as conn:
+            deleted = conn.execute(
+                "DELETE FROM transcripts WHERE transcript_id = ?",
+                (transcript_id,),
+            ).rowcount
+            self._delete_rows(conn, transcript_id)
+        return deleted > 0
+
+    def resolve_alias(self, transcript_id: str) -> str | None:
+        row = self._connection().execute(
+            "SELECT transcript_id FROM aliases WHERE legacy_id = ?",
+            (transcript_id,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def add_alias(self, legacy_id: str, transcript_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO aliases (legacy_id, transcript_id) VALUES (?, ?)",
+                (legacy_id, transcript_id),
+            )
+
+    def list(
+        self,
+        *,
+        video_id: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        query = (
+            "SELECT transcript_id, source, source_label, source_title, source_url, languages,"
+            " fetched_at FROM transcripts"
+        )
+        params: list[Any] = []
+        if video_id:
+            query += " WHERE video_id = ?"
+            params.append(video_id)
+        query += " ORDER BY fetched_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        columns = (
+            "transcript_id",
+            "source",
+            "source_label",
+            "source_title",
+            "source_url",
+            "languages",
+            "fetched_at",
+        )
+        rows = self._connection().execute(query, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def read_chunks(
+        self,
+        transcript_id: str,
+        start: int,
+        stop: int,
+    ) -> tuple[ChunkTable, int] | None:
+        with self._snapshot() as conn:
+            words = self._active_chunk_words(conn, transcript_id)
+            if words is None:
+                return None
+            total = conn.execute(
+                "SELECT COUNT(*) FROM chunks WHERE transcript_id = ? AND chunk_words = ?",
+                (transcript_id, words),
+            ).fetchone()[0]
+            rows = conn.execute(
+                "SELECT chunk_id, start_seconds, end_seconds, text FROM chunks"
+                " WHERE transcript_id = ? AND chunk_words = ? ORDER BY chunk_id"
+                " LIMIT ? OFFSET ?",
+                (transcript_id, words, max(0, stop - start), max(0, start)),
+            ).fetchall()
+        return _chunk_table(rows), total
+
+    def find_chunks(self, transcript_id: str, chunk_ids: list[int]) -> ChunkTable | None:
+        with self._snapshot() as conn:
+            words = self._active_chunk_words(conn, transcript_id)
+            if words is None:
+                return None
+            placeholders = ", ".join("?" * len(chunk_ids))
+            found = {
+                row[0]: row
+                for row in conn.execute(
+                    "SELECT chunk_id, start_seconds, end_seconds, text FROM chunks"
+                    " WHERE transcript_id = ? AND chunk_words = ?"
+                    f" AND chunk_id IN ({placeholders})",
+                    (transcript_id, words, *chunk_ids),
+                )
+            }
+        return _chunk_table(found[chunk_id] for chunk_id in chunk_ids if chunk_id in found)
+
+    def index_chunks(
+        self,
+        transcript_id: str,
+        chunks: ChunkTable,
+        chunk_words: int,
+        version: object,
+    ) -> None:
+        """Nothing to build: the ``chunks`` table is already keyed by chunk id."""
+
+    def touch(self, transcript_id: str, accessed_at: float) -> None:
+        self._connection().execute(
+            "UPDATE transcripts SET last_accessed = ? WHERE transcript_id = ?",
+            (accessed_at, transcript_id),
+        )
+
+    def usage(self) -> dict[str, int]:
+        count, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(stored_bytes), 0) FROM transcripts"
+        ).fetchone()
+        return {"transcripts": count, "bytes": total}
+
+    def least_recent(self, limit: int, offset: int = 0) -> list[tuple[str, int, float]]:
+        rows = self._connection().execute(
+            "SELECT transcript_id, stored_bytes, COALESCE(last_accessed, fetched_at, 0)"
+            " FROM transcripts ORDER BY last_accessed LIMIT ? OFFSET ?",
+            (limit, offset),
+        ).fetchall()
+        return [(transcript_id, size, accessed) for transcript_id, size, accessed in rows]
+
+    def verify(self) -> list[dict[str, str]]:
+        """Run SQLite's integrity check and report rows that cannot be loaded."""
+        conn = self._connection()
+        result = [row[0] for row in conn.execute("PRAGMA quick_check")]
+        problems: list[dict[str, str]] = []
+        if result != ["ok"]:
+            problems.append({"transcript_id": "", "problem": "; ".join(result)})
+        for (transcript_id,) in conn.execute("SELECT transcript_id FROM transcripts").fetchall():
+            try:
+                self.load(transcript_id)
+            except Exception as exc:  # Any decode failure makes the row unusable.
+                problems.append({"transcript_id": transcript_id, "problem": str(exc)})
+        return problems
+
+    def compact(self) -> dict[str, int]:
+        """Drop orphaned rows and dangling aliases, then checkpoint and vacuum."""
+        with self._transaction() as conn:
+            orphans = 0
+            for table in _CHILD_TABLES:
+                orphans += conn.execute(
+                    f"DELETE FROM {table} WHERE transcript_id NOT IN"
+                    " (SELECT transcript_id FROM transcripts)"
+                ).rowcount
+            aliases = conn.execute(
+                "DELETE FROM aliases WHERE transcript_id NOT IN"
+                " (SELECT transcript_id FROM transcripts)"
+            ).rowcount
+        conn = self._connection()
+        before = self._database_file.stat().st_size
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        return {
+            "orphan_rows_removed": orphans,
+            "aliases_dropped": aliases,
+            "bytes_reclaimed": max(0, before - self._database_file.stat().st_size),
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._database_file,
+                timeout=30.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Run several reads against one consistent view of the database."""
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _active_chunk_words(conn: sqlite3.Connection, transcript_id: str) -> int | None:
+        row = conn.execute(
+            "SELECT chunk_words FROM transcripts WHERE transcript_id = ?",
+            (transcript_id,),
+        ).fetchone()
+        return None if row is None else int(row[0] or 0)
+
+    @staticmethod
+    def _load_embeddings(conn: sqlite3.Connection, transcript_id: str) -> dict[int, Any]:
+        rows = conn.execute(
+            "SELECT chunk_words, data FROM embeddings WHERE transcript_id = ?",
+            (transcript_id,),
+        ).fetchall()
+        if not rows:
+            return {}
+        from .embeddings import EmbeddingMatrix
+
+        return {int(words): EmbeddingMatrix.decode(data) for words, data in rows}
+
+    @staticmethod
+    def _delete_rows(conn: sqlite3.Connection, transcript_id: str) -> None:
+        for table in _CHILD_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE transcript_id = ?", (transcript_id,))
+
+    @staticmethod
+    def _insert_chapters(
+        conn: sqlite3.Connection,
+        transcript_id: str,
+        chapters: list[dict[str, Any]],
+    ) -> None:
+        conn.executemany(
+            "INSERT INTO chapters VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    transcript_id,
+                    int(row["chapter_id"]),
+                    str(row["title"]),
+                    float(row["start_seconds"]),
+                    float(row["end_seconds"]),
+                    str(row.get("source") or "youtube"),
+                )
+                for row in chapters
+            ),
+        )
+
+    @staticmethod
+    def _load_segments(conn: sqlite3.Connection, transcript_id: str) -> SegmentTable:
+        texts: list[str] = []
+        starts = array("d")
+        durations = array("d")
+        for start, duration, text in conn.execute(
+            "SELECT start_seconds, duration_seconds, text FROM segments"
+            " WHERE transcript_id = ? ORDER BY position",
+            (transcript_id,),
+        ):
+            texts.append(text)
+            starts.append(start)
+            durations.append(duration)
+        text, offsets = pack_texts(texts)
+        return SegmentTable(text, offsets, starts, durations)
+
+    @staticmethod
+    def _load_chunks(conn: sqlite3.Connection, transcript_id: str) -> dict[int, ChunkTable]:
+        rows = conn.execute(
+            "SELECT chunk_words, chunk_id, start_seconds, end_seconds, text FROM chunks"
+            " WHERE transcript_id = ? ORDER BY chunk_words, chunk_id",
+            (transcript_id,),
+        )
+        return {
+            words: _chunk_table(row[1:] for row in group)
+            for words, group in groupby(rows, key=itemgetter(0))
+        }
+
+    @staticmethod
+    def _load_chapters(conn: sqlite3.Connection, transcript_id: str) -> list[dict[str, Any]]:
+        return [
+            {
+                "chapter_id": chapter_id,
+                "title": title,
+                "start_seconds": start,
+                "end_seconds": end,
+                "start_label": format_timestamp(start),
+                "end_label": format_timestamp(end),
+                "source": source,
+            }
+            for chapter_id, title, start, end, source in conn.execute(
+                "SELECT chapter_id, title, start_seconds, end_seconds, source FROM chapters"
+                " WHERE transcript_id = ? ORDER BY chapter_id",
+                (transcript_id,),
+            )
+        ]
+
+    def _import_files(self, files: FileTranscriptBackend) -> None:
+        """Import file-cached transcripts and aliases once; the files are left in place."""
+        done = self._connection().execute(
+            "SELECT 1 FROM store_meta WHERE key = ?",
+            (_FILES_IMPORTED_KEY,),
+        ).fetchone()
+        if done:
+            return
+
+        for transcript_id in files.iter_ids():
+            try:
+                payload = files.load(transcript_id)
+            except (OSError, ValueError):
+                continue
+            if isinstance(payload, Mapping) and payload.get("source") is not None:
+                self.save(transcript_id, dict(payload))
+
+        for legacy_id, transcript_id in files.aliases().items():
+            self.add_alias(str(legacy_id), str(transcript_id))
+
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, '1')",
+                (_FILES_IMPORTED_KEY,),
+            )
+
+
+def _chunk_table(rows: Iterable[tuple[int, float, float, str]]) -> ChunkTable:
+    texts: list[str] = []
+    chunk_ids = array("q")
+    starts = array("d")
+    ends = array("d")
+    for chunk_id, start, end, text in rows:
+        texts.append(text)
+        chunk_ids.append(chunk_id)
+        starts.append(start)
+        ends.append(end)
+    text, offsets = pack_texts(texts)
+    return ChunkTable(text, offsets, chunk_ids, starts, ends)
+
+
+def _video_id(source_label: str | None) -> str | None:
+    if source_label and source_label.startswith("youtube:"):
+        return source_label.split(":", 1)[1]
+    return None
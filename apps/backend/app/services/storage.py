@@ -3,28 +3,218 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Hashable, Protocol
 
 from ..api.schemas import LLMSettings
-from ..core.config import ensure_data_dirs
+from ..core.config import (
+    ensure_data_dirs,
+    get_disk_cache_quota,
+    get_storage_engine,
+    get_transcript_cache_bytes,
+)
+from .chunk_store import ChunkIndex, encode_chunk_index, patch_source_version
+from .columnar import ChunkTable, SegmentTable
+from .library_index import LibraryIndex
+from .term_index import TermIndex
+from .transcript_cache import TranscriptCache
+from .transcript_format import (
+    decode_transcript,
+    encode_chapters,
+    encode_transcript,
+    read_header,
+    replace_section,
+)
+from .write_behind import WriteBehindQueue
+
+_COMPACT_SUFFIX = ".ctx"
+_CHUNK_INDEX_SUFFIX = ".chunks"
+_HEADER_READ_BYTES = 64 * 1024
+_SETTINGS_RECHECK_SECONDS = 1.0
+_SHARD_CHARS = 2
+_STALE_TEMP_SECONDS = 60 * 60
+_ACCESS_RESOLUTION_SECONDS = 5 * 60
+_PRUNE_BATCH = 256
+# Long enough for the write-behind queue to exhaust its retries on a failing save.
+_ADOPT_FLUSH_TIMEOUT_SECONDS = 30.0
+
+
+class TranscriptBackend(Protocol):
+    """Persistence engine for transcript payloads and legacy id aliases."""
+
+    def save(self, transcript_id: str, payload: dict[str, Any]) -> None: ...
+
+    def load(self, transcript_id: str) -> dict[str, Any] | None: ...
+
+    def save_chapters(self, transcript_id: str, chapters: list[dict[str, Any]]) -> bool:
+        """Replace only the chapter list; return ``False`` if the transcript is missing."""
+        ...
+
+    def version(self, transcript_id: str) -> Hashable | None:
+        """Return a value that changes whenever the stored transcript changes."""
+        ...
+
+    def delete(self, transcript_id: str) -> bool: ...
+
+    def resolve_alias(self, transcript_id: str) -> str | None: ...
+
+    def add_alias(self, legacy_id: str, transcript_id: str) -> None: ...
+
+    def list(
+        self,
+        *,
+        video_id: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]: ...
+
+    def read_chunks(
+        self,
+        transcript_id: str,
+        start: int,
+        stop: int,
+    ) -> tuple[ChunkTable, int] | None:
+        """Return active chunks ``[start, stop)`` and the chunk count without a full load.
+
+        ``None`` means no random-access index is available (yet).
+        """
+        ...
+
+    def find_chunks(self, transcript_id: str, chunk_ids: list[int]) -> ChunkTable | None:
+        """Return active chunks by id, or ``None`` without a random-access index."""
+        ...
+
+    def index_chunks(
+        self,
+        transcript_id: str,
+        chunks: ChunkTable,
+        chunk_words: int,
+        version: Hashable,
+    ) -> None:
+        """Build the random-access index for a transcript loaded at ``version``."""
+        ...
+
+    def touch(self, transcript_id: str, accessed_at: float) -> None:
+        """Record that the transcript was read at ``accessed_at``."""
+        ...
+
+    def usage(self) -> dict[str, int]:
+        """Return ``{"transcripts": count, "bytes": total size}``."""
+        ...
+
+    def least_recent(self, limit: int, offset: int = 0) -> list[tuple[str, int, float]]:
+        """Return ``(id, size, last access)`` rows, least recently used first."""
+        ...
+
+    def verify(self) -> list[dict[str, str]]: ...
+
+    def compact(self) -> dict[str, int]: ...
+
+
+class _PendingTranscript:
+    """A queued transcript write: a full payload, or only a new chapter list."""
+
+    __slots__ = ("payload", "chapters")
+
+    def __init__(
+        self,
+        payload: dict[str, Any] | None = None,
+        chapters: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.payload = payload
+        self.chapters = chapters
 
 
 class LocalStore:
-    """Simple JSON file persistence under local app data directory."""
+    """Local persistence for settings (JSON) and transcripts (compact files or SQLite)."""
 
-    def __init__(self) -> None:
+    def __init__(self, engine: str | None = None) -> None:
         paths = ensure_data_dirs()
         self._settings_file: Path = paths["settings_file"]
-        self._transcripts_dir: Path = paths["transcripts_dir"]
+        self._settings_lock = threading.Lock()
+        self._settings: tuple[Hashable | None, LLMSettings] | None = None
+        self._settings_checked_at = 0.0
+        self._engine = engine or get_storage_engine()
+        self._data_dir: Path = paths["root"]
+        self._transcripts = _build_backend(self._engine, paths)
+        self._quota = get_disk_cache_quota()
+        self._accessed: dict[str, float] = {}
+        self._cache = TranscriptCache(get_transcript_cache_bytes())
+        self._library_file: Path = paths["library_index_file"]
+        self._library: LibraryIndex | None = None
+        self._library_unavailable = False
+        self._library_lock = threading.Lock()
+        self._library_backfill: threading.Thread | None = None
+        self._library_ready = threading.Event()
+        self._writes: WriteBehindQueue[_PendingTranscript] = WriteBehindQueue(
+            self._persist,
+            name="capyap-store-writer",
+        )
 
     def load_settings(self) -> LLMSettings:
-        """Load saved settings, or return defaults on first run."""
+        """Return the current settings snapshot, or defaults on first run.
+
+        The parsed, frozen settings are kept in memory. The file is re-checked
+        at most once per ``_SETTINGS_RECHECK_SECONDS`` and only re-read when
+        its mtime or size changed, so hand edits are still picked up.
+        """
+        return self._settings_snapshot()[1]
+
+    def has_settings(self) -> bool:
+        """Return whether settings were already persisted locally."""
+        return self._settings_snapshot()[0] is not None
+
+    def save_settings(self, settings: LLMSettings) -> LLMSettings:
+        """Persist non-secret settings only."""
+        persistable = settings.model_dump()
+        saved = LLMSettings.model_validate(persistable)
+        with self._settings_lock:
+            self._write_json(self._settings_file, persistable)
+            self._settings = (self._settings_version(), saved)
+            self._settings_checked_at = time.monotonic()
+        return saved
+
+    def _settings_snapshot(self) -> tuple[Hashable | None, LLMSettings]:
+        snapshot = self._settings
+        if (
+            snapshot is not None
+            and time.monotonic() - self._settings_checked_at < _SETTINGS_RECHECK_SECONDS
+        ):
+            return snapshot
+
+        with self._settings_lock:
+            version = self._settings_version()
+            if self._settings is None or self._settings[0] != version:
+                self._settings = (version, self._read_settings())
+                # Reading may have rewritten the file without legacy fields.
+                self._settings = (self._settings_version(), self._settings[1])
+            self._settings_checked_at = time.monotonic()
+            return self._settings
+
+    def _settings_version(self) -> Hashable | None:
+        try:
+            stat = self._settings_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_settings(self) -> LLMSettings:
         if not self._settings_file.exists():
             return LLMSettings()
 
-        payload = self._read_json(self._settings_file)
+        try:
+            payload = self._read_json(self._settings_file)
+        except ValueError:
+            return LLMSettings()
         migrated = self._strip_legacy_token_fields(payload)
         if migrated != payload:
             self._write_json(self._settings_file, migrated)
@@ -33,46 +223,419 @@ class LocalStore:
         except Exception:
             return LLMSettings()
 
-    def has_settings(self) -> bool:
-        """Return whether settings were already persisted locally."""
-        return self._settings_file.exists()
-
-    def save_settings(self, settings: LLMSettings) -> LLMSettings:
-        """Persist non-secret settings only."""
-        persistable = settings.model_dump()
-        self._write_json(self._settings_file, persistable)
-        return LLMSettings.model_validate(persistable)
-
     def build_transcript_id(self, source: str) -> str:
         """Build stable id for a transcript source."""
         digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
         return digest[:16]
 
-    def transcript_path(self, transcript_id: str) -> Path:
-        """Resolve transcript cache file path."""
-        return self._transcripts_dir / f"{transcript_id}.json"
-
     def save_transcript(self, transcript_id: str, payload: dict[str, Any]) -> None:
-        """Save transcript metadata/chunks to disk."""
-        path = self.transcript_path(transcript_id)
-        self._write_json(path, payload)
+        """Queue transcript metadata, segments, chunks and chapters for saving.
+
+        The write happens on a background thread with an atomic replace; rapid
+        saves of one transcript coalesce into one write, and reads through this
+        store see the new payload immediately.
+        """
+        pending = _PendingTranscript(payload=compact_payload(payload))
+        self._writes.update(transcript_id, lambda _previous: pending)
+
+    def save_chapters(self, transcript_id: str, chapters: list[dict[str, Any]]) -> None:
+        """Queue a chapter-list update without rewriting segments and chunks."""
+        resolved = self.resolve_transcript_id(transcript_id)
+        rows = [dict(row) for row in chapters]
+
+        def _merge(previous: _PendingTranscript | None) -> _PendingTranscript:
+            if previous is not None and previous.payload is not None:
+                return _PendingTranscript(payload={**previous.payload, "chapters": rows})
+            return _PendingTranscript(chapters=rows)
+
+        self._writes.update(resolved, _merge)
 
     def load_transcript(self, transcript_id: str) -> dict[str, Any] | None:
-        """Load transcript by id if present."""
-        path = self.transcript_path(transcript_id)
-        if not path.exists():
+        """Load transcript by id if present, following legacy id aliases.
+
+        Unwritten saves are returned first. Otherwise parsed payloads are served
+        from an in-memory LRU while their stored version is unchanged. Callers
+        get a shallow copy and must not mutate nested values.
+        """
+        resolved = self.resolve_transcript_id(transcript_id)
+        pending = self._writes.pending(resolved)
+        if pending is not None and pending.payload is not None:
+            return dict(pending.payload)
+
+        payload = self._load_durable(resolved)
+        if payload is not None:
+            self._note_access(resolved)
+            if pending is not None:
+                payload["chapters"] = pending.chapters
+        return payload
+
+    def read_chunks(
+        self,
+        transcript_id: str,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> tuple[ChunkTable, int] | None:
+        """Return one page of the active chunk set and its total chunk count.
+
+        Parsed transcripts already in memory are sliced directly; otherwise
+        only the requested rows are read from the random-access chunk index,
+        which is built on first use for transcripts saved without one.
+        """
+        resolved = self.resolve_transcript_id(transcript_id)
+        payload = self._in_memory(resolved)
+        if payload is None:
+            page = self._transcripts.read_chunks(resolved, offset, offset + limit)
+            if page is not None:
+                self._note_access(resolved)
+                return page
+            payload = self._load_and_index(resolved)
+            if payload is None:
+                return None
+        chunks = ChunkTable.from_rows(payload["chunks"])
+        return chunks[offset : offset + limit], len(chunks)
+
+    def find_chunks(self, transcript_id: str, chunk_ids: list[int]) -> ChunkTable | None:
+        """Return chunks of the active set by id (e.g. to hydrate citations)."""
+        resolved = self.resolve_transcript_id(transcript_id)
+        payload = self._in_memory(resolved)
+        if payload is None:
+            found = self._transcripts.find_chunks(resolved, chunk_ids)
+            if found is not None:
+                self._note_access(resolved)
+                return found
+            payload = self._load_and_index(resolved)
+            if payload is None:
+                return None
+        chunks = ChunkTable.from_rows(payload["chunks"])
+        positions = {chunks.chunk_id(idx): idx for idx in range(len(chunks))}
+        return ChunkTable.from_rows(
+            chunks[positions[chunk_id]] for chunk_id in chunk_ids if chunk_id in positions
+        )
+
+    def _in_memory(self, transcript_id: str) -> dict[str, Any] | None:
+        pending = self._writes.pending(transcript_id)
+        if pending is not None:
+            # A queued chapter update leaves the chunks of the stored copy valid.
+            return pending.payload
+        version = self._transcripts.version(transcript_id)
+        return None if version is None else self._cache.get(transcript_id, version)
+
+    def _load_and_index(self, transcript_id: str) -> dict[str, Any] | None:
+        version = self._transcripts.version(transcript_id)
+        payload = self.load_transcript(transcript_id)
+        if payload is not None and version is not None:
+            self._transcripts.index_chunks(
+                transcript_id,
+                ChunkTable.from_rows(payload["chunks"]),
+                int(payload.get("chunk_words") or 0),
+                version,
+            )
+        return payload
+
+    def flush_writes(self, timeout: float | None = None) -> bool:
+        """Wait until every queued transcript write has reached storage."""
+        return self._writes.flush(timeout)
+
+    def transcript_cache_stats(self) -> dict[str, Any]:
+        """Return hit/miss counters of the parsed-transcript cache, writer state and disk usage."""
+        writes = self._writes.stats()
+        disk = self._transcripts.usage()
+        return {
+            **self._cache.stats(),
+            "pending_writes": writes["queued"],
+            "write_failures": writes["failures"],
+            "write_retries_pending": writes["retrying"],
+            "unwritten_transcripts": writes["unwritten"],
+            "last_write_error": writes["last_error"],
+            "disk_transcripts": disk["transcripts"],
+            "disk_bytes": disk["bytes"],
+            "disk_max_bytes": self._quota["max_bytes"],
+            "disk_max_transcripts": self._quota["max_transcripts"],
+        }
+
+    def search_library(self, query: str, *, limit: int = 20, offset: int = 0) -> dict[str, Any]:
+        """Rank chunks of every stored transcript against ``query``.
+
+        The library index is updated as transcripts are saved or evicted.
+        Transcripts stored before it existed are indexed by a one-time
+        background pass started on the first search; ``indexing`` stays true
+        until it finishes. Raises ``RuntimeError`` if SQLite lacks FTS5.
+        """
+        library = self._library_index()
+        if library is None:
+            raise RuntimeError("Library search needs SQLite built with the FTS5 extension.")
+        indexing = self._start_library_backfill(library)
+        return {
+            "hits": library.search(query, limit, offset),
+            "indexed_transcripts": library.document_count(),
+            "indexing": indexing,
+        }
+
+    def _library_index(self) -> LibraryIndex | None:
+        with self._library_lock:
+            if self._library is None and not self._library_unavailable:
+                try:
+                    self._library = LibraryIndex(self._library_file)
+                except sqlite3.Error:
+                    self._library_unavailable = True
+            return self._library
+
+    def _start_library_backfill(self, library: LibraryIndex) -> bool:
+        if self._library_ready.is_set():
+            return False
+        with self._library_lock:
+            if self._library_backfill is None:
+                if library.is_backfilled():
+                    self._library_ready.set()
+                    return False
+                self._library_backfill = threading.Thread(
+                    target=self._backfill_library,
+                    args=(library,),
+                    name="capyap-library-index",
+                    daemon=True,
+                )
+                self._library_backfill.start()
+        return not self._library_ready.is_set()
+
+    def _backfill_library(self, library: LibraryIndex) -> None:
+        try:
+            # Snapshot the ids first so evictions during the pass cannot shift pages.
+            transcript_ids: list[str] = []
+            while page := self._transcripts.list(limit=_PRUNE_BATCH, offset=len(transcript_ids)):
+                transcript_ids.extend(row["transcript_id"] for row in page)
+            indexed = library.indexed_ids()
+            for transcript_id in transcript_ids:
+                if transcript_id in indexed:
+                    continue
+                payload = self._transcripts.load(transcript_id)
+                if payload is not None:
+                    # A save that raced this pass already indexed the newer payload.
+                    library.index_transcript(transcript_id, payload, replace=False)
+            library.mark_backfilled()
+            self._library_ready.set()
+        except Exception:
+            # Left unmarked, so the next search starts another pass.
+            with self._library_lock:
+                self._library_backfill = None
+
+    def _update_library(self, transcript_id: str, payload: dict[str, Any] | None) -> None:
+        """Index (or with ``None`` remove) one transcript; never fails the caller."""
+        library = self._library_index()
+        if library is None:
+            return
+        try:
+            if payload is None:
+                library.remove(transcript_id)
+            else:
+                library.index_transcript(transcript_id, payload)
+        except sqlite3.Error:
+            pass
+
+    def disk_usage(self) -> dict[str, Any]:
+        """Return stored transcript count and size next to the configured quota."""
+        return {
+            "engine": self._engine,
+            "location": str(self._data_dir),
+            **self._transcripts.usage(),
+            "max_bytes": self._quota["max_bytes"],
+            "max_transcripts": self._quota["max_transcripts"],
+        }
+
+    def prune_transcripts(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_transcripts: int | None = None,
+        older_than_seconds: float | None = None,
+        dry_run: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Evict least recently used transcripts until the store fits the limits.
+
+        Limits default to the configured quota and 0 means unlimited. With
+        ``older_than_seconds`` anything not read for that long is evicted too.
+        Transcripts with unwritten saves are never evicted. Returns the
+        evicted (or, with ``dry_run``, the would-be evicted) entries.
+        """
+        return self._prune(
+            max_bytes=self._quota["max_bytes"] if max_bytes is None else max_bytes,
+            max_transcripts=(
+                self._quota["max_transcripts"] if max_transcripts is None else max_transcripts
+            ),
+            older_than_seconds=older_than_seconds,
+            dry_run=dry_run,
+            protect=set(),
+        )
+
+    def verify_transcripts(self, *, fix: bool = False) -> list[dict[str, str]]:
+        """Check every stored transcript decodes; with ``fix`` delete broken ones."""
+        self.flush_writes()
+        problems = self._transcripts.verify()
+        if fix:
+            for problem in problems:
+                if problem["transcript_id"]:
+                    self._evict(problem["transcript_id"])
+        return problems
+
+    def compact_transcripts(self) -> dict[str, int]:
+        """Rewrite storage into its current layout and reclaim unused space."""
+        self.flush_writes()
+        return self._transcripts.compact()
+
+    def _prune(
+        self,
+        *,
+        max_bytes: int,
+        max_transcripts: int,
+        older_than_seconds: float | None,
+        dry_run: bool,
+        protect: set[str],
+    ) -> list[dict[str, Any]]:
+        usage = self._transcripts.usage()
+        count, total = usage["transcripts"], usage["bytes"]
+        cutoff = time.time() - older_than_seconds if older_than_seconds else None
+        evicted: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            page = self._transcripts.least_recent(_PRUNE_BATCH, offset)
+            if not page:
+                return evicted
+            kept = 0
+            for transcript_id, size, accessed_at in page:
+                over = (max_bytes and total > max_bytes) or (
+                    max_transcripts and count > max_transcripts
+                )
+                expired = cutoff is not None and accessed_at < cutoff
+                if not over and not expired:
+                    # Rows are in access order, so nothing later qualifies either.
+                    return evicted
+                if transcript_id in protect or self._writes.pending(transcript_id) is not None:
+                    kept += 1
+                    continue
+                if not dry_run:
+                    self._evict(transcript_id)
+                evicted.append(
+                    {"transcript_id": transcript_id, "bytes": size, "last_accessed": accessed_at}
+                )
+                count -= 1
+                total -= size
+            # Evicted rows drop out of the ordering; only skipped ones shift the offset.
+            offset += len(page) if dry_run else kept
+
+    def _enforce_quota(self, transcript_id: str) -> None:
+        max_bytes = self._quota["max_bytes"]
+        max_transcripts = self._quota["max_transcripts"]
+        if not max_bytes and not max_transcripts:
+            return
+        usage = self._transcripts.usage()
+        if (max_bytes and usage["bytes"] > max_bytes) or (
+            max_transcripts and usage["transcripts"] > max_transcripts
+        ):
+            self._prune(
+                max_bytes=max_bytes,
+                max_transcripts=max_transcripts,
+                older_than_seconds=None,
+                dry_run=False,
+                protect={transcript_id},
+            )
+
+    def _evict(self, transcript_id: str) -> None:
+        self._transcripts.delete(transcript_id)
+        self._cache.discard(transcript_id)
+        self._accessed.pop(transcript_id, None)
+        self._update_library(transcript_id, None)
+
+    def _note_access(self, transcript_id: str) -> None:
+        """Persist a read for LRU eviction, at most once per resolution window."""
+        now = time.time()
+        last = self._accessed.get(transcript_id)
+        if last is not None and now - last < _ACCESS_RESOLUTION_SECONDS:
+            return
+        self._accessed[transcript_id] = now
+        try:
+            self._transcripts.touch(transcript_id, now)
+        except Exception:
+            # Access tracking is best effort and must never fail a read.
+            pass
+
+    def _load_durable(self, transcript_id: str) -> dict[str, Any] | None:
+        version = self._transcripts.version(transcript_id)
+        if version is None:
+            self._cache.discard(transcript_id)
+            return None
+
+        cached = self._cache.get(transcript_id, version)
+        if cached is not None:
+            return cached
+
+        payload = self._transcripts.load(transcript_id)
+        if payload is None:
             return None
-        return self._read_json(path)
+        compacted = compact_payload(payload)
+        self._cache.put(transcript_id, version, compacted)
+        return dict(compacted)
+
+    def _persist(self, transcript_id: str, pending: _PendingTranscript) -> None:
+        if pending.payload is None:
+            self._transcripts.save_chapters(transcript_id, pending.chapters or [])
+            return
+
+        self._transcripts.save(transcript_id, pending.payload)
+        self._accessed[transcript_id] = time.time()
+        self._update_library(transcript_id, pending.payload)
+        version = self._transcripts.version(transcript_id)
+        if version is not None and self._writes.is_latest(transcript_id, pending):
+            self._cache.put(transcript_id, version, pending.payload)
+        self._enforce_quota(transcript_id)
+
+    def list_transcripts(
+        self,
+        *,
+        video_id: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Return summary rows for stored transcripts, most recently fetched first."""
+        return self._transcripts.list(video_id=video_id, limit=limit, offset=offset)
+
+    def resolve_transcript_id(self, transcript_id: str) -> str:
+        """Map a legacy transcript id to the canonical id it was merged into."""
+        return self._transcripts.resolve_alias(transcript_id) or transcript_id
+
+    def adopt_transcript(self, legacy_id: str, canonical_id: str) -> dict[str, Any] | None:
+        """Move a transcript saved under a legacy id to its canonical id.
+
+        The legacy id keeps resolving through the alias table, so links and
+        client state that still carry it continue to work. If the canonical
+        copy cannot be written, the legacy copy is kept and ``None`` returned.
+        """
+        if legacy_id == canonical_id:
+            return self.load_transcript(canonical_id)
+
+        payload = self._transcripts.load(legacy_id)
+        if payload is None:
+            return None
+
+        payload["transcript_id"] = canonical_id
+        self.save_transcript(canonical_id, payload)
+        # The legacy copy is only removed once the canonical one is durable.
+        if (
+            not self.flush_writes(_ADOPT_FLUSH_TIMEOUT_SECONDS)
+            or self._writes.pending(canonical_id) is not None
+        ):
+            return None
+        self._transcripts.add_alias(legacy_id, canonical_id)
+        self._transcripts.delete(legacy_id)
+        self._cache.discard(legacy_id)
+        self._update_library(legacy_id, None)
+        return payload
 
     @staticmethod
     def _read_json(path: Path) -> dict[str, Any]:
-        with path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
+        return read_json(path)
 
     @staticmethod
     def _write_json(path: Path, payload: dict[str, Any]) -> None:
-        with path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2, ensure_ascii=True)
+        write_json(path, payload)
 
     @staticmethod
     def _strip_legacy_token_fields(payload: dict[str, Any]) -> dict[str, Any]:
@@ -84,3 +647,517 @@ class LocalStore:
         cleaned.pop("token_env", None)
         cleaned.pop("store_token", None)
         return cleaned
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize columnar transcript tables as their plain row lists."""
+    to_rows = getattr(value, "to_rows", None)
+    if callable(to_rows):
+        return to_rows()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FileTranscriptBackend:
+    """One compact file per transcript under ``transcripts/<id[:2]>/``.
+
+    New writes use the compressed sectioned format in ``<id>.ctx`` inside a
+    two-character shard directory, so no single directory grows with the
+    library. Flat ``<id>.ctx`` and legacy ``<id>.json`` files are still read
+    and are replaced on their next save. A file's atime records its last use.
+    """
+
+    def __init__(self, transcripts_dir: Path, aliases_file: Path) -> None:
+        self._transcripts_dir = transcripts_dir
+        self._aliases_file = aliases_file
+        self._aliases_lock = threading.Lock()
+        self._aliases: dict[str, str] | None = None
+        # id -> (size, last access), built by one scan on first quota check.
+        self._usage_lock = threading.Lock()
+        self._usage: dict[str, tuple[int, float]] | None = None
+        self._usage_bytes = 0
+
+    def path(self, transcript_id: str) -> Path:
+        """Resolve the sharded compact transcript file path."""
+        return (
+            self._transcripts_dir
+            / transcript_id[:_SHARD_CHARS]
+            / f"{transcript_id}{_COMPACT_SUFFIX}"
+        )
+
+    def flat_path(self, transcript_id: str) -> Path:
+        """Resolve the pre-shard compact transcript file path."""
+        return self._transcripts_dir / f"{transcript_id}{_COMPACT_SUFFIX}"
+
+    def legacy_path(self, transcript_id: str) -> Path:
+        """Resolve the pre-compact JSON transcript file path."""
+        return self._transcripts_dir / f"{transcript_id}.json"
+
+    def chunk_index_path(self, transcript_id: str) -> Path:
+        """Resolve the random-access chunk file kept next to the transcript."""
+        return self.path(transcript_id).with_suffix(_CHUNK_INDEX_SUFFIX)
+
+    def save(self, transcript_id: str, payload: dict[str, Any]) -> None:
+        path = self.path(transcript_id)
+        path.parent.mkdir(exist_ok=True)
+        # Drop the old chunk index first so a crash never leaves it looking current.
+        self.chunk_index_path(transcript_id).unlink(missing_ok=True)
+        atomic_write_bytes(path, encode_transcript(payload))
+        self.flat_path(transcript_id).unlink(missing_ok=True)
+        self.legacy_path(transcript_id).unlink(missing_ok=True)
+        stat = path.stat()
+        self._write_chunk_index(
+            transcript_id,
+            ChunkTable.from_rows(payload.get("chunks") or []),
+            int(payload.get("chunk_words") or 0),
+            (stat.st_mtime_ns, stat.st_size),
+        )
+        self._record_usage(transcript_id, path)
+
+    def save_chapters(self, transcript_id: str, chapters: list[dict[str, Any]]) -> bool:
+        current = self._existing_path(transcript_id)
+        if current is None:
+            return False
+        if current.suffix != _COMPACT_SUFFIX:
+            legacy = read_json(current)
+            legacy["chapters"] = chapters
+            self.save(transcript_id, legacy)
+            return True
+
+        before = current.stat()
+        data = replace_section(current.read_bytes(), "chapters", encode_chapters(chapters))
+        path = self.path(transcript_id)
+        path.parent.mkdir(exist_ok=True)
+        atomic_write_bytes(path, data)
+        if current != path:
+            current.unlink(missing_ok=True)
+        after = path.stat()
+        # Chunks did not change, so a current chunk index only needs re-pointing.
+        patch_source_version(
+            self.chunk_index_path(transcript_id),
+            (before.st_mtime_ns, before.st_size),
+            (after.st_mtime_ns, after.st_size),
+        )
+        self._record_usage(transcript_id, path)
+        return True
+
+    def load(self, transcript_id: str) -> dict[str, Any] | None:
+        path = self._existing_path(transcript_id)
+        if path is None:
+            return None
+        if path.suffix == _COMPACT_SUFFIX:
+            return decode_transcript(path.read_bytes())
+        return read_json(path)
+
+    def version(self, transcript_id: str) -> Hashable | None:
+        for path in self._candidate_paths(transcript_id):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            return (str(path.parent), path.suffix, stat.st_mtime_ns, stat.st_size)
+        return None
+
+    def delete(self, transcript_id: str) -> bool:
+        deleted = False
+        for path in self._candidate_paths(transcript_id):
+            if path.exists():
+                path.unlink(missing_ok=True)
+                deleted = True
+        self.chunk_index_path(transcript_id).unlink(missing_ok=True)
+        with self._usage_lock:
+            if self._usage is not None and transcript_id in self._usage:
+                self._usage_bytes -= self._usage.pop(transcript_id)[0]
+        return deleted
+
+    def read_chunks(
+        self,
+        transcript_id: str,
+        start: int,
+        stop: int,
+    ) -> tuple[ChunkTable, int] | None:
+        with self._open_chunk_index(transcript_id) as index:
+            if index is None:
+                return None
+            return index.rows(start, stop), index.count
+
+    def find_chunks(self, transcript_id: str, chunk_ids: list[int]) -> ChunkTable | None:
+        with self._open_chunk_index(transcript_id) as index:
+            return None if index is None else index.find(chunk_ids)
+
+    def index_chunks(
+        self,
+        transcript_id: str,
+        chunks: ChunkTable,
+        chunk_words: int,
+        version: Hashable,
+    ) -> None:
+        """Build the chunk file for a transcript last seen at ``version``."""
+        if not isinstance(version, tuple) or version[:2] != (
+            str(self.path(transcript_id).parent),
+            _COMPACT_SUFFIX,
+        ):
+            # Only sharded compact files get one; ``capyap cache compact`` migrates the rest.
+            return
+        self._write_chunk_index(transcript_id, chunks, chunk_words, version[2:])
+
+    def touch(self, transcript_id: str, accessed_at: float) -> None:
+        """Record an access by moving the file's atime; mtime (the version) is kept."""
+        for path in self._candidate_paths(transcript_id):
+            try:
+                stat = path.stat()
+                os.utime(path, ns=(int(accessed_at * 1e9), stat.st_mtime_ns))
+            except FileNotFoundError:
+                continue
+            with self._usage_lock:
+                if self._usage is not None and transcript_id in self._usage:
+                    self._usage[transcript_id] = (self._usage[transcript_id][0], accessed_at)
+            return
+
+    def usage(self) -> dict[str, int]:
+        """Return the number of stored transcripts and their total size in bytes."""
+        with self._usage_lock:
+            usage = self._ensure_usage()
+            return {"transcripts": len(usage), "bytes": self._usage_bytes}
+
+    def least_recent(self, limit: int, offset: int = 0) -> list[tuple[str, int, float]]:
+        """Return ``(id, size, last access)`` rows, least recently used first."""
+        with self._usage_lock:
+            rows = heapq.nsmallest(
+                offset + limit,
+                self._ensure_usage().items(),
+                key=lambda item: item[1][1],
+            )
+        return [(transcript_id, size, accessed) for transcript_id, (size, accessed) in rows][
+            offset:
+        ]
+
+    def verify(self) -> list[dict[str, str]]:
+        """Fully decode every stored transcript and report the ones that fail."""
+        problems: list[dict[str, str]] = []
+        for transcript_id in self.iter_ids():
+            try:
+                payload = self.load(transcript_id)
+            except Exception as exc:  # Any decode failure makes the entry unusable.
+                problems.append({"transcript_id": transcript_id, "problem": str(exc)})
+                continue
+            if not isinstance(payload, dict) or not payload.get("source"):
+                problems.append(
+                    {"transcript_id": transcript_id, "problem": "Missing transcript source."}
+                )
+        return problems
+
+    def compact(self) -> dict[str, int]:
+        """Move flat and legacy files into shards and drop stale leftovers.
+
+        Legacy JSON is re-encoded in the compact format with its access time
+        kept. Temp files from interrupted writes, chunk files without a
+        transcript, and aliases that point at transcripts no longer stored
+        are dropped.
+        """
+        migrated = 0
+        for transcript_id in list(self.iter_ids()):
+            current = self._existing_path(transcript_id)
+            target = self.path(transcript_id)
+            if current is None or current == target:
+                continue
+            try:
+                stat = current.stat()
+                if current.suffix == _COMPACT_SUFFIX:
+                    target.parent.mkdir(exist_ok=True)
+                    os.replace(current, target)
+                else:
+                    self.save(transcript_id, read_json(current))
+                    os.utime(target, ns=(stat.st_atime_ns, target.stat().st_mtime_ns))
+            except (OSError, ValueError):
+                continue
+            migrated += 1
+
+        stale_removed = 0
+        stale_before = time.time() - _STALE_TEMP_SECONDS
+        for directory in [self._transcripts_dir, *self._shard_dirs()]:
+            for temp in directory.glob(".*.tmp"):
+                try:
+                    if temp.stat().st_mtime < stale_before:
+                        temp.unlink()
+                        stale_removed += 1
+                except FileNotFoundError:
+                    continue
+            for index in directory.glob(f"*{_CHUNK_INDEX_SUFFIX}"):
+                if not index.with_suffix(_COMPACT_SUFFIX).exists():
+                    index.unlink(missing_ok=True)
+                    stale_removed += 1
+            if directory != self._transcripts_dir:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    pass
+
+        with self._aliases_lock:
+            aliases = self._load_aliases()
+            dangling = [
+                legacy_id
+                for legacy_id, transcript_id in aliases.items()
+                if self._existing_path(transcript_id) is None
+            ]
+            for legacy_id in dangling:
+                del aliases[legacy_id]
+            if dangling:
+                write_json(self._aliases_file, aliases)
+
+        with self._usage_lock:
+            self._usage = None
+        return {
+            "migrated": migrated,
+            "stale_files_removed": stale_removed,
+            "aliases_dropped": len(dangling),
+        }
+
+    def iter_ids(self) -> Iterator[str]:
+        """Yield every stored transcript id once."""
+        seen: set[str] = set()
+        for entry in self._iter_entries():
+            transcript_id = entry.name.rsplit(".", 1)[0]
+            if transcript_id not in seen:
+                seen.add(transcript_id)
+                yield transcript_id
+
+    def resolve_alias(self, transcript_id: str) -> str | None:
+        with self._aliases_lock:
+            return self._load_aliases().get(transcript_id)
+
+    def add_alias(self, legacy_id: str, transcript_id: str) -> None:
+        with self._aliases_lock:
+            aliases = self._load_aliases()
+            aliases[legacy_id] = transcript_id
+            write_json(self._aliases_file, aliases)
+
+    def aliases(self) -> dict[str, str]:
+        """Return a copy of the legacy id alias table."""
+        with self._aliases_lock:
+            return dict(self._load_aliases())
+
+    def list(
+        self,
+        *,
+        video_id: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        # No index here: every header is read. Use the SQLite engine for large libraries.
+        rows: list[dict[str, Any]] = []
+        for transcript_id in self.iter_ids():
+            try:
+                meta = self._read_meta(transcript_id)
+            except (OSError, ValueError):
+                continue
+            if meta is None:
+                continue
+            if video_id and meta.get("source_label") != f"youtube:{video_id}":
+                continue
+            rows.append(transcript_summary(meta))
+        rows.sort(key=lambda row: row["fetched_at"] or 0.0, reverse=True)
+        return rows[offset : offset + limit]
+
+    def _candidate_paths(self, transcript_id: str) -> tuple[Path, Path, Path]:
+        return (
+            self.path(transcript_id),
+            self.flat_path(transcript_id),
+            self.legacy_path(transcript_id),
+        )
+
+    def _existing_path(self, transcript_id: str) -> Path | None:
+        for path in self._candidate_paths(transcript_id):
+            if path.exists():
+                return path
+        return None
+
+    @contextmanager
+    def _open_chunk_index(self, transcript_id: str) -> Iterator[ChunkIndex | None]:
+        """Yield the chunk file if it matches the current transcript file, else ``None``."""
+        try:
+            stat = self.path(transcript_id).stat()
+            index = ChunkIndex(self.chunk_index_path(transcript_id))
+        except (FileNotFoundError, ValueError):
+            yield None
+            return
+        try:
+            yield index if index.source_version == (stat.st_mtime_ns, stat.st_size) else None
+        finally:
+            index.close()
+
+    def _write_chunk_index(
+        self,
+        transcript_id: str,
+        chunks: ChunkTable,
+        chunk_words: int,
+        source_version: tuple[int, int],
+    ) -> None:
+        atomic_write_bytes(
+            self.chunk_index_path(transcript_id),
+            encode_chunk_index(chunks, chunk_words, source_version),
+        )
+
+    def _shard_dirs(self) -> list[Path]:
+        with os.scandir(self._transcripts_dir) as entries:
+            return [Path(entry.path) for entry in entries if entry.is_dir()]
+
+    def _iter_entries(self) -> Iterator[os.DirEntry[str]]:
+        """Yield transcript files, sharded ones before flat and legacy ones."""
+        flat: list[os.DirEntry[str]] = []
+        for shard in self._shard_dirs():
+            with os.scandir(shard) as entries:
+                for entry in entries:
+                    if _is_transcript_file(entry, (_COMPACT_SUFFIX,)):
+                        yield entry
+        with os.scandir(self._transcripts_dir) as entries:
+            flat = [
+                entry
+                for entry in entries
+                if _is_transcript_file(entry, (_COMPACT_SUFFIX, ".json"))
+            ]
+        yield from flat
+
+    def _ensure_usage(self) -> dict[str, tuple[int, float]]:
+        if self._usage is None:
+            usage: dict[str, tuple[int, float]] = {}
+            for entry in self._iter_entries():
+                transcript_id = entry.name.rsplit(".", 1)[0]
+                if transcript_id in usage:
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                size = stat.st_size + _file_size(self.chunk_index_path(transcript_id))
+                usage[transcript_id] = (size, stat.st_atime)
+            self._usage = usage
+            self._usage_bytes = sum(size for size, _ in usage.values())
+        return self._usage
+
+    def _record_usage(self, transcript_id: str, path: Path) -> None:
+        with self._usage_lock:
+            if self._usage is None:
+                return
+            try:
+                size = path.stat().st_size + _file_size(self.chunk_index_path(transcript_id))
+            except FileNotFoundError:
+                return
+            previous = self._usage.get(transcript_id)
+            self._usage_bytes += size - (previous[0] if previous else 0)
+            self._usage[transcript_id] = (size, time.time())
+
+    def _read_meta(self, transcript_id: str) -> dict[str, Any] | None:
+        path = self._existing_path(transcript_id)
+        if path is None:
+            return None
+        if path.suffix != _COMPACT_SUFFIX:
+            return read_json(path)
+        with path.open("rb") as fh:
+            head = fh.read(_HEADER_READ_BYTES)
+            try:
+                return read_header(head)["meta"]
+            except ValueError:
+                # Header larger than the first read; fall back to the whole file.
+                fh.seek(0)
+                return read_header(fh.read())["meta"]
+
+    def _load_aliases(self) -> dict[str, str]:
+        if self._aliases is None:
+            loaded: Any = {}
+            if self._aliases_file.exists():
+                try:
+                    loaded = read_json(self._aliases_file)
+                except ValueError:
+                    loaded = {}
+            self._aliases = loaded if isinstance(loaded, dict) else {}
+        return self._aliases
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _is_transcript_file(entry: os.DirEntry[str], suffixes: tuple[str, ...]) -> bool:
+    # Skips temp files from in-flight atomic writes (``.<name>.<rand>.tmp``).
+    return (
+        not entry.name.startswith(".")
+        and entry.name.endswith(suffixes)
+        and entry.is_file()
+    )
+
+
+def compact_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy with stored row lists swapped for columnar tables.
+
+    Payloads saved before term indexes existed get one built here, once.
+    """
+    compacted = dict(payload)
+    compacted["segments"] = SegmentTable.from_rows(payload.get("segments") or [])
+    compacted["chunks"] = ChunkTable.from_rows(payload.get("chunks") or [])
+    term_index = payload.get("term_index")
+    if term_index is None or len(term_index) != len(compacted["chunks"]):
+        compacted["term_index"] = TermIndex.build(compacted["chunks"].texts())
+    embeddings = payload.get("embeddings")
+    if embeddings is not None and len(embeddings) != len(compacted["chunks"]):
+        compacted.pop("embeddings")
+    if payload.get("chunk_sets"):
+        compacted["chunk_sets"] = {
+            words: {**entry, "chunks": ChunkTable.from_rows(entry.get("chunks") or [])}
+            for words, entry in payload["chunk_sets"].items()
+        }
+    return compacted
+
+
+def transcript_summary(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return the listing fields of a transcript payload."""
+    return {
+        "transcript_id": payload.get("transcript_id"),
+        "source": payload.get("source"),
+        "source_label": payload.get("source_label"),
+        "source_title": payload.get("source_title"),
+        "source_url": payload.get("source_url"),
+        "languages": payload.get("languages"),
+        "fetched_at": payload.get("fetched_at"),
+    }
+
+
+def read_json(path: Path) -> dict[str, Any]:
+    """Read one JSON document."""
+    with path.open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def write_json(path: Path, payload: dict[str, Any]) -> None:
+    """Write one JSON document, serializing columnar tables as row lists."""
+    text = json.dumps(payload, indent=2, ensure_ascii=True, default=_json_default)
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write to a temporary sibling and rename it over ``path``.
+
+    Readers see either the old or the new file, never a partial one, even if
+    the process dies mid-write.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _build_backend(engine: str, paths: dict[str, Path]) -> TranscriptBackend:
+    files = FileTranscriptBackend(paths["transcripts_dir"], paths["aliases_file"])
+    if engine == "sqlite":
+        from .sqlite_store import SqliteTranscriptBackend
+
+        return SqliteTranscriptBackend(paths["database_file"], import_from=files)
+    return files
@@ -0,0 +1,182 @@
+"""Per-transcript inverted index: content term -> chunk postings with frequencies.
+
+Built once when a chunk set is created and stored with the transcript, so a
+question only reads the postings of its own terms instead of re-tokenizing
+every chunk. Postings are kept in a few flat arrays:
+
+* ``starts[t]..starts[t + 1]`` is term ``t``'s slice of ``positions``/``freqs``
+* ``positions`` holds chunk positions (row indexes, not chunk ids), ascending
+* ``freqs`` holds how often the term occurs in that chunk
+* ``distinct[c]`` / ``lengths[c]`` count distinct and total content terms of chunk ``c``
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Mapping
+
+from .columnar import array_bytes
+from .text_utils import content_tokens
+
+_HEADER = struct.Struct("<II")
+
+
+class TermIndex:
+    """Inverted index over one chunk set."""
+
+    def __init__(
+        self,
+        terms: list[str],
+        starts: array,
+        positions: array,
+        freqs: array,
+        distinct: array,
+        lengths: array,
+    ) -> None:
+        self._terms = terms
+        self._lookup = {term: idx for idx, term in enumerate(terms)}
+        self._starts = starts
+        self._positions = positions
+        self._freqs = freqs
+        self._distinct = distinct
+        self._lengths = lengths
+        self._fingerprint: int | None = None
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> "TermIndex":
+        """Tokenize each chunk text once and invert the counts."""
+        postings: dict[str, list[tuple[int, int]]] = {}
+        distinct = array("I")
+        lengths = array("I")
+        for position, text in enumerate(texts):
+            counts = Counter(content_tokens(text))
+            distinct.append(len(counts))
+            lengths.append(sum(counts.values()))
+            for term, freq in counts.items():
+                postings.setdefault(term, []).append((position, freq))
+
+        terms = sorted(postings)
+        starts = array("I", [0])
+        positions = array("I")
+        freqs = array("I")
+        for term in terms:
+            for position, freq in postings[term]:
+                positions.append(position)
+                freqs.append(freq)
+            starts.append(len(positions))
+        return cls(terms, starts, positions, freqs, distinct, lengths)
+
+    def __len__(self) -> int:
+        """Number of chunks covered by the index."""
+        return len(self._distinct)
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._lookup
+
+    @property
+    def terms(self) -> list[str]:
+        """Sorted vocabulary."""
+        return self._terms
+
+    @property
+    def term_ids(self) -> Mapping[str, int]:
+        """Term -> row number in the posting arrays."""
+        return self._lookup
+
+    def arrays(self) -> dict[str, array]:
+        """Expose the raw posting and per-chunk arrays (read-only by convention)."""
+        return {
+            "starts": self._starts,
+            "positions": self._positions,
+            "freqs": self._freqs,
+            "distinct": self._distinct,
+            "lengths": self._lengths,
+        }
+
+    def postings(self, term: str) -> tuple[memoryview, memoryview] | None:
+        """Return ``(chunk positions, term frequencies)`` for ``term``, or ``None``."""
+        idx = self._lookup.get(term)
+        if idx is None:
+            return None
+        start, stop = self._starts[idx], self._starts[idx + 1]
+        return memoryview(self._positions)[start:stop], memoryview(self._freqs)[start:stop]
+
+    def document_frequency(self, term: str) -> int:
+        idx = self._lookup.get(term)
+        return 0 if idx is None else self._starts[idx + 1] - self._starts[idx]
+
+    def distinct_terms(self, position: int) -> int:
+        """Number of distinct content terms in the chunk at ``position``."""
+        return self._distinct[position]
+
+    def chunk_length(self, position: int) -> int:
+        """Number of content terms (repeats included) in the chunk at ``position``."""
+        return self._lengths[position]
+
+    def fingerprint(self) -> int:
+        """CRC32 over postings and vocabulary; changes whenever the index does."""
+        if self._fingerprint is None:
+            crc = 0
+            for values in (self._starts, self._positions, self._freqs, self._lengths):
+                crc = zlib.crc32(values, crc)
+            self._fingerprint = zlib.crc32("\n".join(self._terms).encode("utf-8"), crc)
+        return self._fingerprint
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the vocabulary and posting arrays."""
+        return (
+            sys.getsizeof(self._terms)
+            + sys.getsizeof(self._lookup)
+            + sum(sys.getsizeof(term) for term in self._terms)
+            + sum(
+                array_bytes(values)
+                for values in (
+                    self._starts,
+                    self._positions,
+                    self._freqs,
+                    self._distinct,
+                    self._lengths,
+                )
+            )
+        )
+
+    def encode(self) -> bytes:
+        """Serialize as counts, little-endian arrays and a newline-joined vocabulary."""
+        columns = [self._distinct, self._lengths, self._starts, self._positions, self._freqs]
+        if sys.byteorder != "little":
+            columns = [array("I", values) for values in columns]
+            for values in columns:
+                values.byteswap()
+        return b"".join(
+            [
+                _HEADER.pack(len(self._distinct), len(self._terms)),
+                *(values.tobytes() for values in columns),
+                "\n".join(self._terms).encode("utf-8"),
+            ]
+        )
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "TermIndex":
+        chunk_count, term_count = _HEADER.unpack_from(raw)
+        pos = _HEADER.size
+        distinct, pos = _read_uint_array(raw, pos, chunk_count)
+        lengths, pos = _read_uint_array(raw, pos, chunk_count)
+        starts, pos = _read_uint_array(raw, pos, term_count + 1)
+        positions, pos = _read_uint_array(raw, pos, starts[-1])
+        freqs, pos = _read_uint_array(raw, pos, starts[-1])
+        vocabulary = raw[pos:].decode("utf-8")
+        terms = vocabulary.split("\n") if term_count else []
+        return cls(terms, starts, positions, freqs, distinct, lengths)
+
+
+def _read_uint_array(raw: bytes, pos: int, count: int) -> tuple[array, int]:
+    values = array("I")
+    end = pos + count * values.itemsize
+    values.frombytes(raw[pos:end])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values, end
@@ -3,6 +3,13 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
+
+_BRACKET_RE = re.compile(r"\[[^\]]+\]")
+_TAG_RE = re.compile(r"<[^>]+>")
+_CUT_WHITESPACE = (" ", "\n", "\t", "\r", "\f", "\v")
+# Give up waiting for a closing bracket once this much text is pending.
+_MAX_PENDING_CHARS = 1 << 20
 
 STOPWORDS = {
     "a",
@@ -99,23 +106,76 @@ STOPWORDS = {
 
 def normalize_text(raw: str) -> str:
     """Normalize caption text from transcript snippets."""
-    text = re.sub(r"\[[^\]]+\]", "", raw)
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _BRACKET_RE.sub("", raw)
+    text = _TAG_RE.sub("", text)
     return re.sub(r"\s+", " ", text).strip()
 
 
+def iter_normalized_words(pieces: Iterable[str]) -> Iterator[str]:
+    """Yield the words of ``normalize_text("".join(pieces))`` incrementally.
+
+    Each ``normalize_text`` pass becomes a generator stage that only holds back
+    text from an unterminated ``[`` or ``<`` onwards, so markup split across
+    pieces is still removed while memory stays bounded by the pending tail.
+    """
+    stripped = _iter_substituted(pieces, _BRACKET_RE, "[", "]")
+    stripped = _iter_substituted(stripped, _TAG_RE, "<", ">")
+
+    pending = ""
+    for piece in stripped:
+        pending += piece
+        cut = max(pending.rfind(space) for space in _CUT_WHITESPACE)
+        if cut < 0:
+            continue
+        yield from pending[:cut].split()
+        pending = pending[cut:]
+
+    yield from pending.split()
+
+
+def _iter_substituted(
+    pieces: Iterable[str],
+    pattern: re.Pattern[str],
+    opener: str,
+    closer: str,
+) -> Iterator[str]:
+    """Stream ``pattern.sub("", text)`` for patterns spanning ``opener``..``closer``."""
+    pending = ""
+    for piece in pieces:
+        if not piece:
+            continue
+        pending += piece
+        # Every opener before the last closer already has its match end in view.
+        unclosed = pending.find(opener, pending.rfind(closer) + 1)
+        if unclosed < 0 or len(pending) - unclosed > _MAX_PENDING_CHARS:
+            safe_end = len(pending)
+        else:
+            safe_end = unclosed
+        if safe_end:
+            yield pattern.sub("", pending[:safe_end])
+            pending = pending[safe_end:]
+
+    if pending:
+        yield pattern.sub("", pending)
+
+
 def tokenize(text: str) -> list[str]:
     """Tokenize text for lexical retrieval scoring."""
     return re.findall(r"[A-Za-z][A-Za-z0-9'-]*", text.lower())
 
 
-def content_terms(text: str) -> set[str]:
-    """Return filtered content terms for overlap scoring."""
-    return {
+def content_tokens(text: str) -> list[str]:
+    """Return content tokens in order, repeats included (for term frequencies)."""
+    return [
         token
         for token in tokenize(text)
         if token not in STOPWORDS and len(token) >= 3 and not token.isdigit()
-    }
+    ]
+
+
+def content_terms(text: str) -> set[str]:
+    """Return filtered content terms for overlap scoring."""
+    return set(content_tokens(text))
 
 
 def format_timestamp(seconds: float) -> str:
@@ -0,0 +1,96 @@
+"""Process-level LRU cache of parsed transcript payloads."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TranscriptCache:
+    """Keep recently used payloads in memory up to a byte budget.
+
+    Each entry remembers the storage version it was read at (file mtime or
+    row revision); a lookup with a different version is a miss, so edits made
+    outside this process are picked up on the next read.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Hashable, dict[str, Any], int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, transcript_id: str, version: Hashable) -> dict[str, Any] | None:
+        """Return a shallow copy of the cached payload if it is still current."""
+        with self._lock:
+            entry = self._entries.get(transcript_id)
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(transcript_id)
+            self._hits += 1
+            return dict(entry[1])
+
+    def put(self, transcript_id: str, version: Hashable, payload: dict[str, Any]) -> None:
+        """Insert or replace an entry, evicting least recently used ones over budget."""
+        size = estimate_payload_bytes(payload)
+        with self._lock:
+            self._pop(transcript_id)
+            if size > self._max_bytes:
+                return
+            self._entries[transcript_id] = (version, dict(payload), size)
+            self._bytes += size
+            while self._bytes > self._max_bytes and self._entries:
+                self._pop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def discard(self, transcript_id: str) -> None:
+        with self._lock:
+            self._pop(transcript_id)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _pop(self, transcript_id: str) -> None:
+        entry = self._entries.pop(transcript_id, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+
+def estimate_payload_bytes(payload: dict[str, Any]) -> int:
+    """Approximate the memory held by a compacted payload."""
+    total = sys.getsizeof(payload)
+    for key, value in payload.items():
+        if key == "chunk_sets":
+            for entry in (value or {}).values():
+                total += _estimate(entry.get("chunks"))
+                if entry.get("embeddings") is not None:
+                    total += _estimate(entry["embeddings"])
+        else:
+            total += _estimate(value)
+    return total
+
+
+def _estimate(value: Any) -> int:
+    nbytes = getattr(value, "nbytes", None)
+    if callable(nbytes):
+        return nbytes()
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(
+            sum(sys.getsizeof(item) for item in row.values()) if isinstance(row, dict) else 64
+            for row in value
+        )
+    return sys.getsizeof(value)
@@ -0,0 +1,291 @@
+"""Compact, versioned, compressed on-disk transcript format.
+
+Layout::
+
+    b"CPYT" | u16 format version | u32 header length | header JSON | sections
+
+The header holds scalar metadata plus a table of ``name -> [offset, length]``
+for each zlib-compressed section (``segments``, ``chunks:<words>``,
+``index:<words>``, ``vectors:<words>``, ``chapters``), so a reader can list
+transcripts from the header alone and decode only the sections it needs.
+Segment columns are stored as raw arrays with one shared UTF-8 text buffer.
+Chunk text is not stored again: a chunk is the span of segments it was built
+from, rebuilt with ``" ".join`` on load. The active chunk set also stores its
+inverted term index; any chunk set the embedding retrieval engine has
+embedded stores its quantized matrix.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from .columnar import ChunkTable, SegmentTable, pack_texts
+from .term_index import TermIndex
+from .text_utils import format_timestamp
+
+MAGIC = b"CPYT"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sHI")
+_COUNT = struct.Struct("<IB")
+_CODEC = "zlib"
+_CHUNKS_AS_RANGES = 0
+_CHUNKS_AS_TEXT = 1
+_CHAPTER_KEYS = ("chapter_id", "title", "start_seconds", "end_seconds", "source")
+_TABLE_KEYS = {"segments", "chunks", "chapters", "chunk_sets", "term_index", "embeddings"}
+
+
+def is_compact(data: bytes) -> bool:
+    """Return whether ``data`` starts with the compact format magic."""
+    return data[:4] == MAGIC
+
+
+def encode_transcript(payload: dict[str, Any]) -> bytes:
+    """Serialize a transcript payload (dict rows or columnar tables)."""
+    segments = SegmentTable.from_rows(payload.get("segments") or [])
+    segment_texts = list(segments.texts())
+
+    sections: dict[str, bytes] = {"segments": _encode_segments(segments)}
+    chunk_sets = payload.get("chunk_sets") or {}
+    chunks = ChunkTable.from_rows(payload.get("chunks") or [])
+    active = payload.get("chunk_words") or 0
+    sections[f"chunks:{active}"] = _encode_chunks(chunks, segment_texts)
+    term_index = payload.get("term_index")
+    if term_index is None or len(term_index) != len(chunks):
+        term_index = TermIndex.build(chunks.texts())
+    sections[f"index:{active}"] = term_index.encode()
+    embeddings = payload.get("embeddings")
+    if embeddings is not None and len(embeddings) == len(chunks):
+        sections[f"vectors:{active}"] = embeddings.encode()
+    for words, entry in chunk_sets.items():
+        parked = ChunkTable.from_rows(entry.get("chunks") or [])
+        sections[f"chunks:{words}"] = _encode_chunks(parked, segment_texts)
+        parked_embeddings = entry.get("embeddings")
+        if parked_embeddings is not None and len(parked_embeddings) == len(parked):
+            sections[f"vectors:{words}"] = parked_embeddings.encode()
+    sections["chapters"] = encode_chapters(payload.get("chapters") or [])
+
+    meta = {key: value for key, value in payload.items() if key not in _TABLE_KEYS}
+    meta["chunk_sets"] = {
+        str(words): int(entry.get("total_words") or 0) for words, entry in chunk_sets.items()
+    }
+
+    compressed = {name: zlib.compress(raw, 6) for name, raw in sections.items()}
+    return _assemble(
+        {"meta": meta, "codec": _CODEC, "byteorder": sys.byteorder},
+        compressed,
+    )
+
+
+def encode_chapters(chapters: Iterable[Mapping[str, Any]]) -> bytes:
+    """Serialize chapter rows as an uncompressed ``chapters`` section."""
+    rows = [{key: row.get(key) for key in _CHAPTER_KEYS} for row in chapters]
+    return json.dumps(rows, ensure_ascii=False).encode("utf-8")
+
+
+def replace_section(data: bytes, name: str, raw: bytes) -> bytes:
+    """Return ``data`` with one section replaced; other sections are copied compressed."""
+    header = read_header(data)
+    compressed: dict[str, bytes] = {}
+    for section, (offset, length) in header.pop("sections").items():
+        start = header["body_offset"] + offset
+        compressed[section] = data[start : start + length]
+    compressed[name] = zlib.compress(raw, 6)
+    header.pop("body_offset")
+    return _assemble(header, compressed)
+
+
+def _assemble(header: dict[str, Any], compressed: dict[str, bytes]) -> bytes:
+    table: dict[str, list[int]] = {}
+    offset = 0
+    for name, blob in compressed.items():
+        table[name] = [offset, len(blob)]
+        offset += len(blob)
+
+    encoded = json.dumps(
+        {**header, "sections": table},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return b"".join(
+        [_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)), encoded, *compressed.values()]
+    )
+
+
+def read_header(data: bytes) -> dict[str, Any]:
+    """Decode only the header: metadata and the section table."""
+    magic, version, header_len = _PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a compact transcript file.")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported transcript format version {version}.")
+    header = json.loads(data[_PREAMBLE.size : _PREAMBLE.size + header_len])
+    header["body_offset"] = _PREAMBLE.size + header_len
+    return header
+
+
+def read_section(data: bytes, header: dict[str, Any], name: str) -> bytes | None:
+    """Decompress one named section, or return ``None`` if it is absent."""
+    entry = header["sections"].get(name)
+    if entry is None:
+        return None
+    start = header["body_offset"] + entry[0]
+    return zlib.decompress(data[start : start + entry[1]])
+
+
+def decode_transcript(data: bytes, sections: Iterable[str] | None = None) -> dict[str, Any]:
+    """Rebuild a payload with columnar tables, optionally for a subset of sections.
+
+    ``sections`` may name ``segments``, ``chunks`` (active and parked sets plus
+    the term index and embeddings) and ``chapters``; omitted ones are left out of the result.
+    """
+    wanted = {"segments", "chunks", "chapters"} if sections is None else set(sections)
+    header = read_header(data)
+    swap = header.get("byteorder", sys.byteorder) != sys.byteorder
+    payload = dict(header["meta"])
+    parked_totals: dict[str, int] = payload.pop("chunk_sets", None) or {}
+
+    segments: SegmentTable | None = None
+    if wanted & {"segments", "chunks"}:
+        segments = _decode_segments(read_section(data, header, "segments") or b"", swap)
+    if "segments" in wanted:
+        payload["segments"] = segments
+
+    if "chunks" in wanted:
+        texts = list(segments.texts()) if segments is not None else []
+
+        def _chunks(words: Any) -> ChunkTable:
+            raw = read_section(data, header, f"chunks:{words or 0}")
+            return _decode_chunks(raw, texts, swap) if raw else ChunkTable.from_rows([])
+
+        def _with_vectors(entry: dict[str, Any], words: Any) -> dict[str, Any]:
+            raw = read_section(data, header, f"vectors:{words or 0}")
+            if raw is not None:
+                from .embeddings import EmbeddingMatrix
+
+                entry["embeddings"] = EmbeddingMatrix.decode(raw)
+            return entry
+
+        payload["chunks"] = _chunks(payload.get("chunk_words"))
+        raw_index = read_section(data, header, f"index:{payload.get('chunk_words') or 0}")
+        if raw_index is not None:
+            payload["term_index"] = TermIndex.decode(raw_index)
+        _with_vectors(payload, payload.get("chunk_words"))
+        payload["chunk_sets"] = {
+            words: _with_vectors({"chunks": _chunks(words), "total_words": total}, words)
+            for words, total in parked_totals.items()
+        }
+
+    if "chapters" in wanted:
+        rows = json.loads(read_section(data, header, "chapters") or b"[]")
+        for row in rows:
+            row["start_label"] = format_timestamp(float(row["start_seconds"]))
+            row["end_label"] = format_timestamp(float(row["end_seconds"]))
+        payload["chapters"] = rows
+
+    return payload
+
+
+def _encode_segments(segments: SegmentTable) -> bytes:
+    count = len(segments)
+    starts = array("d", (segments.start(idx) for idx in range(count)))
+    durations = array("d", (segments.field(idx, "duration_seconds") for idx in range(count)))
+    texts = list(segments.texts())
+    text, offsets = pack_texts(texts)
+    return b"".join(
+        [
+            _COUNT.pack(count, 0),
+            starts.tobytes(),
+            durations.tobytes(),
+            offsets.tobytes(),
+            text.encode("utf-8"),
+        ]
+    )
+
+
+def _decode_segments(raw: bytes, swap: bool) -> SegmentTable:
+    if not raw:
+        return SegmentTable.from_rows([])
+    count, _ = _COUNT.unpack_from(raw)
+    pos = _COUNT.size
+    starts, pos = _read_array("d", raw, pos, count, swap)
+    durations, pos = _read_array("d", raw, pos, count, swap)
+    offsets, pos = _read_array("q", raw, pos, count + 1, swap)
+    return SegmentTable(raw[pos:].decode("utf-8"), offsets, starts, durations)
+
+
+def _encode_chunks(chunks: ChunkTable, segment_texts: Sequence[str]) -> bytes:
+    count = len(chunks)
+    chunk_texts = list(chunks.texts())
+    ranges = _segment_ranges(segment_texts, chunk_texts)
+    parts = [
+        _COUNT.pack(count, _CHUNKS_AS_TEXT if ranges is None else _CHUNKS_AS_RANGES),
+        array("q", (chunks.chunk_id(idx) for idx in range(count))).tobytes(),
+        array("d", (chunks.start(idx) for idx in range(count))).tobytes(),
+        array("d", (chunks.end(idx) for idx in range(count))).tobytes(),
+    ]
+    if ranges is None:
+        text, offsets = pack_texts(chunk_texts)
+        parts.extend([offsets.tobytes(), text.encode("utf-8")])
+    else:
+        parts.append(array("q", (bound for pair in ranges for bound in pair)).tobytes())
+    return b"".join(parts)
+
+
+def _decode_chunks(raw: bytes, segment_texts: Sequence[str], swap: bool) -> ChunkTable:
+    count, mode = _COUNT.unpack_from(raw)
+    pos = _COUNT.size
+    chunk_ids, pos = _read_array("q", raw, pos, count, swap)
+    starts, pos = _read_array("d", raw, pos, count, swap)
+    ends, pos = _read_array("d", raw, pos, count, swap)
+    if mode == _CHUNKS_AS_TEXT:
+        offsets, pos = _read_array("q", raw, pos, count + 1, swap)
+        return ChunkTable(raw[pos:].decode("utf-8"), offsets, chunk_ids, starts, ends)
+
+    bounds, pos = _read_array("q", raw, pos, count * 2, swap)
+    texts = [
+        _join_span(segment_texts, bounds[2 * idx], bounds[2 * idx + 1]) for idx in range(count)
+    ]
+    text, offsets = pack_texts(texts)
+    return ChunkTable(text, offsets, chunk_ids, starts, ends)
+
+
+def _segment_ranges(
+    segment_texts: Sequence[str],
+    chunk_texts: Sequence[str],
+) -> list[tuple[int, int]] | None:
+    """Map each chunk to the segment span whose joined text equals it, if possible."""
+    ranges: list[tuple[int, int]] = []
+    pos = 0
+    total = len(segment_texts)
+    for text in chunk_texts:
+        while pos < total and not segment_texts[pos].strip():
+            pos += 1
+        start = pos
+        length = -1
+        while pos < total and length < len(text):
+            if segment_texts[pos]:
+                length += len(segment_texts[pos]) + 1
+            pos += 1
+        if _join_span(segment_texts, start, pos) != text:
+            return None
+        ranges.append((start, pos))
+    return ranges
+
+
+def _join_span(segment_texts: Sequence[str], start: int, stop: int) -> str:
+    return " ".join(piece for piece in segment_texts[start:stop] if piece)
+
+
+def _read_array(typecode: str, raw: bytes, pos: int, count: int, swap: bool) -> tuple[array, int]:
+    values = array(typecode)
+    end = pos + count * values.itemsize
+    values.frombytes(raw[pos:end])
+    if swap:
+        values.byteswap()
+    return values, end
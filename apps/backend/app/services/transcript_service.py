@@ -2,79 +2,349 @@
 
 from __future__ import annotations
 
+import codecs
 import hashlib
-import json
 import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
+from typing import Any
 from urllib.parse import parse_qs, urlparse
 
-import requests
 from youtube_transcript_api import YouTubeTranscriptApi
 
+from ..api.schemas import LLMSettings
+from ..core.config import get_transcript_ttl_seconds
+from .captions import iter_file_segments, iter_text_segments
 from .chunking import TranscriptSegment, chunk_segments
+from .columnar import ChunkTable, SegmentTable, SegmentTableBuilder
+from .embeddings import EmbeddingMatrix, build_embeddings
+from .http_client import get_http_session, get_transcript_http_session
+from .negative_cache import NegativeCache
+from .single_flight import SingleFlight
 from .storage import LocalStore
-from .text_utils import format_timestamp, normalize_text
+from .term_index import TermIndex
+from .text_utils import format_timestamp, iter_normalized_words, normalize_text
+from .watch_page import WatchPageMetadata, WatchPageScanner
 
 
-_SHORT_DESCRIPTION_RE = re.compile(
-    r'"shortDescription":"((?:\\.|[^"\\])*)"',
-    flags=re.DOTALL,
-)
-_CHAPTER_LINE_RE = re.compile(
-    r"^\s*(?P<stamp>(?:\d{1,2}:)?\d{1,2}:\d{2})\s+(?P<title>.+?)\s*$"
-)
-_CHAPTER_RENDERER_NEEDLE = '"chapterRenderer":'
+_TITLE_TIMEOUT_SECONDS = 12.0
+_WATCH_PAGE_TIMEOUT_SECONDS = 20.0
+_SEGMENTS_TIMEOUT_SECONDS = 45.0
+_WATCH_PAGE_READ_BYTES = 64 * 1024
+_MAX_PARKED_CHUNK_SETS = 4
+_HASH_READ_BYTES = 1024 * 1024
 
 
 class TranscriptService:
     """Load transcript data from YouTube or local files and cache locally."""
 
-    def __init__(self, store: LocalStore) -> None:
+    def __init__(
+        self,
+        store: LocalStore,
+        ttl_seconds: float | None = None,
+        negative_cache: NegativeCache | None = None,
+    ) -> None:
         self._store = store
+        self._negative_cache = negative_cache
+        self._ttl_seconds = (
+            get_transcript_ttl_seconds() if ttl_seconds is None else max(0.0, ttl_seconds)
+        )
+        self._refresh_pool = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="capyap-refresh",
+        )
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=12,
+            thread_name_prefix="capyap-fetch",
+        )
+        self._flight: SingleFlight[dict] = SingleFlight()
+        self._refresh_lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._file_digests: dict[str, tuple[int, int, str]] = {}
 
     def load_or_create(
         self,
         source: str,
         languages: str,
         chunk_words: int,
+        *,
+        force_refresh: bool = False,
+    ) -> dict:
+        """Load transcript by source, serving the local cache when it is usable.
+
+        Fresh cache entries are returned as-is. YouTube entries older than the
+        configured TTL are still returned immediately while a background refresh
+        revalidates them. ``force_refresh`` always refetches synchronously.
+
+        YouTube fetches that recently failed for a known reason (captions
+        disabled, no transcript in these languages, ...) raise
+        ``TranscriptUnavailableError`` without contacting YouTube again unless
+        ``force_refresh`` is set.
+
+        Entries are keyed by canonical source (video ID plus languages, or file
+        content), so URL variants of one video share a single cache entry.
+        """
+        languages = _normalize_languages(languages)
+        transcript_id = self._store.build_transcript_id(
+            self._canonical_source(source, languages)
+        )
+
+        if not force_refresh:
+            cached = self._load_cached(transcript_id, source, languages, chunk_words)
+            if cached is None and self._adopt_legacy(transcript_id, source, languages):
+                cached = self._load_cached(transcript_id, source, languages, chunk_words)
+            if cached is not None:
+                return cached
+            if self._negative_cache is not None and not Path(source).is_file():
+                self._negative_cache.check(self.parse_video_id(source), languages)
+
+        return self._load_fresh(transcript_id, source, languages, chunk_words)
+
+    def _load_fresh(
+        self,
+        transcript_id: str,
+        source: str,
+        languages: str,
+        chunk_words: int,
     ) -> dict:
-        """Load transcript by source and refresh local cache."""
-        transcript_id = self._store.build_transcript_id(source)
+        """Fetch and save once per transcript id, sharing the result with concurrent callers."""
+
+        def _fetch() -> dict:
+            return self._fetch_and_save(transcript_id, source, languages, chunk_words)
+
+        payload = self._flight.do(transcript_id, _fetch)
+        return self._with_chunk_words(payload, chunk_words)
+
+    def _canonical_source(self, source: str, languages: str) -> str:
+        """Return the cache key source: file content hash or video ID plus languages."""
+        path = Path(source)
+        if path.is_file():
+            return f"file:{self._file_digest(path)}"
+        return f"youtube:{self.parse_video_id(source)}:{languages}"
+
+    def _file_digest(self, path: Path) -> str:
+        """Hash file contents, reusing the last digest while size and mtime are unchanged."""
+        stat = path.stat()
+        key = str(path.resolve())
+        remembered = self._file_digests.get(key)
+        if remembered is not None and remembered[:2] == (stat.st_size, stat.st_mtime_ns):
+            return remembered[2]
+
+        digest = hashlib.sha1()
+        with path.open("rb") as fh:
+            for block in iter(lambda: fh.read(_HASH_READ_BYTES), b""):
+                digest.update(block)
+        value = digest.hexdigest()
+        self._file_digests[key] = (stat.st_size, stat.st_mtime_ns, value)
+        return value
+
+    def _adopt_legacy(self, transcript_id: str, source: str, languages: str) -> bool:
+        """Move an entry keyed by the raw source string under its canonical id."""
+        legacy_id = self._store.build_transcript_id(source)
+        if legacy_id == transcript_id:
+            return False
+
+        legacy = self._store.load_transcript(legacy_id)
+        if legacy is None or legacy.get("transcript_id") != legacy_id:
+            return False
+
+        path = Path(source)
+        if path.is_file():
+            if path.stat().st_mtime > float(legacy.get("fetched_at") or 0.0):
+                return False
+        elif _normalize_languages(legacy.get("languages") or "") != languages:
+            return False
+
+        return self._store.adopt_transcript(legacy_id, transcript_id) is not None
+
+    def _with_chunk_words(self, payload: dict, chunk_words: int) -> dict:
+        """Switch a payload to another chunk size using its stored segments only.
+
+        The active chunk set stays at the top level; other sizes are parked in
+        ``chunk_sets`` with their embeddings, so switching back needs neither
+        re-chunking nor re-embedding.
+        """
+        if payload.get("chunk_words") == chunk_words:
+            return payload
+
+        chunk_sets = dict(payload.get("chunk_sets") or {})
+        current = payload.get("chunk_words")
+        if current is not None:
+            chunk_sets[str(current)] = {
+                "chunks": payload.get("chunks", []),
+                "total_words": payload.get("total_words", 0),
+            }
+            if payload.get("embeddings") is not None:
+                chunk_sets[str(current)]["embeddings"] = payload["embeddings"]
+
+        selected = chunk_sets.pop(str(chunk_words), None)
+        if selected is None:
+            chunks = chunk_segments(payload.get("segments", []), words_per_chunk=chunk_words)
+            selected = {"chunks": chunks, "total_words": _count_words(chunks)}
+
+        while len(chunk_sets) > _MAX_PARKED_CHUNK_SETS:
+            chunk_sets.pop(next(iter(chunk_sets)))
+
+        updated = {
+            **payload,
+            "chunk_words": chunk_words,
+            "chunks": selected["chunks"],
+            "term_index": TermIndex.build(ChunkTable.from_rows(selected["chunks"]).texts()),
+            "embeddings": selected.get("embeddings"),
+            "total_words": selected["total_words"],
+            "chunk_sets": chunk_sets,
+        }
+        self._store.save_transcript(updated["transcript_id"], updated)
+        return updated
+
+    def ensure_embeddings(self, payload: dict, settings: LLMSettings) -> EmbeddingMatrix | None:
+        """Return the payload's chunk embeddings for ``settings.embedding_model``.
+
+        Chunks are embedded lazily on the first question that needs them, so
+        ingest and chunk-size switches never wait on Ollama; the result is
+        saved and parked with its chunk set. Returns ``None`` when Ollama
+        cannot embed, so callers can fall back to BM25.
+        """
+        chunks = payload.get("chunks") or []
+        if _embeddings_match(payload.get("embeddings"), chunks, settings):
+            return payload["embeddings"]
+
+        def _embed() -> dict:
+            current = self._store.load_transcript(payload["transcript_id"]) or payload
+            if _embeddings_match(current.get("embeddings"), current.get("chunks") or [], settings):
+                return current
+            embeddings = self._embed_chunks(current.get("chunks") or [], settings)
+            if embeddings is None:
+                return current
+            updated = {**current, "embeddings": embeddings}
+            self._store.save_transcript(updated["transcript_id"], updated)
+            return updated
+
+        embedded = self._flight.do(f"{payload['transcript_id']}:embeddings", _embed)
+        embeddings = embedded.get("embeddings")
+        return embeddings if _embeddings_match(embeddings, chunks, settings) else None
+
+    @staticmethod
+    def _embed_chunks(chunks: Any, settings: LLMSettings) -> EmbeddingMatrix | None:
+        """Embed a chunk set with the settings snapshot's model; best effort."""
+        if not chunks:
+            return None
+        try:
+            return build_embeddings(list(ChunkTable.from_rows(chunks).texts()), settings)
+        except (RuntimeError, ValueError, KeyError):
+            # Ollama is down, the model is missing or its vectors do not fit the
+            # chunk set; retried on the next question.
+            return None
+
+    def _load_cached(
+        self,
+        transcript_id: str,
+        source: str,
+        languages: str,
+        chunk_words: int,
+    ) -> dict | None:
+        cached = self._store.load_transcript(transcript_id)
+        if cached is None:
+            return None
+
+        if Path(source).is_file():
+            # The id is derived from file content, so any hit is current.
+            return self._with_chunk_words(cached, chunk_words)
+
+        if _normalize_languages(cached.get("languages") or "") != languages:
+            return None
+
+        fetched_at = float(cached.get("fetched_at") or 0.0)
+
+        if time.time() - fetched_at > self._ttl_seconds:
+            self._schedule_refresh(transcript_id, source, languages, chunk_words)
+        return self._with_chunk_words(cached, chunk_words)
+
+    def _schedule_refresh(
+        self,
+        transcript_id: str,
+        source: str,
+        languages: str,
+        chunk_words: int,
+    ) -> None:
+        with self._refresh_lock:
+            if transcript_id in self._refreshing:
+                return
+            self._refreshing.add(transcript_id)
+
+        def _run() -> None:
+            try:
+                self._load_fresh(transcript_id, source, languages, chunk_words)
+            except Exception:
+                # Keep serving the stale copy; the next stale hit retries.
+                pass
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(transcript_id)
+
+        self._refresh_pool.submit(_run)
 
-        segments: list[TranscriptSegment]
+    def _fetch_and_save(
+        self,
+        transcript_id: str,
+        source: str,
+        languages: str,
+        chunk_words: int,
+    ) -> dict:
+        segments: list[TranscriptSegment] | SegmentTable
         source_label: str
         source_title: str | None = None
         source_url: str | None = None
+        source_description: str | None = None
+        source_duration: float | None = None
         chapters: list[dict] = []
+        fetched_at = time.time()
 
         path = Path(source)
         if path.exists() and path.is_file():
             source_label = f"file:{path.resolve()}"
             source_title = path.stem
-            segments = self._load_file_segments(path)
+            segments = SegmentTable.from_rows(iter_file_segments(path))
         else:
             video_id = self.parse_video_id(source)
             source_label = f"youtube:{video_id}"
             source_url = f"https://www.youtube.com/watch?v={video_id}"
-            source_title = self._fetch_youtube_title(video_id)
             lang_tuple = tuple(lang.strip() for lang in languages.split(",") if lang.strip())
-            segments = self._fetch_youtube_segments(video_id, lang_tuple)
-            raw_chapters = self._fetch_youtube_chapter_markers(video_id)
-            transcript_end = (
-                max(
-                    (
-                        float(seg["start_seconds"]) + float(seg["duration_seconds"])
-                        for seg in segments
-                    ),
-                    default=0.0,
+            try:
+                metadata, segments = self._fetch_youtube_parts(video_id, lang_tuple)
+            except Exception as exc:
+                known = (
+                    self._negative_cache.record(video_id, languages, exc)
+                    if self._negative_cache is not None
+                    else None
                 )
-                if segments
-                else 0.0
+                if known is not None:
+                    raise known from exc
+                raise
+            if self._negative_cache is not None:
+                self._negative_cache.clear(video_id, languages)
+            source_title = metadata["title"]
+            source_description = metadata["description"]
+            source_duration = metadata["duration_seconds"]
+            transcript_end = max(
+                (
+                    float(seg["start_seconds"]) + float(seg["duration_seconds"])
+                    for seg in segments
+                ),
+                default=0.0,
+            )
+            chapters = self._finalize_chapters(
+                metadata["chapters"],
+                max(transcript_end, source_duration or 0.0),
+                source="youtube",
             )
-            chapters = self._finalize_chapters(raw_chapters, transcript_end, source="youtube")
 
         chunks = chunk_segments(segments, words_per_chunk=chunk_words)
-        word_count = sum(len(chunk["text"].split()) for chunk in chunks)
+        word_count = _count_words(chunks)
 
         payload = {
             "transcript_id": transcript_id,
@@ -82,17 +352,108 @@ class TranscriptService:
             "source_label": source_label,
             "source_title": source_title,
             "source_url": source_url,
+            "source_description": source_description,
+            "source_duration_seconds": source_duration,
             "languages": languages,
             "chunk_words": chunk_words,
-            "segments": segments,
+            "segments": SegmentTable.from_rows(segments),
             "chunks": chunks,
+            "term_index": TermIndex.build(chunks.texts()),
             "chapters": chapters,
             "total_words": word_count,
+            "fetched_at": fetched_at,
         }
 
+        previous = self._store.load_transcript(transcript_id)
+        if previous is not None:
+            self._carry_forward(previous, payload)
+
         self._store.save_transcript(transcript_id, payload)
         return payload
 
+    @staticmethod
+    def _carry_forward(previous: dict, payload: dict) -> None:
+        """Keep work derived from unchanged segments when a transcript is refetched.
+
+        Generated chapters (unless YouTube now has native ones), parked chunk
+        sets and embeddings all depend only on segment text, so they survive a
+        refresh that returns the same captions and are dropped otherwise.
+        """
+        if not _same_segment_text(previous.get("segments"), payload["segments"]):
+            return
+
+        if not payload["chapters"]:
+            payload["chapters"] = [
+                dict(row)
+                for row in previous.get("chapters") or []
+                if row.get("source") == "generated"
+            ]
+
+        chunk_sets = dict(previous.get("chunk_sets") or {})
+        if previous.get("chunk_words") is not None:
+            chunk_sets[str(previous["chunk_words"])] = {
+                "chunks": previous.get("chunks", []),
+                "total_words": previous.get("total_words", 0),
+            }
+            if previous.get("embeddings") is not None:
+                chunk_sets[str(previous["chunk_words"])]["embeddings"] = previous["embeddings"]
+
+        active = chunk_sets.pop(str(payload["chunk_words"]), None)
+        if active is not None and active.get("embeddings") is not None:
+            payload["embeddings"] = active["embeddings"]
+
+        while len(chunk_sets) > _MAX_PARKED_CHUNK_SETS:
+            chunk_sets.pop(next(iter(chunk_sets)))
+        if chunk_sets:
+            payload["chunk_sets"] = chunk_sets
+
+    def _fetch_youtube_parts(
+        self,
+        video_id: str,
+        languages: tuple[str, ...],
+    ) -> tuple[WatchPageMetadata, list[TranscriptSegment]]:
+        """Fetch captions and watch-page metadata concurrently.
+
+        Captions are required and propagate their error. Metadata is best-effort:
+        a failure or a missed stage deadline yields empty values. The oEmbed title
+        endpoint is only called when the watch page did not provide a title.
+        """
+        started = time.monotonic()
+        metadata_future = self._fetch_pool.submit(self._fetch_youtube_watch_metadata, video_id)
+        segments_future = self._fetch_pool.submit(
+            self._fetch_youtube_segments, video_id, languages
+        )
+
+        try:
+            segments = segments_future.result(timeout=_SEGMENTS_TIMEOUT_SECONDS)
+        except FuturesTimeoutError as exc:
+            metadata_future.cancel()
+            raise TimeoutError(
+                f"Timed out after {_SEGMENTS_TIMEOUT_SECONDS:.0f}s fetching YouTube captions."
+            ) from exc
+        except Exception:
+            metadata_future.cancel()
+            raise
+
+        metadata: WatchPageMetadata = self._best_effort_result(
+            metadata_future,
+            started,
+            _WATCH_PAGE_TIMEOUT_SECONDS,
+            {"title": None, "description": None, "duration_seconds": None, "chapters": []},
+        )
+        if not metadata["title"]:
+            metadata["title"] = self._fetch_youtube_title(video_id)
+        return metadata, segments
+
+    @staticmethod
+    def _best_effort_result(future: Future, started: float, timeout: float, default):
+        remaining = max(0.0, timeout - (time.monotonic() - started))
+        try:
+            return future.result(timeout=remaining)
+        except Exception:
+            future.cancel()
+            return default
+
     def load_from_text(
         self,
         *,
@@ -101,21 +462,45 @@ class TranscriptService:
         chunk_words: int,
     ) -> dict:
         """Load transcript directly from raw text payload."""
-        clean_text = normalize_text(transcript_text or "")
-        if not clean_text.strip():
+        return self.load_from_stream(
+            source_label=source_label,
+            pieces=[transcript_text or ""],
+            chunk_words=chunk_words,
+        )
+
+    def load_from_stream(
+        self,
+        *,
+        source_label: str,
+        pieces: Iterable[str],
+        chunk_words: int,
+    ) -> dict:
+        """Load transcript from text pieces as they arrive.
+
+        Normalization, segmentation and chunking run as one generator pipeline,
+        so only the pending tail of the input is held as raw text.
+        """
+        digest = hashlib.sha1()
+        builder = SegmentTableBuilder()
+        words = _digest_words(iter_normalized_words(pieces), digest)
+        chunks = chunk_segments(
+            builder.collect(iter_text_segments(words)),
+            words_per_chunk=chunk_words,
+        )
+        if not len(builder):
             raise ValueError("Uploaded transcript text is empty.")
 
         clean_label = (source_label or "upload:transcript.txt").strip()
         if not clean_label:
             clean_label = "upload:transcript.txt"
 
-        text_digest = hashlib.sha1(clean_text.encode("utf-8")).hexdigest()[:12]
+        text_digest = digest.hexdigest()[:12]
         transcript_source = f"inline:{clean_label}:{text_digest}"
         transcript_id = self._store.build_transcript_id(transcript_source)
 
-        segments = self._segments_from_text(clean_text)
-        chunks = chunk_segments(segments, words_per_chunk=chunk_words)
-        word_count = sum(len(chunk["text"].split()) for chunk in chunks)
+        cached = self._store.load_transcript(transcript_id)
+        if cached is not None and cached.get("segments"):
+            return self._with_chunk_words(cached, chunk_words)
 
         source_title = Path(clean_label.replace("upload:", "")).stem or "Uploaded Transcript"
 
@@ -127,10 +512,12 @@ class TranscriptService:
             "source_url": None,
             "languages": "n/a",
             "chunk_words": chunk_words,
-            "segments": segments,
+            "segments": builder.build(),
             "chunks": chunks,
+            "term_index": TermIndex.build(chunks.texts()),
             "chapters": [],
-            "total_words": word_count,
+            "total_words": _count_words(chunks),
+            "fetched_at": time.time(),
         }
 
         self._store.save_transcript(transcript_id, payload)
@@ -175,7 +562,7 @@ class TranscriptService:
         video_id: str,
         languages: tuple[str, ...],
     ) -> list[TranscriptSegment]:
-        api = YouTubeTranscriptApi()
+        api = YouTubeTranscriptApi(http_client=get_transcript_http_session())
         transcript = api.fetch(video_id, languages=languages)
 
         segments: list[TranscriptSegment] = []
@@ -195,45 +582,15 @@ class TranscriptService:
 
         return segments
 
-    @staticmethod
-    def _load_file_segments(path: Path) -> list[TranscriptSegment]:
-        text = path.read_text(encoding="utf-8")
-        return TranscriptService._segments_from_text(text)
-
-    @staticmethod
-    def _segments_from_text(text: str) -> list[TranscriptSegment]:
-        words = normalize_text(text).split()
-
-        if not words:
-            return []
-
-        segments: list[TranscriptSegment] = []
-        window = 26
-        current_start = 0.0
-        for start in range(0, len(words), window):
-            snippet = words[start : start + window]
-            if not snippet:
-                continue
-            segments.append(
-                {
-                    "text": " ".join(snippet),
-                    "start_seconds": current_start,
-                    "duration_seconds": 12.0,
-                }
-            )
-            current_start += 12.0
-
-        return segments
-
     @staticmethod
     def _fetch_youtube_title(video_id: str) -> str | None:
-        """Fetch video title using YouTube oEmbed endpoint without API key."""
+        """Fetch video title using YouTube oEmbed endpoint (watch-page fallback)."""
         watch_url = f"https://www.youtube.com/watch?v={video_id}"
         try:
-            response = requests.get(
+            response = get_http_session().get(
                 "https://www.youtube.com/oembed",
                 params={"url": watch_url, "format": "json"},
-                timeout=12,
+                timeout=_TITLE_TIMEOUT_SECONDS,
                 headers={
                     "User-Agent": "Mozilla/5.0 (CapYap/1.0)",
                     "Accept-Language": "en-US,en;q=0.9",
@@ -258,181 +615,37 @@ class TranscriptService:
         return None
 
     @staticmethod
-    def _fetch_youtube_chapter_markers(video_id: str) -> list[tuple[float, str]]:
-        """Parse chapter timestamp markers from YouTube watch-page description."""
+    def _fetch_youtube_watch_metadata(video_id: str) -> WatchPageMetadata:
+        """Stream the watch page once for title, description, duration and chapters."""
         url = (
             "https://www.youtube.com/watch"
             f"?v={video_id}&hl=en&persist_hl=1&gl=US&bpctr=9999999999&has_verified=1"
         )
+        scanner = WatchPageScanner()
         try:
-            response = requests.get(
+            with get_http_session().get(
                 url,
-                timeout=20,
+                timeout=_WATCH_PAGE_TIMEOUT_SECONDS,
+                stream=True,
                 headers={
                     "User-Agent": "Mozilla/5.0 (CapYap/1.0)",
                     "Accept-Language": "en-US,en;q=0.9",
                 },
-            )
+            ) as response:
+                if response.status_code < 400:
+                    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(
+                        errors="replace"
+                    )
+                    for block in response.iter_content(chunk_size=_WATCH_PAGE_READ_BYTES):
+                        scanner.feed(decoder.decode(block))
+                        if scanner.finished:
+                            break
+                    else:
+                        scanner.feed(decoder.decode(b"", final=True))
         except Exception:
-            return []
+            pass
 
-        if response.status_code >= 400:
-            return []
-
-        rendered = TranscriptService._extract_chapters_from_renderers(response.text)
-        if len(rendered) >= 2:
-            return rendered
-
-        description = TranscriptService._extract_short_description(response.text)
-        if not description:
-            return []
-
-        markers: list[tuple[float, str]] = []
-        for line in description.splitlines():
-            match = _CHAPTER_LINE_RE.match(line)
-            if not match:
-                continue
-
-            seconds = TranscriptService._parse_timestamp_to_seconds(match.group("stamp"))
-            title = match.group("title").strip().lstrip("-|:–— ").strip()
-            if not title:
-                continue
-            markers.append((seconds, title))
-
-        if len(markers) < 2:
-            return []
-
-        unique: dict[int, str] = {}
-        for seconds, title in markers:
-            key = int(max(0, round(seconds)))
-            if key not in unique:
-                unique[key] = title
-
-        ordered = sorted(unique.items(), key=lambda item: item[0])
-        return [(float(sec), title) for sec, title in ordered]
-
-    @staticmethod
-    def _extract_chapters_from_renderers(watch_html: str) -> list[tuple[float, str]]:
-        markers: list[tuple[float, str]] = []
-        cursor = 0
-        while True:
-            needle_idx = watch_html.find(_CHAPTER_RENDERER_NEEDLE, cursor)
-            if needle_idx < 0:
-                break
-
-            object_start = watch_html.find("{", needle_idx + len(_CHAPTER_RENDERER_NEEDLE))
-            if object_start < 0:
-                break
-
-            raw_obj, object_end = TranscriptService._extract_json_object(
-                watch_html, object_start
-            )
-            if not raw_obj:
-                cursor = object_start + 1
-                continue
-
-            try:
-                payload = json.loads(raw_obj)
-            except Exception:
-                cursor = object_end
-                continue
-
-            title = TranscriptService._chapter_title_from_payload(payload)
-            ms_raw = payload.get("timeRangeStartMillis")
-            if title and ms_raw is not None:
-                try:
-                    start = float(ms_raw) / 1000.0
-                    markers.append((max(0.0, start), title))
-                except Exception:
-                    pass
-
-            cursor = object_end
-
-        dedup: dict[int, str] = {}
-        for seconds, title in markers:
-            key = int(max(0, round(seconds)))
-            if key not in dedup:
-                dedup[key] = title
-        ordered = sorted(dedup.items(), key=lambda item: item[0])
-        return [(float(sec), title) for sec, title in ordered]
-
-    @staticmethod
-    def _extract_json_object(blob: str, start_idx: int) -> tuple[str, int]:
-        if start_idx < 0 or start_idx >= len(blob) or blob[start_idx] != "{":
-            return "", start_idx
-
-        depth = 0
-        in_string = False
-        escaped = False
-        idx = start_idx
-        while idx < len(blob):
-            ch = blob[idx]
-            if in_string:
-                if escaped:
-                    escaped = False
-                elif ch == "\\":
-                    escaped = True
-                elif ch == '"':
-                    in_string = False
-            else:
-                if ch == '"':
-                    in_string = True
-                elif ch == "{":
-                    depth += 1
-                elif ch == "}":
-                    depth -= 1
-                    if depth == 0:
-                        return blob[start_idx : idx + 1], idx + 1
-            idx += 1
-
-        return "", start_idx
-
-    @staticmethod
-    def _chapter_title_from_payload(payload: dict) -> str:
-        title_data = payload.get("title")
-        if not isinstance(title_data, dict):
-            return ""
-
-        simple = title_data.get("simpleText")
-        if isinstance(simple, str) and simple.strip():
-            return simple.strip()
-
-        runs = title_data.get("runs")
-        if isinstance(runs, list):
-            parts = []
-            for row in runs:
-                if isinstance(row, dict):
-                    text = row.get("text")
-                    if isinstance(text, str):
-                        parts.append(text.strip())
-            joined = " ".join(part for part in parts if part).strip()
-            if joined:
-                return joined
-
-        return ""
-
-    @staticmethod
-    def _extract_short_description(watch_html: str) -> str:
-        match = _SHORT_DESCRIPTION_RE.search(watch_html)
-        if not match:
-            return ""
-
-        encoded = match.group(1)
-        try:
-            return json.loads(f'"{encoded}"')
-        except Exception:
-            return ""
-
-    @staticmethod
-    def _parse_timestamp_to_seconds(value: str) -> float:
-        parts = [int(piece) for piece in value.strip().split(":")]
-        if len(parts) == 2:
-            minutes, seconds = parts
-            return float(minutes * 60 + seconds)
-        if len(parts) == 3:
-            hours, minutes, seconds = parts
-            return float(hours * 3600 + minutes * 60 + seconds)
-        return 0.0
+        return scanner.metadata()
 
     @staticmethod
     def _finalize_chapters(
@@ -466,3 +679,40 @@ class TranscriptService:
             )
 
         return chapters
+
+
+def _digest_words(words: Iterable[str], digest: Any) -> Iterator[str]:
+    """Hash words as ``" ".join(words)`` would be hashed, passing them through."""
+    separator = b""
+    for word in words:
+        digest.update(separator + word.encode("utf-8"))
+        separator = b" "
+        yield word
+
+
+def _same_segment_text(previous: Any, current: SegmentTable) -> bool:
+    if previous is None or len(previous) != len(current):
+        return False
+    return list(SegmentTable.from_rows(previous).texts()) == list(current.texts())
+
+
+def _embeddings_match(
+    embeddings: EmbeddingMatrix | None,
+    chunks: Any,
+    settings: LLMSettings,
+) -> bool:
+    return (
+        embeddings is not None
+        and len(embeddings) == len(chunks)
+        and embeddings.model == settings.embedding_model
+    )
+
+
+def _normalize_languages(languages: str) -> str:
+    """Strip and de-duplicate a comma-separated language list, keeping priority order."""
+    ordered = dict.fromkeys(lang.strip() for lang in languages.split(",") if lang.strip())
+    return ",".join(ordered)
+
+
+def _count_words(chunks: ChunkTable) -> int:
+    return sum(len(text.split()) for text in chunks.texts())
@@ -0,0 +1,294 @@
+"""Incremental parsing of YouTube watch pages for video metadata and chapters."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, TypedDict
+
+_PLAYER_RESPONSE_RE = re.compile(r'ytInitialPlayerResponse"?\]?\s*=\s*\{')
+_INITIAL_DATA_RE = re.compile(r'ytInitialData"?\]?\s*=\s*\{')
+# Outside strings only braces and quotes matter; inside, only quotes and escapes.
+_STRUCTURAL_RE = re.compile(r'[{}"]')
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_CHAPTER_LINE_RE = re.compile(
+    r"^\s*(?P<stamp>(?:\d{1,2}:)?\d{1,2}:\d{2})\s+(?P<title>.+?)\s*$"
+)
+# Markers may straddle two network reads; keep this much tail while searching.
+_SCAN_OVERLAP = 64
+_DECODER = json.JSONDecoder()
+
+
+class WatchPageMetadata(TypedDict):
+    """Video metadata recovered from one watch-page download."""
+
+    title: str | None
+    description: str | None
+    duration_seconds: float | None
+    chapters: list[tuple[float, str]]
+
+
+class _EmbeddedJson:
+    """Locate ``<name> = {...}`` in a growing buffer and decode it exactly once.
+
+    Brace depth and string/escape state are tracked across calls, so each
+    character is examined once and ``raw_decode`` runs only when the object's
+    closing brace has arrived.
+    """
+
+    def __init__(self, marker: re.Pattern[str]) -> None:
+        self._marker = marker
+        self._marker_from = 0
+        self._start = -1
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self.done = False
+        self.value: Any = None
+
+    @property
+    def keep_from(self) -> int:
+        """Earliest buffer offset this scanner still needs."""
+        return self._start if self._start >= 0 else self._marker_from
+
+    def scan(self, buffer: str) -> None:
+        if self._start < 0:
+            match = self._marker.search(buffer, self._marker_from)
+            if not match:
+                self._marker_from = max(self._marker_from, len(buffer) - _SCAN_OVERLAP)
+                return
+            self._start = match.end() - 1
+            self._pos = self._start
+
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL_RE.search(buffer, pos)
+                if not match:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buffer):
+                        # The escaped character has not arrived yet.
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            match = _STRUCTURAL_RE.search(buffer, pos)
+            if not match:
+                pos = len(buffer)
+                break
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        self.value, _ = _DECODER.raw_decode(buffer, self._start)
+                    except ValueError:
+                        # Balanced but not JSON; nothing usable on this page.
+                        self.value = None
+                    self.done = True
+                    return
+        self._pos = pos
+
+    def shift(self, offset: int) -> None:
+        self._marker_from = max(0, self._marker_from - offset)
+        if self._start >= 0:
+            self._start -= offset
+            self._pos = max(self._start, self._pos - offset)
+
+
+class WatchPageScanner:
+    """Consume watch-page HTML incrementally and stop once metadata is known.
+
+    ``ytInitialPlayerResponse`` (title, description, duration) and
+    ``ytInitialData`` (rendered chapters) are each located once, scanned
+    incrementally for their closing brace and decoded with a single
+    ``raw_decode`` call. Text that can no longer contain either
+    blob is discarded as the page streams in.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._player = _EmbeddedJson(_PLAYER_RESPONSE_RE)
+        self._initial = _EmbeddedJson(_INITIAL_DATA_RE)
+        self.title: str | None = None
+        self.description: str | None = None
+        self.duration_seconds: float | None = None
+        self.rendered_chapters: list[tuple[float, str]] | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Return whether the rest of the page cannot change the result."""
+        return self._player.done and self._initial.done
+
+    def feed(self, text: str) -> None:
+        """Append decoded page text and advance both blob scanners."""
+        if not text or self.finished:
+            return
+
+        self._buffer += text
+        if not self._player.done:
+            self._player.scan(self._buffer)
+            if self._player.done:
+                self._read_player_response(self._player.value)
+                self._player.value = None
+        if not self._initial.done:
+            self._initial.scan(self._buffer)
+            if self._initial.done:
+                self.rendered_chapters = chapters_from_initial_data(self._initial.value)
+                self._initial.value = None
+        self._trim()
+
+    def metadata(self) -> WatchPageMetadata:
+        """Return everything recovered so far, with description chapters as fallback."""
+        if self.rendered_chapters and len(self.rendered_chapters) >= 2:
+            chapters = self.rendered_chapters
+        else:
+            chapters = chapters_from_description(self.description or "")
+        return {
+            "title": self.title,
+            "description": self.description,
+            "duration_seconds": self.duration_seconds,
+            "chapters": chapters,
+        }
+
+    def _read_player_response(self, payload: Any) -> None:
+        details = payload.get("videoDetails") if isinstance(payload, dict) else None
+        if not isinstance(details, dict):
+            return
+
+        title = details.get("title")
+        if isinstance(title, str) and title.strip():
+            self.title = title.strip()
+
+        description = details.get("shortDescription")
+        if isinstance(description, str):
+            self.description = description
+
+        try:
+            length = float(details.get("lengthSeconds") or 0)
+        except (TypeError, ValueError):
+            length = 0.0
+        if length > 0:
+            self.duration_seconds = length
+
+    def _trim(self) -> None:
+        pending = [blob for blob in (self._player, self._initial) if not blob.done]
+        if not pending:
+            self._buffer = ""
+            return
+
+        keep_from = min(blob.keep_from for blob in pending)
+        if keep_from <= 0:
+            return
+
+        self._buffer = self._buffer[keep_from:]
+        for blob in pending:
+            blob.shift(keep_from)
+
+
+def initial_data_from_html(html: str) -> Any:
+    """Decode ``ytInitialData`` from a fully downloaded page, or return ``None``."""
+    blob = _EmbeddedJson(_INITIAL_DATA_RE)
+    blob.scan(html)
+    return blob.value if blob.done else None
+
+
+def chapters_from_initial_data(payload: Any) -> list[tuple[float, str]]:
+    """Collect every ``chapterRenderer`` marker from parsed ``ytInitialData``."""
+    markers: list[tuple[float, str]] = []
+    stack: list[Any] = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            renderer = node.get("chapterRenderer")
+            if isinstance(renderer, dict):
+                title = chapter_title_from_payload(renderer)
+                ms_raw = renderer.get("timeRangeStartMillis")
+                if title and ms_raw is not None:
+                    try:
+                        markers.append((max(0.0, float(ms_raw) / 1000.0), title))
+                    except Exception:
+                        pass
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(value for value in node if isinstance(value, (dict, list)))
+
+    return _dedupe_markers(markers)
+
+
+def chapters_from_description(description: str) -> list[tuple[float, str]]:
+    """Parse ``mm:ss Title`` lines from a video description."""
+    markers: list[tuple[float, str]] = []
+    for line in description.splitlines():
+        match = _CHAPTER_LINE_RE.match(line)
+        if not match:
+            continue
+
+        seconds = parse_timestamp_to_seconds(match.group("stamp"))
+        title = match.group("title").strip().lstrip("-|:–— ").strip()
+        if not title:
+            continue
+        markers.append((seconds, title))
+
+    if len(markers) < 2:
+        return []
+    return _dedupe_markers(markers)
+
+
+def chapter_title_from_payload(payload: dict) -> str:
+    """Return display text from a renderer ``title`` field."""
+    title_data = payload.get("title")
+    if not isinstance(title_data, dict):
+        return ""
+
+    simple = title_data.get("simpleText")
+    if isinstance(simple, str) and simple.strip():
+        return simple.strip()
+
+    runs = title_data.get("runs")
+    if isinstance(runs, list):
+        parts = []
+        for row in runs:
+            if isinstance(row, dict):
+                text = row.get("text")
+                if isinstance(text, str):
+                    parts.append(text.strip())
+        joined = " ".join(part for part in parts if part).strip()
+        if joined:
+            return joined
+
+    return ""
+
+
+def parse_timestamp_to_seconds(value: str) -> float:
+    """Convert ``mm:ss`` or ``hh:mm:ss`` into seconds."""
+    parts = [int(piece) for piece in value.strip().split(":")]
+    if len(parts) == 2:
+        minutes, seconds = parts
+        return float(minutes * 60 + seconds)
+    if len(parts) == 3:
+        hours, minutes, seconds = parts
+        return float(hours * 3600 + minutes * 60 + seconds)
+    return 0.0
+
+
+def _dedupe_markers(markers: list[tuple[float, str]]) -> list[tuple[float, str]]:
+    unique: dict[int, str] = {}
+    for seconds, title in markers:
+        key = int(max(0, round(seconds)))
+        if key not in unique:
+            unique[key] = title
+
+    ordered = sorted(unique.items(), key=lambda item: item[0])
+    return [(float(sec), title) for sec, title in ordered]
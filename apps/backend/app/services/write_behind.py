@@ -0,0 +1,162 @@
+"""Background write-behind queue that coalesces updates per key."""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+_MAX_RETRIES = 4
+_RETRY_BACKOFF_SECONDS = 0.5
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+class WriteBehindQueue(Generic[T]):
+    """Persist values on one background thread, keeping only the latest per key.
+
+    ``update`` merges a new value into whatever is still queued for the key, so
+    a burst of saves for one transcript costs a single write. Until a value is
+    durable, ``pending`` returns it so readers never see older data from disk.
+
+    A failed write is retried with exponential backoff. After ``max_retries``
+    the value is kept as unwritten: still returned by ``pending``, merged
+    into the next update for its key and reported by ``stats``.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str, T], None],
+        *,
+        name: str,
+        max_retries: int = _MAX_RETRIES,
+        backoff_seconds: float = _RETRY_BACKOFF_SECONDS,
+    ) -> None:
+        self._write = write
+        self._max_retries = max(0, max_retries)
+        self._backoff_seconds = max(0.0, backoff_seconds)
+        self._cond = threading.Condition()
+        self._queued: OrderedDict[str, T] = OrderedDict()
+        self._inflight: dict[str, T] = {}
+        self._unwritten: dict[str, T] = {}
+        self._attempts: dict[str, int] = {}
+        self._retry_at: dict[str, float] = {}
+        self._failures = 0
+        self._last_error: str | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def update(self, key: str, merge: Callable[[T | None], T]) -> T:
+        """Queue ``merge(<value still pending for key, if any>)`` and return it."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed.")
+            previous = self._queued.get(key, self._inflight.get(key, self._unwritten.get(key)))
+            value = merge(previous)
+            self._queued[key] = value
+            self._queued.move_to_end(key)
+            # New data gets a fresh set of attempts, starting now.
+            self._attempts.pop(key, None)
+            self._retry_at.pop(key, None)
+            self._cond.notify_all()
+            return value
+
+    def pending(self, key: str) -> T | None:
+        """Return the newest value for ``key`` that is not yet durable."""
+        with self._cond:
+            if key in self._queued:
+                return self._queued[key]
+            return self._inflight.get(key, self._unwritten.get(key))
+
+    def is_latest(self, key: str, value: T) -> bool:
+        """Return whether ``value`` is still the newest value submitted for ``key``."""
+        with self._cond:
+            if key in self._queued:
+                return False
+            return self._inflight.get(key) is value
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything queued so far is written."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queued and not self._inflight,
+                timeout=timeout,
+            )
+
+    def stats(self) -> dict[str, int | str | None]:
+        with self._cond:
+            return {
+                "queued": len(self._queued) + len(self._inflight),
+                "retrying": len(self._retry_at),
+                "unwritten": len(self._unwritten),
+                "failures": self._failures,
+                "last_error": self._last_error,
+            }
+
+    def close(self) -> None:
+        """Drain outstanding writes and stop accepting new ones."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while (key := self._next_due()) is None:
+                    if not self._queued:
+                        if self._closed:
+                            return
+                        self._cond.wait()
+                    else:
+                        delay = min(self._retry_at.values()) - time.monotonic()
+                        self._cond.wait(timeout=max(0.0, delay))
+                value = self._queued.pop(key)
+                self._retry_at.pop(key, None)
+                self._inflight[key] = value
+
+            try:
+                self._write(key, value)
+            except Exception as exc:
+                with self._cond:
+                    self._failures += 1
+                    self._last_error = f"{key}: {type(exc).__name__}: {exc}"
+                    if key not in self._queued:
+                        self._retry_or_keep(key, value)
+            else:
+                with self._cond:
+                    self._attempts.pop(key, None)
+                    # Anything kept unwritten was merged into this value.
+                    self._unwritten.pop(key, None)
+            finally:
+                with self._cond:
+                    if self._inflight.get(key) is value:
+                        del self._inflight[key]
+                    self._cond.notify_all()
+
+    def _next_due(self) -> str | None:
+        """Oldest queued key whose retry backoff has elapsed (all of them once closed)."""
+        now = time.monotonic()
+        for key in self._queued:
+            if self._closed or self._retry_at.get(key, 0.0) <= now:
+                return key
+        return None
+
+    def _retry_or_keep(self, key: str, value: T) -> None:
+        attempts = self._attempts.get(key, 0) + 1
+        if attempts > self._max_retries or self._closed:
+            # Out of retries: keep it readable and let the next update carry it.
+            self._attempts.pop(key, None)
+            self._unwritten[key] = value
+            return
+        self._attempts[key] = attempts
+        backoff = self._backoff_seconds * 2 ** (attempts - 1)
+        self._retry_at[key] = time.monotonic() + min(backoff, _MAX_BACKOFF_SECONDS)
+        self._queued[key] = value
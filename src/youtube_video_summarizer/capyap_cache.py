@@ -0,0 +1,67 @@
+"""`capyap cache` maintenance commands for the local transcript store."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from .capyap_start import open_local_store
+
+
+def run_cache_command(args: argparse.Namespace) -> int:
+    """Run one `capyap cache` action and return the process exit code."""
+    store = open_local_store()
+
+    if args.cache_command == "stats":
+        usage = store.disk_usage()
+        print(f"Engine:       {usage['engine']}")
+        print(f"Location:     {usage['location']}")
+        print(
+            f"Transcripts:  {usage['transcripts']}"
+            f" (quota: {usage['max_transcripts'] or 'unlimited'})"
+        )
+        quota = _format_mb(usage["max_bytes"]) if usage["max_bytes"] else "unlimited"
+        print(f"Disk usage:   {_format_mb(usage['bytes'])} (quota: {quota})")
+        return 0
+
+    if args.cache_command == "prune":
+        evicted = store.prune_transcripts(
+            max_bytes=None if args.max_mb is None else max(0, args.max_mb) << 20,
+            max_transcripts=args.max_transcripts,
+            older_than_seconds=(
+                args.older_than_days * 24 * 60 * 60 if args.older_than_days else None
+            ),
+            dry_run=args.dry_run,
+        )
+        verb = "Would evict" if args.dry_run else "Evicted"
+        for row in evicted:
+            accessed = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["last_accessed"]))
+            print(f"  {row['transcript_id']}  {_format_mb(row['bytes'])}  last used {accessed}")
+        freed = sum(row["bytes"] for row in evicted)
+        print(f"{verb} {len(evicted)} transcript(s), {_format_mb(freed)}.")
+        return 0
+
+    if args.cache_command == "verify":
+        problems = store.verify_transcripts(fix=args.fix)
+        for problem in problems:
+            print(f"  {problem['transcript_id'] or '<store>'}: {problem['problem']}")
+        if not problems:
+            print("All stored transcripts are readable.")
+            return 0
+        if args.fix:
+            print(f"Removed {len(problems)} unreadable transcript(s).")
+            return 0
+        print(f"{len(problems)} problem(s) found. Re-run with --fix to remove them.")
+        return 1
+
+    if args.cache_command == "compact":
+        for key, value in store.compact_transcripts().items():
+            label = key.replace("_", " ").capitalize()
+            print(f"{label}: {_format_mb(value) if key.startswith('bytes') else value}")
+        return 0
+
+    raise ValueError(f"Unknown cache command: {args.cache_command}")
+
+
+def _format_mb(size: int) -> str:
+    return f"{size / (1 << 20):.1f} MB"
@@ -27,6 +27,57 @@ def build_parser() -> argparse.ArgumentParser:
         help="Start server without auto-opening a browser tab.",
     )
 
+    cache_parser = subparsers.add_parser(
+        "cache",
+        help="Inspect and trim the local transcript cache.",
+    )
+    actions = cache_parser.add_subparsers(dest="cache_command")
+
+    actions.add_parser("stats", help="Show stored transcript count, size and quota.")
+
+    prune_parser = actions.add_parser(
+        "prune",
+        help="Evict least recently used transcripts down to the quota.",
+    )
+    prune_parser.add_argument(
+        "--max-mb",
+        type=int,
+        default=None,
+        help="Size limit in MB (default: CAPYAP_DISK_CACHE_MAX_MB; 0 = unlimited).",
+    )
+    prune_parser.add_argument(
+        "--max-transcripts",
+        type=int,
+        default=None,
+        help="Count limit (default: CAPYAP_DISK_CACHE_MAX_TRANSCRIPTS; 0 = unlimited).",
+    )
+    prune_parser.add_argument(
+        "--older-than-days",
+        type=float,
+        default=None,
+        help="Also evict transcripts not opened for this many days.",
+    )
+    prune_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List what would be evicted without deleting anything.",
+    )
+
+    verify_parser = actions.add_parser(
+        "verify",
+        help="Check that every stored transcript can be read.",
+    )
+    verify_parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Delete transcripts that fail verification.",
+    )
+
+    actions.add_parser(
+        "compact",
+        help="Migrate old files to the current layout and reclaim space.",
+    )
+
     return parser
 
 
@@ -53,6 +104,15 @@ def main() -> None:
             raise SystemExit(1) from exc
         return
 
+    if args.command == "cache" and args.cache_command:
+        try:
+            from .capyap_cache import run_cache_command
+
+            raise SystemExit(run_cache_command(args))
+        except (RuntimeError, ModuleNotFoundError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            raise SystemExit(1) from exc
+
     parser.print_help()
     raise SystemExit(1)
 
@@ -41,16 +41,30 @@ def _prepare_env() -> None:
     os.environ.setdefault("CAPYAP_FRONTEND_DIST", str(frontend_dist_dir()))
 
 
-def _import_fastapi_app():
+def _ensure_backend_importable() -> None:
     backend = backend_dir()
     if str(backend) not in sys.path:
         sys.path.insert(0, str(backend))
 
+
+def _import_fastapi_app():
+    _ensure_backend_importable()
+
     from app.main import app
 
     return app
 
 
+def open_local_store():
+    """Open the backend transcript store with the same data dir as `capyap start`."""
+    _prepare_env()
+    _ensure_backend_importable()
+
+    from app.services.storage import LocalStore
+
+    return LocalStore()
+
+
 def _open_browser_later(url: str, delay_seconds: float = 0.8) -> None:
     def _runner() -> None:
         time.sleep(delay_seconds)